@@ -0,0 +1,34 @@
+"""add products trigram indexes
+
+Revision ID: b3e7f1a9c2d4
+Revises: 8e40caa0d488
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e7f1a9c2d4'
+down_revision: Union[str, None] = '8e40caa0d488'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_products_name_trgm "
+        "ON products USING gin (lower(name) gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_products_offer_id_trgm "
+        "ON products USING gin (lower(offer_id) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_products_offer_id_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_products_name_trgm")
@@ -0,0 +1,27 @@
+"""add content experiments status/review_date index
+
+Revision ID: c4f8a2b6d1e7
+Revises: b3e7f1a9c2d4
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f8a2b6d1e7'
+down_revision: Union[str, None] = 'b3e7f1a9c2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_content_exp_status_review', 'content_experiments', ['status', 'review_date'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_content_exp_status_review', table_name='content_experiments')
@@ -1,120 +1,408 @@
 """OpenAI assistant integration."""
 
-import json
+import asyncio
 import logging
-from typing import Optional
+from typing import AsyncIterator, Awaitable, Callable, Optional, Protocol
 
+import orjson
 from openai import AsyncOpenAI
 
-from src.config import settings
-from src.ai.prompts import build_system_prompt, BusinessContext
-from src.ai.tools import TOOLS_OPENAI, execute_tool
+from src.ai.clients import get_async_openai
+from src.ai.prompts import (
+    STATIC_PROMPT_CACHE_KEY,
+    STATIC_PROMPT_PREFIX,
+    BusinessContext,
+    build_context_prompt,
+)
+from src.ai.semantic_cache import SemanticCache
+from src.ai.speculation import SpeculativeCall, ToolSpeculator
+from src.ai.tools import READ_ONLY_TOOLS, TOOLS_OPENAI, execute_tool, is_tool_error
 
 logger = logging.getLogger(__name__)
 
+# Shared across assistant instances (a new assistant is created per message)
+response_cache = SemanticCache()
+tool_speculator = ToolSpeculator()
+
+# Tool results below this size can be shown to the user as-is
+FAST_STEP_MAX_TOOL_TOKENS = 200
+
+# Above this conversation size older tool results are summarized before the next call
+MAX_CONTEXT_TOKENS = 6000
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count for mixed Russian/English text (~3 chars per token)."""
+    return len(text) // 3 + 1
+
+
+def _summarize_tool_result(tool_name: str, content: str) -> str:
+    """One-line stand-in for an old tool result."""
+    lines = [line.strip() for line in content.splitlines() if line.strip()]
+    headline = lines[0][:120] if lines else ""
+    return f"[сокращено: {tool_name} вернул {len(lines)} строк; {headline}]"
+
+
+def _compact_tool_results(messages: list[dict], max_tokens: int) -> None:
+    """Shrink older tool results in place once the conversation exceeds max_tokens.
+
+    Results of the latest tool round are kept verbatim so the model can still
+    answer from them; earlier rounds are replaced with one-line summaries.
+    """
+    if sum(_estimate_tokens(m.get("content") or "") for m in messages) <= max_tokens:
+        return
+
+    last_assistant = max(
+        (i for i, m in enumerate(messages) if m["role"] == "assistant"), default=-1
+    )
+    tool_names = {
+        tc["id"]: tc["function"]["name"]
+        for m in messages[:last_assistant]
+        for tc in m.get("tool_calls") or []
+    }
+    for message in messages[:last_assistant]:
+        if message["role"] == "tool" and not message["content"].startswith("[сокращено"):
+            tool_name = tool_names.get(message["tool_call_id"], "инструмент")
+            message["content"] = _summarize_tool_result(tool_name, message["content"])
+
+
+def _call_key(tool_call: dict) -> tuple[str, bytes]:
+    """Identity of a tool call: name plus canonical JSON of its arguments."""
+    tool_input = orjson.loads(tool_call["function"]["arguments"] or "{}")
+    return tool_call["function"]["name"], orjson.dumps(tool_input, option=orjson.OPT_SORT_KEYS)
+
+
+def _repeated_failure_note(tool_name: str) -> str:
+    """Tool result telling the model not to retry a failed call."""
+    return (
+        f"Инструмент {tool_name} уже вернул ошибку с этими параметрами. "
+        "Не вызывай его повторно — ответь пользователю на основе имеющихся данных."
+    )
+
+
+def _compose_fast_reply(draft: str, tool_results: list[str]) -> str:
+    """Combine the model's draft answer with short tool outputs into a final reply."""
+    return "\n\n".join([draft.strip(), *(r.strip() for r in tool_results)])
+
 
 class OpenAIAssistant:
     """AI assistant powered by OpenAI with tool calling support."""
 
     def __init__(self, api_key: Optional[str] = None):
-        """Initialize OpenAI client."""
-        self.client = AsyncOpenAI(api_key=api_key or settings.openai_api_key)
+        """Initialize OpenAI client.
+
+        Uses the shared connection-pooled client unless a custom API key is given.
+        """
+        self._owns_client = api_key is not None
+        self.client = AsyncOpenAI(api_key=api_key) if api_key else get_async_openai()
         self.model = "gpt-4o"
         self.max_tool_iterations = 5  # Prevent infinite loops
 
     async def ask(
-        self, user_message: str, business_context: BusinessContext, max_tokens: int = 2000
+        self,
+        user_message: str,
+        business_context: BusinessContext,
+        max_tokens: int = 2000,
+        use_cache: bool = True,
+        fast_single_step: bool = True,
+        speculate: bool = True,
     ) -> str:
         """Ask OpenAI a question with business context and tool support.
 
+        Collects the whole answer of ask_stream(); see it for the arguments.
+
+        Returns:
+            OpenAI's response text
+        """
+        parts = [
+            chunk
+            async for chunk in self.ask_stream(
+                user_message,
+                business_context,
+                max_tokens,
+                use_cache=use_cache,
+                fast_single_step=fast_single_step,
+                speculate=speculate,
+            )
+        ]
+        return "".join(parts)
+
+    async def ask_stream(
+        self,
+        user_message: str,
+        business_context: BusinessContext,
+        max_tokens: int = 2000,
+        use_cache: bool = True,
+        fast_single_step: bool = True,
+        speculate: bool = True,
+        on_status: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> AsyncIterator[str]:
+        """Ask OpenAI a question and stream the answer text as it is generated.
+
+        Text of a completion is held back until it is known not to be a tool-call
+        turn, so drafts written alongside tool calls never reach the answer.
+
         Args:
             user_message: The user's question
             business_context: Current business data context
             max_tokens: Maximum tokens in response
+            use_cache: Return a cached answer for a similar recent question
+            fast_single_step: If the model already drafted an answer alongside
+                read-only tool calls and all results are short and successful, reply
+                with the draft plus the results instead of making another LLM call
+            speculate: Prefetch the likely tool call while the model is decoding
+            on_status: Called with a progress note (e.g. tools in use); the note is
+                not part of the answer
 
-        Returns:
-            OpenAI's response text
+        Yields:
+            Chunks of response text
         """
+        speculation = None
         try:
-            system_prompt = build_system_prompt(business_context)
+            # Started first so the prefetch overlaps the embedding round-trip
+            if speculate:
+                speculation = tool_speculator.start(user_message)
 
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ]
+            context_key = hash(business_context)
+            embedding = None
+            if use_cache:
+                embedding = await response_cache.embed(self.client, user_message)
+                if embedding is not None:
+                    cached = await response_cache.get(embedding, context_key)
+                    if cached is not None:
+                        yield cached
+                        return
+
+            # Answers that changed something (campaigns, bids, content) must not be replayed
+            cacheable = embedding is not None
+
+            messages = self._build_messages(user_message, business_context)
+
+            # Calls that already failed; repeating one forces a direct answer
+            failed_calls: set[tuple[str, bytes]] = set()
+            tool_choice = "auto"
 
             # Iterate until we get a final response (not a tool call)
             for iteration in range(self.max_tool_iterations):
-                response = await self.client.chat.completions.create(
+                _compact_tool_results(messages, MAX_CONTEXT_TOKENS)
+                stream = await self.client.chat.completions.create(
                     model=self.model,
                     max_tokens=max_tokens,
                     messages=messages,
                     tools=TOOLS_OPENAI,
-                    tool_choice="auto",
+                    tool_choice=tool_choice,
+                    user=STATIC_PROMPT_CACHE_KEY,
+                    stream=True,
                 )
 
-                message = response.choices[0].message
-                finish_reason = response.choices[0].finish_reason
+                # With tool_choice "none" the completion cannot call tools, so its
+                # text is the answer and can be passed on right away
+                stream_text = tool_choice == "none"
+                content_parts: list[str] = []
+                # Tool call fragments arrive in pieces, keyed by their index
+                tool_calls_by_index: dict[int, dict] = {}
+                finish_reason = None
 
-                logger.info(f"OpenAI response finish_reason: {finish_reason}")
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    choice = chunk.choices[0]
+                    delta = choice.delta
 
-                # Check if OpenAI wants to use a tool
-                if message.tool_calls:
-                    # Add assistant message with tool calls
-                    messages.append({
-                        "role": "assistant",
-                        "content": message.content,
-                        "tool_calls": [
+                    if delta.content:
+                        content_parts.append(delta.content)
+                        if stream_text:
+                            yield delta.content
+
+                    for tc_delta in delta.tool_calls or []:
+                        tool_call = tool_calls_by_index.setdefault(
+                            tc_delta.index,
                             {
-                                "id": tc.id,
+                                "id": "",
                                 "type": "function",
-                                "function": {
-                                    "name": tc.function.name,
-                                    "arguments": tc.function.arguments
-                                }
-                            }
-                            for tc in message.tool_calls
-                        ]
-                    })
+                                "function": {"name": "", "arguments": ""},
+                            },
+                        )
+                        if tc_delta.id:
+                            tool_call["id"] = tc_delta.id
+                        if tc_delta.function:
+                            if tc_delta.function.name:
+                                tool_call["function"]["name"] += tc_delta.function.name
+                            if tc_delta.function.arguments:
+                                tool_call["function"]["arguments"] += tc_delta.function.arguments
+
+                    if choice.finish_reason:
+                        finish_reason = choice.finish_reason
+
+                logger.info(f"OpenAI response finish_reason: {finish_reason}")
+                content = "".join(content_parts)
+
+                if not tool_calls_by_index:
+                    # Final response
+                    if not content:
+                        yield "Извините, не удалось получить ответ."
+                        return
+                    if not stream_text:
+                        yield content
+                    if cacheable:
+                        response_cache.put(embedding, context_key, content)
+                    return
+
+                tool_calls = [tool_calls_by_index[i] for i in sorted(tool_calls_by_index)]
 
-                    # Execute each tool and add results
-                    for tool_call in message.tool_calls:
-                        tool_name = tool_call.function.name
-                        tool_input = json.loads(tool_call.function.arguments)
+                # Add assistant message with tool calls
+                messages.append({
+                    "role": "assistant",
+                    "content": content or None,
+                    "tool_calls": tool_calls,
+                })
 
-                        logger.info(f"Tool call: {tool_name} with {tool_input}")
+                if any(tc["function"]["name"] not in READ_ONLY_TOOLS for tc in tool_calls):
+                    cacheable = False
 
-                        # Execute the tool
-                        result = await execute_tool(tool_name, tool_input)
+                if on_status is not None:
+                    tool_names = ", ".join(tc["function"]["name"] for tc in tool_calls)
+                    await on_status(f"🔧 Использую: {tool_names}...")
 
-                        # Add tool result
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": result,
-                        })
+                if any(_call_key(tc) in failed_calls for tc in tool_calls):
+                    tool_choice = "none"
+                results = await self._execute_tool_calls(tool_calls, speculation, failed_calls)
 
-                    logger.info(f"Executed {len(message.tool_calls)} tool(s), continuing...")
+                if (
+                    fast_single_step
+                    and content
+                    and all(tc["function"]["name"] in READ_ONLY_TOOLS for tc in tool_calls)
+                    and not any(is_tool_error(r) for r in results)
+                    and all(_estimate_tokens(r) < FAST_STEP_MAX_TOOL_TOKENS for r in results)
+                ):
+                    logger.info("Short tool results with draft answer, skipping follow-up call")
+                    reply = _compose_fast_reply(content, results)
+                    if cacheable:
+                        response_cache.put(embedding, context_key, reply)
+                    yield reply
+                    return
 
-                else:
-                    # Final response - return text
-                    if message.content:
-                        return message.content
-                    else:
-                        return "Извините, не удалось получить ответ."
+                # Add tool results in the original order
+                for tool_call, result in zip(tool_calls, results):
+                    messages.append({
+                        "role": "tool",
+                        "tool_call_id": tool_call["id"],
+                        "content": result,
+                    })
+
+                logger.info(f"Executed {len(tool_calls)} tool(s), continuing...")
 
             # Max iterations reached
             logger.warning("Max tool iterations reached")
-            return "Извините, обработка заняла слишком много времени. Попробуйте упростить вопрос."
+            yield "Извините, обработка заняла слишком много времени. Попробуйте упростить вопрос."
 
         except Exception as e:
             logger.error(f"OpenAI API error: {e}")
-            return f"Ошибка при обращении к AI: {str(e)}"
+            yield f"Ошибка при обращении к AI: {str(e)}"
+
+        finally:
+            if speculation is not None:
+                speculation.discard()
+
+    def _build_messages(self, user_message: str, business_context: BusinessContext) -> list[dict]:
+        """Build initial conversation (static instructions first for prefix caching)."""
+        return [
+            {"role": "system", "content": STATIC_PROMPT_PREFIX},
+            {"role": "system", "content": build_context_prompt(business_context)},
+            {"role": "user", "content": user_message}
+        ]
+
+    async def _execute_tool_calls(
+        self,
+        tool_calls: list[dict],
+        speculation: Optional[SpeculativeCall] = None,
+        failed_calls: Optional[set[tuple[str, bytes]]] = None,
+    ) -> list[str]:
+        """Execute tool calls and return results in order.
+
+        Read-only calls run concurrently; tools that change data run after them,
+        one at a time in the order the model gave, so two writes (or a write and
+        a read) never race each other.
+        A call matching the speculative prefetch reuses its already running task.
+        Running a tool that changes data clears the response cache.
+        A call that already failed with the same arguments is not executed again;
+        new failures are added to failed_calls.
+        """
+        if failed_calls is None:
+            failed_calls = set()
+
+        results: list[Optional[str]] = [None] * len(tool_calls)
+        reads: dict[int, Awaitable[str]] = {}
+        writes: list[tuple[int, str, dict]] = []
+        for i, tool_call in enumerate(tool_calls):
+            tool_name = tool_call["function"]["name"]
+            tool_input = orjson.loads(tool_call["function"]["arguments"] or "{}")
+
+            if _call_key(tool_call) in failed_calls:
+                logger.info(f"Skipping repeated failed tool call: {tool_name} with {tool_input}")
+                results[i] = _repeated_failure_note(tool_name)
+                continue
+
+            logger.info(f"Tool call: {tool_name} with {tool_input}")
+            if tool_name not in READ_ONLY_TOOLS:
+                writes.append((i, tool_name, tool_input))
+                continue
+            prefetched = speculation.take(tool_name, tool_input) if speculation else None
+            reads[i] = prefetched or execute_tool(tool_name, tool_input)
+
+        for i, result in zip(reads, await asyncio.gather(*reads.values())):
+            results[i] = result
+        for i, tool_name, tool_input in writes:
+            results[i] = await execute_tool(tool_name, tool_input)
+
+        # Data changed: cached answers may describe the old state
+        if any(tc["function"]["name"] not in READ_ONLY_TOOLS for tc in tool_calls):
+            response_cache.clear()
+
+        for tool_call, result in zip(tool_calls, results):
+            if is_tool_error(result):
+                failed_calls.add(_call_key(tool_call))
+        return results
 
     async def close(self) -> None:
-        """Close the client (cleanup)."""
-        await self.client.close()
+        """Close the client (cleanup). The shared client is closed on shutdown."""
+        if self._owns_client:
+            await self.client.close()
+
+
+class Assistant(Protocol):
+    """Interface of an AI assistant used by the bot handlers."""
+
+    async def ask(self, user_message: str, business_context: BusinessContext) -> str: ...
+
+    def ask_stream(
+        self,
+        user_message: str,
+        business_context: BusinessContext,
+        on_status: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> AsyncIterator[str]: ...
+
+    async def close(self) -> None: ...
+
+
+ASSISTANT_PROVIDERS: dict[str, type] = {
+    "openai": OpenAIAssistant,
+}
+
+
+def get_assistant(provider: str = "openai") -> Assistant:
+    """Create assistant for the given provider.
 
+    Args:
+        provider: Provider name (key of ASSISTANT_PROVIDERS)
 
-# Alias for backward compatibility
-ClaudeAssistant = OpenAIAssistant
+    Returns:
+        Assistant instance
+    """
+    try:
+        assistant_cls = ASSISTANT_PROVIDERS[provider]
+    except KeyError:
+        raise ValueError(
+            f"Unknown assistant provider: {provider}. Available: {list(ASSISTANT_PROVIDERS)}"
+        )
+    return assistant_cls()
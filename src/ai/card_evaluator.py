@@ -12,13 +12,21 @@ Evaluates OZON product cards across 7 blocks:
 Each block gets a score 1-10 and actionable recommendations.
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass
-from typing import Optional
-import json
+from string import Formatter
+from typing import Callable, Optional
+
+import orjson
+
+from src.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Shared by every audit so parallel audits together stay under OpenAI rate limits
+_evaluation_slots = asyncio.Semaphore(settings.openai_max_concurrent_evaluations)
+
 
 @dataclass
 class BlockEvaluation:
@@ -205,6 +213,39 @@ EVALUATION_PROMPTS = {
 }
 
 
+EVALUATOR_SYSTEM_PROMPT = (
+    "Ты эксперт по оптимизации карточек товаров на маркетплейсах. "
+    "Давай конкретные, actionable рекомендации. Отвечай только JSON."
+)
+
+# Blocks evaluated together in one request; two groups keep each response
+# well under the output token limit
+BLOCK_GROUPS = (
+    ("main_photo", "secondary_photos", "price_value"),
+    ("title", "characteristics", "description", "reviews"),
+)
+
+
+def _compile_prompt(template: str) -> Callable[[dict], str]:
+    """Build a renderer for a str.format template (field names are parsed once)."""
+    field_names = {
+        field.split(".")[0].split("[")[0]
+        for _, field, _, _ in Formatter().parse(template)
+        if field
+    }
+
+    def render(data: dict) -> str:
+        return template.format_map({name: data[name] for name in field_names})
+
+    return render
+
+
+# Renderers for EVALUATION_PROMPTS, built once at import
+PROMPT_RENDERERS = {
+    block_id: _compile_prompt(template) for block_id, template in EVALUATION_PROMPTS.items()
+}
+
+
 BLOCK_INFO = {
     "main_photo": {
         "name": "Главное фото",
@@ -263,143 +304,396 @@ async def evaluate_card_block(
 ) -> BlockEvaluation:
     """Evaluate a single block of the product card."""
 
-    block_info = BLOCK_INFO[block_id]
-    prompt_template = EVALUATION_PROMPTS[block_id]
-
     # Format prompt with product data
-    prompt = prompt_template.format(**product_data)
+    prompt = PROMPT_RENDERERS[block_id](product_data)
 
     try:
-        response = await openai_client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Ты эксперт по оптимизации карточек товаров на маркетплейсах. "
-                              "Давай конкретные, actionable рекомендации. Отвечай только JSON."
-                },
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.3,
-        )
-
-        result = json.loads(response.choices[0].message.content)
-
-        # Build recommendations with actionable flag
-        recommendations = []
-        for rec in result.get("recommendations", []):
-            recommendations.append({
-                "action": rec.get("action", ""),
-                "description": rec.get("description", rec.get("action", "")),
-                "priority": rec.get("priority", "medium"),
-                "actionable": block_info["actionable"],
-                "action_type": rec.get("type", block_info.get("experiment_type")),
-                "new_value": rec.get("new_value"),
-            })
-
-        return BlockEvaluation(
-            block_name=block_info["name"],
-            block_id=block_id,
-            score=result.get("score", 5),
-            diagnosis=result.get("diagnosis", ""),
-            recommendations=recommendations,
-            metrics_affected=block_info["metrics"],
-        )
+        async with _evaluation_slots:
+            response = await openai_client.chat.completions.create(
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": EVALUATOR_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.3,
+            )
+
+        result = orjson.loads(response.choices[0].message.content)
+        return _parse_block_result(block_id, result)
 
     except Exception as e:
         logger.error(f"Failed to evaluate block {block_id}: {e}")
-        return BlockEvaluation(
-            block_name=block_info["name"],
-            block_id=block_id,
-            score=5,
-            diagnosis=f"Ошибка оценки: {str(e)}",
-            recommendations=[],
-            metrics_affected=block_info["metrics"],
-        )
+        return _failed_block_evaluation(block_id, e)
+
+
+def _parse_block_result(block_id: str, result: dict) -> BlockEvaluation:
+    """Build BlockEvaluation from the JSON returned by the model for one block."""
+    block_info = BLOCK_INFO[block_id]
+
+    # Build recommendations with actionable flag
+    recommendations = []
+    for rec in result.get("recommendations", []):
+        recommendations.append({
+            "action": rec.get("action", ""),
+            "description": rec.get("description", rec.get("action", "")),
+            "priority": rec.get("priority", "medium"),
+            "actionable": block_info["actionable"],
+            "action_type": rec.get("type", block_info.get("experiment_type")),
+            "new_value": rec.get("new_value"),
+        })
+
+    return BlockEvaluation(
+        block_name=block_info["name"],
+        block_id=block_id,
+        score=result.get("score", 5),
+        diagnosis=result.get("diagnosis", ""),
+        recommendations=recommendations,
+        metrics_affected=block_info["metrics"],
+    )
+
+
+def _failed_block_evaluation(block_id: str, error: BaseException) -> BlockEvaluation:
+    """Build a neutral evaluation for a block that could not be scored."""
+    block_info = BLOCK_INFO[block_id]
+    return BlockEvaluation(
+        block_name=block_info["name"],
+        block_id=block_id,
+        score=5,
+        diagnosis=f"Ошибка оценки: {str(error)}",
+        recommendations=[],
+        metrics_affected=block_info["metrics"],
+    )
+
+
+async def evaluate_all_blocks(
+    product_data: dict,
+    openai_client,
+    block_ids: Optional[list[str]] = None,
+) -> list[BlockEvaluation]:
+    """Evaluate several card blocks concurrently.
+
+    Each block is an independent GPT-4o round-trip, so they are issued together
+    (bounded by the shared evaluation semaphore) instead of one after another.
+
+    Args:
+        product_data: Product fields used to fill the evaluation prompts
+        openai_client: Shared AsyncOpenAI client
+        block_ids: Blocks to evaluate (default: all blocks)
+
+    Returns:
+        Block evaluations in the same order as block_ids
+    """
+    if block_ids is None:
+        block_ids = list(BLOCK_INFO)
+
+    results = await asyncio.gather(
+        *(evaluate_card_block(block_id, product_data, openai_client) for block_id in block_ids),
+        return_exceptions=True,
+    )
+
+    evaluations = []
+    for block_id, result in zip(block_ids, results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to evaluate block {block_id}: {result}")
+            evaluations.append(_failed_block_evaluation(block_id, result))
+        else:
+            evaluations.append(result)
+    return evaluations
+
+
+async def _evaluate_block_group(
+    block_ids: list[str],
+    product_data: dict,
+    openai_client,
+) -> list[BlockEvaluation]:
+    """Evaluate several blocks with one request returning a JSON object per block."""
+    sections = [
+        f"### БЛОК {i}: {block_id}\n{PROMPT_RENDERERS[block_id](product_data)}"
+        for i, block_id in enumerate(block_ids, 1)
+    ]
+    keys = ", ".join(f'"{block_id}": {{...}}' for block_id in block_ids)
+    prompt = (
+        "Оцени несколько блоков карточки. Для каждого блока выполни его задание.\n\n"
+        + "\n\n".join(sections)
+        + f"\n\nВерни один JSON-объект, где ключ — id блока, а значение — JSON этого блока: {{{keys}}}"
+    )
+
+    try:
+        async with _evaluation_slots:
+            response = await openai_client.chat.completions.create(
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": EVALUATOR_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.3,
+            )
+        results = orjson.loads(response.choices[0].message.content)
+    except Exception as e:
+        logger.error(f"Failed to evaluate blocks {block_ids}: {e}")
+        return [_failed_block_evaluation(block_id, e) for block_id in block_ids]
+
+    # Blocks the model left out of the grouped answer are evaluated one by one
+    missing = [block_id for block_id in block_ids if not isinstance(results.get(block_id), dict)]
+    fallback: dict[str, BlockEvaluation] = {}
+    if missing:
+        logger.warning(f"Blocks {missing} missing in grouped evaluation, evaluating separately")
+        evaluations = await evaluate_all_blocks(product_data, openai_client, missing)
+        fallback = dict(zip(missing, evaluations))
+
+    evaluations = []
+    for block_id in block_ids:
+        if block_id in fallback:
+            evaluations.append(fallback[block_id])
+            continue
+        try:
+            evaluations.append(_parse_block_result(block_id, results[block_id]))
+        except Exception as e:
+            logger.error(f"Malformed evaluation of block {block_id}: {e}")
+            evaluations.append(_failed_block_evaluation(block_id, e))
+    return evaluations
+
+
+async def evaluate_all_blocks_single_call(
+    product_data: dict,
+    openai_client,
+    block_ids: Optional[list[str]] = None,
+) -> list[BlockEvaluation]:
+    """Evaluate card blocks with one request per block group instead of one per block.
+
+    The system prompt and request overhead are paid once per group (see
+    BLOCK_GROUPS); groups are sent concurrently.
+
+    Args:
+        product_data: Product fields used to fill the evaluation prompts
+        openai_client: Shared AsyncOpenAI client
+        block_ids: Blocks to evaluate (default: all blocks)
+
+    Returns:
+        Block evaluations in the same order as block_ids
+    """
+    if block_ids is None:
+        block_ids = list(BLOCK_INFO)
+
+    requested = set(block_ids)
+    groups = [
+        [block_id for block_id in group if block_id in requested]
+        for group in BLOCK_GROUPS
+    ]
+    groups = [group for group in groups if group]
+
+    group_results = await asyncio.gather(
+        *(_evaluate_block_group(group, product_data, openai_client) for group in groups)
+    )
+
+    by_id = {
+        evaluation.block_id: evaluation
+        for evaluations in group_results
+        for evaluation in evaluations
+    }
+    return [by_id[block_id] for block_id in block_ids]
+
+
+def _build_card_evaluation(product_data: dict, blocks: list[BlockEvaluation]) -> CardEvaluation:
+    """Assemble full card evaluation from block results."""
+    overall_score = sum(b.score for b in blocks) / len(blocks) if blocks else 0
+    return CardEvaluation(
+        product_id=product_data.get("product_id"),
+        product_name=product_data.get("product_name", ""),
+        overall_score=overall_score,
+        blocks=blocks,
+        priority_actions=extract_priority_actions(blocks, product_data),
+    )
+
+
+async def evaluate_cards_batch(
+    product_datas: list[dict],
+    openai_client,
+    block_ids: Optional[list[str]] = None,
+    poll_interval: float = 60,
+    timeout: float = 24 * 3600,
+) -> list[CardEvaluation]:
+    """Evaluate many cards through the OpenAI Batch API (offline, half the price).
+
+    For bulk re-scoring of the catalog; interactive audits use the synchronous path.
+    One batch request is created per (product, block) pair.
+
+    Args:
+        product_datas: Product data dicts as built for a card audit
+        openai_client: Shared AsyncOpenAI client
+        block_ids: Blocks to evaluate (default: all blocks)
+        poll_interval: Seconds between batch status checks
+        timeout: Give up waiting after this many seconds
+
+    Returns:
+        Card evaluations in the same order as product_datas
+    """
+    if block_ids is None:
+        block_ids = list(BLOCK_INFO)
+
+    # custom_id must be unique in a batch, so it uses the position, not product_id
+    lines = []
+    for index, product_data in enumerate(product_datas):
+        for block_id in block_ids:
+            lines.append(orjson.dumps({
+                "custom_id": f"{index}-{block_id}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": "gpt-4o",
+                    "messages": [
+                        {"role": "system", "content": EVALUATOR_SYSTEM_PROMPT},
+                        {"role": "user", "content": PROMPT_RENDERERS[block_id](product_data)},
+                    ],
+                    "response_format": {"type": "json_object"},
+                    "temperature": 0.3,
+                },
+            }))
+
+    input_file = await openai_client.files.create(
+        file=("card_audit.jsonl", b"\n".join(lines)),
+        purpose="batch",
+    )
+    batch = await openai_client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    logger.info(f"Created card audit batch {batch.id} with {len(lines)} requests")
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        if loop.time() > deadline:
+            raise TimeoutError(f"Batch {batch.id} not finished in {timeout}s (status {batch.status})")
+        await asyncio.sleep(poll_interval)
+        batch = await openai_client.batches.retrieve(batch.id)
+
+    # Parse whatever finished; missing blocks fall back to neutral evaluation
+    results: dict[str, dict] = {}
+    if batch.output_file_id:
+        output = await openai_client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            item = orjson.loads(line)
+            response = item.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            try:
+                content = response["body"]["choices"][0]["message"]["content"]
+                results[item["custom_id"]] = orjson.loads(content)
+            except (KeyError, IndexError, orjson.JSONDecodeError) as e:
+                logger.warning(f"Bad batch result for {item.get('custom_id')}: {e}")
+
+    if batch.status != "completed":
+        logger.error(f"Card audit batch {batch.id} finished with status {batch.status}")
+
+    evaluations = []
+    for index, product_data in enumerate(product_datas):
+        blocks = []
+        for block_id in block_ids:
+            result = results.get(f"{index}-{block_id}")
+            if result is None:
+                blocks.append(
+                    _failed_block_evaluation(block_id, ValueError(f"нет результата (batch {batch.status})"))
+                )
+                continue
+            try:
+                blocks.append(_parse_block_result(block_id, result))
+            except Exception as e:
+                logger.warning(f"Malformed batch evaluation of {index}-{block_id}: {e}")
+                blocks.append(_failed_block_evaluation(block_id, e))
+        evaluations.append(_build_card_evaluation(product_data, blocks))
+    return evaluations
 
 
 def format_evaluation_report(evaluation: CardEvaluation) -> str:
     """Format evaluation as readable report."""
 
-    report = f"🔍 **АУДИТ КАРТОЧКИ**\n\n"
-    report += f"**{evaluation.product_name[:50]}**\n"
-    report += f"📊 Общий балл: **{evaluation.overall_score:.1f}/10**\n\n"
+    parts: list[str] = [
+        "🔍 **АУДИТ КАРТОЧКИ**\n\n",
+        f"**{evaluation.product_name[:50]}**\n",
+        f"📊 Общий балл: **{evaluation.overall_score:.1f}/10**\n\n",
+    ]
 
     # Sort blocks by score (worst first)
     sorted_blocks = sorted(evaluation.blocks, key=lambda b: b.score)
 
-    report += "━━━━━━━━━━━━━━━━━━━━━\n"
+    parts.append("━━━━━━━━━━━━━━━━━━━━━\n")
 
     for block in sorted_blocks:
         info = BLOCK_INFO[block.block_id]
         score_emoji = "🔴" if block.score < 5 else "🟡" if block.score < 7 else "🟢"
         actionable_tag = "⚡" if info["actionable"] else ""
 
-        report += f"\n{info['emoji']} **{block.block_name}** {actionable_tag}\n"
-        report += f"   {score_emoji} Оценка: {block.score}/10\n"
-        report += f"   💬 {block.diagnosis}\n"
+        parts.append(f"\n{info['emoji']} **{block.block_name}** {actionable_tag}\n")
+        parts.append(f"   {score_emoji} Оценка: {block.score}/10\n")
+        parts.append(f"   💬 {block.diagnosis}\n")
 
         if block.recommendations:
-            report += f"   📌 Рекомендации:\n"
+            parts.append("   📌 Рекомендации:\n")
             for i, rec in enumerate(block.recommendations[:2], 1):
                 priority_icon = "🔥" if rec["priority"] == "high" else "▫️"
                 action_icon = "⚡" if rec["actionable"] else ""
-                report += f"      {i}. {priority_icon} {rec['action']} {action_icon}\n"
+                parts.append(f"      {i}. {priority_icon} {rec['action']} {action_icon}\n")
 
-        report += "\n"
+        parts.append("\n")
 
     # Priority actions section
     if evaluation.priority_actions:
-        report += "━━━━━━━━━━━━━━━━━━━━━\n"
-        report += "🎯 **ТОП-3 ДЕЙСТВИЯ** (можно запустить экспериментом):\n\n"
+        parts.append("━━━━━━━━━━━━━━━━━━━━━\n")
+        parts.append("🎯 **ТОП-3 ДЕЙСТВИЯ** (можно запустить экспериментом):\n\n")
 
         for i, action in enumerate(evaluation.priority_actions[:3], 1):
-            report += f"{i}. **{action['block']}**: {action['action']}\n"
+            parts.append(f"{i}. **{action['block']}**: {action['action']}\n")
             if action.get('new_value'):
-                report += f"   → Новое значение: _{action['new_value'][:50]}..._\n"
-            report += f"   💡 Скажи: \"запусти эксперимент {action['experiment_hint']}\"\n\n"
+                parts.append(f"   → Новое значение: _{action['new_value'][:50]}..._\n")
+            parts.append(f"   💡 Скажи: \"запусти эксперимент {action['experiment_hint']}\"\n\n")
 
-    report += "━━━━━━━━━━━━━━━━━━━━━\n"
-    report += "⚡ = можно запустить A/B эксперимент\n"
-    report += "🔴 < 5 | 🟡 5-7 | 🟢 > 7\n"
+    parts.append("━━━━━━━━━━━━━━━━━━━━━\n")
+    parts.append("⚡ = можно запустить A/B эксперимент\n")
+    parts.append("🔴 < 5 | 🟡 5-7 | 🟢 > 7\n")
 
-    return report
+    return "".join(parts)
 
 
 def extract_priority_actions(blocks: list[BlockEvaluation], product_data: dict) -> list[dict]:
     """Extract top actionable recommendations."""
 
-    actions = []
+    product_name = product_data.get("product_name", "товара")[:20]
+    scored_actions = []  # (block score, action)
 
     for block in blocks:
         info = BLOCK_INFO[block.block_id]
         if not info["actionable"]:
             continue
 
+        experiment_type = info.get("experiment_type")
         for rec in block.recommendations:
             if rec["priority"] == "high" and rec.get("actionable"):
                 action = {
                     "block": block.block_name,
                     "block_id": block.block_id,
                     "action": rec["action"],
-                    "action_type": info.get("experiment_type"),
+                    "action_type": experiment_type,
                     "new_value": rec.get("new_value"),
                     "product_id": product_data.get("product_id"),
                     "offer_id": product_data.get("offer_id"),
                 }
 
                 # Generate experiment hint
-                if info.get("experiment_type") == "content":
+                if experiment_type == "content":
                     field = info.get("field_type", "name")
-                    action["experiment_hint"] = f"с {field} для {product_data.get('product_name', 'товара')[:20]}"
-                elif info.get("experiment_type") == "price":
-                    action["experiment_hint"] = f"с ценой для {product_data.get('product_name', 'товара')[:20]}"
+                    action["experiment_hint"] = f"с {field} для {product_name}"
+                elif experiment_type == "price":
+                    action["experiment_hint"] = f"с ценой для {product_name}"
 
-                actions.append(action)
+                scored_actions.append((block.score, action))
 
     # Sort by score (worst blocks first)
-    block_scores = {b.block_id: b.score for b in blocks}
-    actions.sort(key=lambda a: block_scores.get(a["block_id"], 10))
+    scored_actions.sort(key=lambda item: item[0])
 
-    return actions[:3]
+    return [action for _, action in scored_actions[:3]]
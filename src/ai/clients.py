@@ -0,0 +1,76 @@
+"""Shared API clients.
+
+One AsyncOpenAI client and one client per OZON API (each with its own HTTP
+connection pool) are reused by every assistant and tool instead of building
+a new pool per request.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Optional
+
+import httpx
+
+from src.config import settings
+from src.ozon.client import OzonClient
+from src.ozon.performance import PerformanceClient
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+_openai_client: Optional["AsyncOpenAI"] = None
+_ozon_client: Optional[OzonClient] = None
+_performance_client: Optional[PerformanceClient] = None
+
+
+def get_async_openai() -> "AsyncOpenAI":
+    """Get the shared AsyncOpenAI client, creating it on first use.
+
+    The OpenAI SDK is imported here, not at module load: its import chain is
+    heavy and processes like the scheduler may never call a model.
+    """
+    global _openai_client
+    if _openai_client is None:
+        from openai import AsyncOpenAI
+
+        http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            timeout=httpx.Timeout(600.0, connect=5.0),
+        )
+        _openai_client = AsyncOpenAI(api_key=settings.openai_api_key, http_client=http_client)
+        logger.info("Created shared OpenAI client")
+    return _openai_client
+
+
+def get_ozon_client() -> OzonClient:
+    """Get the shared OZON Seller API client, creating it on first use."""
+    global _ozon_client
+    if _ozon_client is None:
+        _ozon_client = OzonClient()
+        logger.info("Created shared OZON Seller API client")
+    return _ozon_client
+
+
+def get_performance_client() -> PerformanceClient:
+    """Get the shared OZON Performance API client, creating it on first use."""
+    global _performance_client
+    if _performance_client is None:
+        _performance_client = PerformanceClient()
+        logger.info("Created shared OZON Performance API client")
+    return _performance_client
+
+
+async def close_clients() -> None:
+    """Close shared clients (call on application shutdown)."""
+    global _openai_client, _ozon_client, _performance_client
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+    if _ozon_client is not None:
+        await _ozon_client.close()
+        _ozon_client = None
+    if _performance_client is not None:
+        await _performance_client.close()
+        _performance_client = None
@@ -1,16 +1,21 @@
 """System prompts and context builders for AI assistant."""
 
+import hashlib
 from dataclasses import dataclass
 from datetime import date
+from functools import lru_cache
 from decimal import Decimal
 from typing import Optional
 
 from src.utils.formatting import format_currency, format_number
 
 
-@dataclass
+@dataclass(frozen=True)
 class BusinessContext:
-    """Business data context for AI assistant."""
+    """Business data context for AI assistant.
+
+    Frozen so it is hashable and prompt builders can be memoized on it.
+    """
 
     today: date
     products_count: int
@@ -27,9 +32,10 @@ def build_products_summary(products: list) -> str:
 
     lines = []
     for p in products[:10]:  # First 10 products
-        margin = (
-            ((p.price - p.cost_price) / p.price * 100) if p.cost_price > 0 and p.price > 0 else 0
-        )
+        # Float math is enough for a one-decimal display and much cheaper than Decimal
+        price = float(p.price or 0)
+        cost_price = float(p.cost_price or 0)
+        margin = (price - cost_price) / price * 100 if cost_price > 0 and price > 0 else 0.0
         lines.append(
             f"• {p.name} ({p.offer_id}): {format_currency(p.price)} "
             f"(маржа: {margin:.1f}%)"
@@ -97,27 +103,11 @@ def build_experiments_summary(experiments: list) -> str:
     return "\n".join(lines)
 
 
-def build_system_prompt(context: BusinessContext) -> str:
-    """Build complete system prompt with business context."""
-    return f"""Ты AI-ассистент для управления бизнесом на маркетплейсе OZON.
+# Static instructions go first and never change between requests, so the
+# provider-side prompt cache can reuse them; per-request data follows.
+STATIC_PROMPT_PREFIX = """Ты AI-ассистент для управления бизнесом на маркетплейсе OZON.
 Твоя задача — помогать владельцу анализировать данные, отвечать на вопросы и давать рекомендации.
 
-ТЕКУЩАЯ ДАТА: {context.today.strftime('%d.%m.%Y')}
-
-ТЕКУЩИЕ ДАННЫЕ:
-
-📦 ТОВАРЫ ({context.products_count} шт):
-{context.products_summary}
-
-📈 ПРОДАЖИ (последние 7 дней):
-{context.sales_summary}
-
-📊 ОСТАТКИ:
-{context.inventory_summary}
-
-🧪 АКТИВНЫЕ ЭКСПЕРИМЕНТЫ:
-{context.experiments_summary}
-
 ИНСТРУМЕНТЫ:
 У тебя есть доступ к инструментам для работы с Ozon API:
 
@@ -132,11 +122,12 @@ def build_system_prompt(context: BusinessContext) -> str:
 
 📢 Управление рекламой (Performance API):
 - get_ad_campaigns: список рекламных кампаний
-- get_campaign_stats: статистика кампании (показы, клики, расходы, заказы)
+- get_campaign_stats: статистика кампании (показы, клики, расходы, заказы); для сравнения — список ID одним вызовом
 - get_campaign_products: товары в кампании с их ставками
 - activate_ad_campaign: ВКЛЮЧИТЬ кампанию
 - deactivate_ad_campaign: ВЫКЛЮЧИТЬ кампанию
 - set_product_ad_bid: изменить ставку на товар
+- set_product_ad_bids: изменить ставки сразу на несколько товаров кампании
 
 🧪 Рекламные эксперименты:
 - start_ad_experiment: запустить эксперимент (фиксирует базовые метрики)
@@ -184,7 +175,7 @@ def build_system_prompt(context: BusinessContext) -> str:
 ВАЖНЫЕ ПРАВИЛА:
 1. Ozon API без Premium даёт аналитику только за последние 3 месяца
 2. Перед включением/выключением рекламы или изменением ставок — ОБЯЗАТЕЛЬНО спроси подтверждение у пользователя!
-3. Данные выше (ТЕКУЩИЕ ДАННЫЕ) — кэш за 7 дней, для точных данных используй инструменты
+3. Блок ТЕКУЩИЕ ДАННЫЕ — кэш за 7 дней, для точных данных используй инструменты
 
 ИНСТРУКЦИИ:
 - Отвечай конкретно, с цифрами из предоставленных данных
@@ -201,3 +192,34 @@ def build_system_prompt(context: BusinessContext) -> str:
 - "Нашёл 3 товара с маржой ниже 15%: [список]. Рекомендую повысить цены или найти других поставщиков."
 - "Нужно срочно заказать 2 товара (запас < 7 дней): Товар A — 150 шт, Товар B — 80 шт."
 """
+
+# Stable id of the static prefix: sent as `user` so routing proxies (LiteLLM,
+# vLLM router) keep requests with the same prefix on the same KV-cache worker
+STATIC_PROMPT_CACHE_KEY = hashlib.sha256(STATIC_PROMPT_PREFIX.encode("utf-8")).hexdigest()[:16]
+
+
+@lru_cache(maxsize=128)
+def build_context_prompt(context: BusinessContext) -> str:
+    """Build the dynamic part of the system prompt (date and current data)."""
+    return f"""ТЕКУЩАЯ ДАТА: {context.today.strftime('%d.%m.%Y')}
+
+ТЕКУЩИЕ ДАННЫЕ:
+
+📦 ТОВАРЫ ({context.products_count} шт):
+{context.products_summary}
+
+📈 ПРОДАЖИ (последние 7 дней):
+{context.sales_summary}
+
+📊 ОСТАТКИ:
+{context.inventory_summary}
+
+🧪 АКТИВНЫЕ ЭКСПЕРИМЕНТЫ:
+{context.experiments_summary}
+"""
+
+
+@lru_cache(maxsize=128)
+def build_system_prompt(context: BusinessContext) -> str:
+    """Build complete system prompt with business context."""
+    return f"{STATIC_PROMPT_PREFIX}\n{build_context_prompt(context)}"
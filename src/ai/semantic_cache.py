@@ -0,0 +1,122 @@
+"""Semantic response cache for AI assistant.
+
+Stores answers keyed by the embedding of the user question and the business
+context they were generated for. A new question that is close enough
+(cosine similarity) to a cached one under the same context gets the cached
+answer without an LLM round-trip.
+"""
+
+import asyncio
+import logging
+import math
+import operator
+import time
+from dataclasses import dataclass
+from typing import Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    """Single cached answer."""
+
+    context_key: Hashable
+    embedding: list[float]
+    response: str
+    created_at: float
+
+
+class SemanticCache:
+    """In-memory cache of assistant answers with similarity lookup and TTL."""
+
+    EMBEDDING_MODEL = "text-embedding-3-small"
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        ttl_seconds: float = 1800,
+        max_entries: int = 256,
+    ):
+        """Initialize cache.
+
+        Args:
+            threshold: Minimum cosine similarity to treat questions as equal
+            ttl_seconds: How long an answer stays valid
+            max_entries: Maximum number of stored answers (oldest evicted first)
+        """
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: list[_CacheEntry] = []
+
+    async def embed(self, openai_client, text: str) -> Optional[list[float]]:
+        """Embed text and normalize the vector (None if embedding failed)."""
+        try:
+            response = await openai_client.embeddings.create(
+                model=self.EMBEDDING_MODEL, input=text
+            )
+        except Exception as e:
+            logger.warning(f"Failed to embed message for cache: {e}")
+            return None
+
+        vector = response.data[0].embedding
+        norm = math.sqrt(sum(x * x for x in vector))
+        if norm == 0:
+            return None
+        return [x / norm for x in vector]
+
+    async def get(self, embedding: list[float], context_key: Hashable) -> Optional[str]:
+        """Find cached answer for a similar question under the same context.
+
+        The similarity scan runs in a worker thread to keep the event loop free.
+        """
+        self._evict_expired()
+        candidates = [entry for entry in self._entries if entry.context_key == context_key]
+        if not candidates:
+            return None
+        return await asyncio.to_thread(self._best_match, embedding, candidates)
+
+    def _best_match(self, embedding: list[float], candidates: list[_CacheEntry]) -> Optional[str]:
+        """Answer of the most similar candidate if it passes the threshold."""
+        best_score = 0.0
+        best_response = None
+        for entry in candidates:
+            score = sum(map(operator.mul, embedding, entry.embedding))
+            if score > best_score:
+                best_score = score
+                best_response = entry.response
+
+        if best_response is not None and best_score >= self.threshold:
+            logger.info(f"Semantic cache hit (similarity {best_score:.3f})")
+            return best_response
+        return None
+
+    def put(self, embedding: list[float], context_key: Hashable, response: str) -> None:
+        """Store answer for a question."""
+        self._evict_expired()
+        self._entries.append(
+            _CacheEntry(
+                context_key=context_key,
+                embedding=embedding,
+                response=response,
+                created_at=time.monotonic(),
+            )
+        )
+        if len(self._entries) > self.max_entries:
+            del self._entries[: len(self._entries) - self.max_entries]
+
+    def clear(self) -> None:
+        """Drop all cached answers."""
+        self._entries.clear()
+
+    def _evict_expired(self) -> None:
+        """Remove entries older than TTL (entries are kept in insertion order)."""
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = 0
+        for entry in self._entries:
+            if entry.created_at >= cutoff:
+                break
+            expired += 1
+        if expired:
+            del self._entries[:expired]
@@ -0,0 +1,110 @@
+"""Speculative tool prefetch for AI assistant.
+
+Many questions deterministically need the same tool ("какие остатки?" always
+ends in get_current_stocks). The likely call is started in parallel with the
+first model completion; if the model then requests exactly that call, its
+result is already (or almost) ready.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Callable, Optional
+
+from src.ai.tools import READ_ONLY_TOOLS, execute_tool
+
+logger = logging.getLogger(__name__)
+
+
+def _no_args() -> dict[str, Any]:
+    return {}
+
+
+def _yesterday_sales() -> dict[str, Any]:
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    return {"date_from": yesterday, "date_to": yesterday}
+
+
+def _today_sales() -> dict[str, Any]:
+    today = date.today().isoformat()
+    return {"date_from": today, "date_to": today}
+
+
+def _running_campaigns() -> dict[str, Any]:
+    return {"state": "CAMPAIGN_STATE_RUNNING"}
+
+
+@dataclass(frozen=True)
+class _Rule:
+    """Keyword rule: all keywords present in the message -> tool call."""
+
+    keywords: tuple[str, ...]
+    tool_name: str
+    build_input: Callable[[], dict[str, Any]] = _no_args
+
+
+# Checked in order, first match wins (more specific rules first)
+SPECULATION_RULES: tuple[_Rule, ...] = (
+    _Rule(("продаж", "вчера"), "get_sales_analytics", _yesterday_sales),
+    _Rule(("продаж", "сегодня"), "get_sales_analytics", _today_sales),
+    _Rule(("остат",), "get_current_stocks"),
+    _Rule(("запас",), "get_current_stocks"),
+    _Rule(("наличи",), "get_current_stocks"),
+    _Rule(("активн", "кампани"), "get_ad_campaigns", _running_campaigns),
+    _Rule(("реклам",), "get_ad_campaigns"),
+    _Rule(("кампани",), "get_ad_campaigns"),
+    _Rule(("ассортимент",), "get_product_list"),
+    _Rule(("список", "товар"), "get_product_list"),
+)
+
+
+@dataclass
+class SpeculativeCall:
+    """Tool call started ahead of the model's decision."""
+
+    tool_name: str
+    tool_input: dict[str, Any]
+    task: asyncio.Task
+    used: bool = field(default=False)
+
+    def take(self, tool_name: str, tool_input: dict[str, Any]) -> Optional[asyncio.Task]:
+        """Return the prefetched task if the model asked for exactly this call."""
+        if self.used or tool_name != self.tool_name or tool_input != self.tool_input:
+            return None
+        self.used = True
+        logger.info(f"Speculative tool call hit: {tool_name}")
+        return self.task
+
+    def discard(self) -> None:
+        """Cancel the prefetch if the model did not ask for it."""
+        if not self.used:
+            self.task.cancel()
+
+
+class ToolSpeculator:
+    """Predicts the first tool call from the user message with keyword rules."""
+
+    def __init__(self, rules: tuple[_Rule, ...] = SPECULATION_RULES):
+        self.rules = rules
+
+    def predict(self, user_message: str) -> Optional[tuple[str, dict[str, Any]]]:
+        """Predict (tool_name, tool_input) for a message, None if unsure."""
+        text = user_message.lower()
+        for rule in self.rules:
+            if rule.tool_name not in READ_ONLY_TOOLS:
+                continue
+            if all(keyword in text for keyword in rule.keywords):
+                return rule.tool_name, rule.build_input()
+        return None
+
+    def start(self, user_message: str) -> Optional[SpeculativeCall]:
+        """Start the predicted tool call in the background (must be in a running loop)."""
+        prediction = self.predict(user_message)
+        if prediction is None:
+            return None
+
+        tool_name, tool_input = prediction
+        logger.info(f"Speculatively prefetching {tool_name} with {tool_input}")
+        task = asyncio.create_task(execute_tool(tool_name, tool_input))
+        return SpeculativeCall(tool_name=tool_name, tool_input=tool_input, task=task)
@@ -1,22 +1,32 @@
 """Tools for AI assistant to query Ozon data."""
 
+import asyncio
+import bisect
+import heapq
 import logging
-from datetime import date, datetime
-from decimal import Decimal
-from typing import Any
-
-from openai import AsyncOpenAI
-
-from src.config import settings
-from src.ozon.client import OzonClient
-from src.ozon.performance import PerformanceClient
+import time
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from functools import partial
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Mapping, Optional, Union
+
+import orjson
+
+from src.ai.clients import get_async_openai, get_ozon_client, get_performance_client
 from src.database.engine import AsyncSessionLocal
+from src.database.models import Product
 from src.database.repositories.ad_experiments import AdExperimentRepository
+from src.database.repositories.products import ProductRepository
+from src.ozon.models import OzonProductFull, OzonStockItem
+from src.utils.batching import AsyncBatcher
 
 logger = logging.getLogger(__name__)
 
 # Tool definitions (Anthropic format, kept for reference)
-TOOLS = [
+TOOLS = (
     {
         "name": "get_sales_analytics",
         "description": "Получить данные о продажах с Ozon за указанный период. Используй этот инструмент когда пользователь спрашивает о продажах, выручке, количестве заказов за конкретные даты или периоды (например, 'продажи за январь 2025', 'сравни продажи в декабре и ноябре').",
@@ -90,13 +100,14 @@ TOOLS = [
     },
     {
         "name": "get_campaign_stats",
-        "description": "Получить статистику рекламной кампании за период: показы, клики, расходы, заказы. Используй когда нужна аналитика по рекламе.",
+        "description": "Получить статистику рекламной кампании за период: показы, клики, расходы, заказы. Используй когда нужна аналитика по рекламе. Для сравнения кампаний передай список ID одним вызовом.",
         "input_schema": {
             "type": "object",
             "properties": {
                 "campaign_id": {
-                    "type": "string",
-                    "description": "ID рекламной кампании"
+                    "type": ["string", "array"],
+                    "items": {"type": "string"},
+                    "description": "ID рекламной кампании или список ID для сравнения"
                 },
                 "date_from": {
                     "type": "string",
@@ -160,6 +171,32 @@ TOOLS = [
             "required": ["campaign_id", "product_id", "bid"]
         }
     },
+    {
+        "name": "set_product_ad_bids",
+        "description": "Установить ставки сразу на несколько товаров одной рекламной кампании (один запрос вместо нескольких). ВАЖНО: используй только после подтверждения пользователя!",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "campaign_id": {
+                    "type": "string",
+                    "description": "ID рекламной кампании"
+                },
+                "bids": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "product_id": {"type": "integer", "description": "ID товара (SKU)"},
+                            "bid": {"type": "number", "description": "Ставка в рублях"}
+                        },
+                        "required": ["product_id", "bid"]
+                    },
+                    "description": "Список ставок: товар и ставка в рублях"
+                }
+            },
+            "required": ["campaign_id", "bids"]
+        }
+    },
     {
         "name": "get_campaign_products",
         "description": "Получить список товаров в рекламной кампании с их ставками.",
@@ -423,15 +460,14 @@ Actionable рекомендации можно сразу запустить к
             },
             "required": ["product_id", "recommendation_type", "new_value"]
         }
-    }
-]
+    },
+)
 
 
-def _convert_to_openai_format(tools: list) -> list:
+def _convert_to_openai_format(tools: tuple) -> tuple:
     """Convert Anthropic tool format to OpenAI function calling format."""
-    openai_tools = []
-    for tool in tools:
-        openai_tool = {
+    return tuple(
+        {
             "type": "function",
             "function": {
                 "name": tool["name"],
@@ -439,13 +475,150 @@ def _convert_to_openai_format(tools: list) -> list:
                 "parameters": tool["input_schema"]
             }
         }
-        openai_tools.append(openai_tool)
-    return openai_tools
+        for tool in tools
+    )
 
 
-# OpenAI format tools
+# OpenAI format tools (built once at import, shared read-only by all requests)
 TOOLS_OPENAI = _convert_to_openai_format(TOOLS)
 
+# Tool names and input schemas for O(1) lookup by callers and validation
+KNOWN_TOOL_NAMES = frozenset(tool["name"] for tool in TOOLS)
+TOOL_SCHEMAS: dict[str, dict] = {tool["name"]: tool["input_schema"] for tool in TOOLS}
+
+# JSON schema types -> Python types (bool is excluded from numbers explicitly)
+_JSON_TYPES: dict[str, tuple[type, ...]] = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+}
+
+
+def _compile_validator(schema: dict) -> Callable[[dict[str, Any]], Optional[str]]:
+    """Precompile a tool input schema into a checker returning an error or None.
+
+    Covers the subset of JSON schema the tool definitions use: required fields,
+    property types (one or a list of alternatives) and enums.
+    """
+    required = tuple(schema.get("required", ()))
+    checks = []
+    for name, prop in schema.get("properties", {}).items():
+        # "type" may list several alternatives, e.g. ["string", "array"]
+        json_types = prop.get("type")
+        if not isinstance(json_types, list):
+            json_types = [json_types]
+        types = tuple(t for json_type in json_types for t in _JSON_TYPES.get(json_type, (object,)))
+        checks.append((
+            name,
+            types,
+            bool({"integer", "number"} & set(json_types)),
+            frozenset(prop["enum"]) if "enum" in prop else None,
+        ))
+
+    def validate(tool_input: dict[str, Any]) -> Optional[str]:
+        if not isinstance(tool_input, dict):
+            return "ожидается объект с параметрами"
+        for name in required:
+            if name not in tool_input:
+                return f"не указан параметр {name}"
+        for name, types, numeric, enum in checks:
+            if name not in tool_input:
+                continue
+            value = tool_input[name]
+            if not isinstance(value, types) or (numeric and isinstance(value, bool)):
+                return f"неверный тип параметра {name}"
+            if enum is not None and value not in enum:
+                return f"недопустимое значение {name}: {value}"
+        return None
+
+    return validate
+
+
+_VALIDATORS = {name: _compile_validator(schema) for name, schema in TOOL_SCHEMAS.items()}
+
+# Tools that only read data (safe to cache, never change anything in OZON/DB)
+READ_ONLY_TOOLS = frozenset({
+    "get_sales_analytics",
+    "get_current_stocks",
+    "get_product_list",
+    "get_product_analytics",
+    "get_ad_campaigns",
+    "get_campaign_stats",
+    "get_campaign_products",
+    "get_active_ad_experiments",
+    "get_active_content_experiments",
+})
+
+
+# Result prefixes of tools that failed or found nothing to work with
+TOOL_ERROR_PREFIXES = (
+    "❌",
+    "Ошибка",
+    "Не удалось",
+    "Неизвестн",
+    "Некорректн",
+    "Нет данных",
+)
+
+
+def is_tool_error(result: str) -> bool:
+    """Check whether a tool result is an error or an empty answer."""
+    return result.lstrip().startswith(TOOL_ERROR_PREFIXES)
+
+
+# Product search results, shared by tool calls for a short time
+PRODUCTS_CACHE_TTL = 60  # seconds
+PRODUCTS_CACHE_MAX_QUERIES = 256
+_products_cache: dict[str, tuple[float, Optional[Product]]] = {}
+
+
+def invalidate_products_cache() -> None:
+    """Drop cached product lookups (call after product data changes, e.g. OZON sync)."""
+    _products_cache.clear()
+
+
+async def _find_active_product(search_query: str) -> Optional[Product]:
+    """Find the best active product whose name or offer_id contains the query."""
+    now = time.monotonic()
+    cached = _products_cache.get(search_query)
+    if cached is not None and now - cached[0] <= PRODUCTS_CACHE_TTL:
+        return cached[1]
+
+    async with AsyncSessionLocal() as session:
+        matches = await ProductRepository(session).search_by_name(search_query, limit=1)
+    product = matches[0] if matches else None
+
+    if len(_products_cache) >= PRODUCTS_CACHE_MAX_QUERIES:
+        _products_cache.clear()
+    _products_cache[search_query] = (now, product)
+    return product
+
+
+# Results of read-only tools, reused within a fixed time bucket
+TOOL_CACHE_BUCKET_SECONDS = 300
+TOOL_CACHE_MAX_ENTRIES = 512
+_tool_cache: dict[tuple[str, bytes], str] = {}
+_tool_cache_bucket = 0
+_tool_cache_stats = {"hits": 0, "misses": 0}
+_tool_inflight: dict[tuple[str, bytes], asyncio.Task] = {}
+# Bumped on every invalidation; a read started under an older generation is not cached
+_tool_cache_generation = 0
+
+
+def invalidate_tool_cache() -> None:
+    """Drop cached read-only tool results (call after data changes, e.g. OZON sync).
+
+    Reads still running at this point do not store their results, and later
+    calls do not join them.
+    """
+    global _tool_cache_generation
+    _tool_cache_generation += 1
+    _tool_cache.clear()
+    _tool_inflight.clear()
+
 
 async def execute_tool(tool_name: str, tool_input: dict[str, Any]) -> str:
     """Execute a tool and return the result as a string.
@@ -459,70 +632,145 @@ async def execute_tool(tool_name: str, tool_input: dict[str, Any]) -> str:
     """
     logger.info(f"Executing tool: {tool_name} with input: {tool_input}")
 
+    if tool_name not in KNOWN_TOOL_NAMES:
+        return f"Неизвестный инструмент: {tool_name}"
+    error = _VALIDATORS[tool_name](tool_input)
+    if error:
+        logger.warning(f"Invalid input for {tool_name}: {error}")
+        return f"Некорректные параметры для {tool_name}: {error}"
+
+    if tool_name not in READ_ONLY_TOOLS:
+        result = await _run_tool(tool_name, tool_input)
+        # Something may have changed in OZON/DB - cached reads are stale now
+        invalidate_tool_cache()
+        return result
+
+    generation = _tool_cache_generation
+    cache_key = _tool_cache_key(tool_name, tool_input)
+    cached = _tool_cache.get(cache_key)
+    if cached is not None:
+        _tool_cache_stats["hits"] += 1
+        logger.info(
+            f"Tool cache hit: {tool_name} "
+            f"({_tool_cache_stats['hits']} hits, {_tool_cache_stats['misses']} misses)"
+        )
+        return cached
+
+    # Identical concurrent calls share one execution instead of all missing the cache
+    task = _tool_inflight.get(cache_key)
+    if task is None:
+        _tool_cache_stats["misses"] += 1
+        task = asyncio.create_task(_run_tool(tool_name, tool_input))
+        _tool_inflight[cache_key] = task
+        task.add_done_callback(partial(_forget_inflight, cache_key))
+    else:
+        logger.info(f"Tool call joined in-flight execution: {tool_name}")
+
+    # shield: a cancelled caller must not cancel the call other callers wait for
+    result = await asyncio.shield(task)
+    if not is_tool_error(result) and generation == _tool_cache_generation:
+        _tool_cache[cache_key] = result
+    return result
+
+
+def _forget_inflight(cache_key: tuple[str, bytes], task: asyncio.Task) -> None:
+    """Remove a finished task from the in-flight map (unless a newer one replaced it)."""
+    if _tool_inflight.get(cache_key) is task:
+        del _tool_inflight[cache_key]
+
+
+async def _run_tool(tool_name: str, tool_input: dict[str, Any]) -> str:
+    """Run a tool handler, turning exceptions into an error message."""
     try:
-        # Seller API tools
-        if tool_name == "get_sales_analytics":
-            return await _get_sales_analytics(tool_input)
-        elif tool_name == "get_current_stocks":
-            return await _get_current_stocks()
-        elif tool_name == "get_product_list":
-            return await _get_product_list()
-        elif tool_name == "get_product_analytics":
-            return await _get_product_analytics(tool_input)
-        # Performance API tools (advertising)
-        elif tool_name == "get_ad_campaigns":
-            return await _get_ad_campaigns(tool_input)
-        elif tool_name == "get_campaign_stats":
-            return await _get_campaign_stats(tool_input)
-        elif tool_name == "activate_ad_campaign":
-            return await _activate_ad_campaign(tool_input)
-        elif tool_name == "deactivate_ad_campaign":
-            return await _deactivate_ad_campaign(tool_input)
-        elif tool_name == "set_product_ad_bid":
-            return await _set_product_ad_bid(tool_input)
-        elif tool_name == "get_campaign_products":
-            return await _get_campaign_products(tool_input)
-        # Ad experiment tools
-        elif tool_name == "start_ad_experiment":
-            return await _start_ad_experiment(tool_input)
-        elif tool_name == "get_active_ad_experiments":
-            return await _get_active_ad_experiments()
-        elif tool_name == "check_ad_experiment":
-            return await _check_ad_experiment(tool_input)
-        elif tool_name == "complete_ad_experiment":
-            return await _complete_ad_experiment(tool_input)
-        # Quick content update tools
-        elif tool_name == "update_product_name":
-            return await _update_product_name(tool_input)
-        # Content experiment tools
-        elif tool_name == "start_content_experiment":
-            return await _start_content_experiment(tool_input)
-        elif tool_name == "get_active_content_experiments":
-            return await _get_active_content_experiments()
-        elif tool_name == "check_content_experiment":
-            return await _check_content_experiment(tool_input)
-        elif tool_name == "complete_content_experiment":
-            return await _complete_content_experiment(tool_input)
-        # Card audit tools
-        elif tool_name == "audit_product_card":
-            return await _audit_product_card(tool_input)
-        elif tool_name == "apply_card_recommendation":
-            return await _apply_card_recommendation(tool_input)
-        else:
-            return f"Неизвестный инструмент: {tool_name}"
+        handler = _DISPATCH_WITH_PARAMS.get(tool_name)
+        if handler:
+            return await handler(tool_input)
+        return await _DISPATCH_NOARG[tool_name]()
     except Exception as e:
         logger.error(f"Tool execution error: {e}")
         return f"Ошибка при выполнении запроса: {str(e)}"
 
 
+def _tool_cache_key(tool_name: str, tool_input: dict[str, Any]) -> tuple[str, bytes]:
+    """Cache key for a read-only tool call within the current time bucket.
+
+    The cache is cleared when a new bucket starts, so identical calls share one
+    result for at most TOOL_CACHE_BUCKET_SECONDS.
+    """
+    global _tool_cache_bucket
+    bucket = int(time.time() // TOOL_CACHE_BUCKET_SECONDS)
+    if bucket != _tool_cache_bucket or len(_tool_cache) >= TOOL_CACHE_MAX_ENTRIES:
+        _tool_cache.clear()
+        _tool_cache_bucket = bucket
+    if tool_name == "get_sales_analytics":
+        tool_input = _clamp_date_to_today(tool_input)
+    return tool_name, orjson.dumps(tool_input, option=orjson.OPT_SORT_KEYS)
+
+
+def _clamp_date_to_today(tool_input: dict[str, Any]) -> dict[str, Any]:
+    """Replace a future date_to with today (the tool does the same before querying)."""
+    try:
+        date_to = date.fromisoformat(tool_input.get("date_to"))
+    except (ValueError, TypeError):
+        return tool_input
+    today = date.today()
+    if date_to <= today:
+        return tool_input
+    return {**tool_input, "date_to": today.isoformat()}
+
+
+def _aggregate_sales_rows(rows: list[dict]) -> tuple[dict[str, dict], dict[str, dict]]:
+    """Sum ordered units and revenue per product and per day in one pass.
+
+    Args:
+        rows: Analytics rows with dimensions [sku, day] and metrics [ordered_units, revenue]
+
+    Returns:
+        (product_sales, daily_totals), both mapping key -> {"qty", "revenue"}
+    """
+    product_sales: defaultdict[str, dict] = defaultdict(lambda: {"qty": 0, "revenue": 0})
+    daily_totals: defaultdict[str, dict] = defaultdict(lambda: {"qty": 0, "revenue": 0})
+
+    for row in rows:
+        dimensions = row.get("dimensions", [])
+        metrics = row.get("metrics", [])
+        if len(dimensions) < 2 or len(metrics) < 2:
+            continue
+
+        qty = int(metrics[0]) if metrics[0] else 0
+        revenue = float(metrics[1]) if metrics[1] else 0
+
+        # Aggregate by product (one lookup per row)
+        stats = product_sales[dimensions[0].get("name", "Неизвестный товар")]
+        stats["qty"] += qty
+        stats["revenue"] += revenue
+
+        # Aggregate by day
+        stats = daily_totals[dimensions[1].get("id", "")]
+        stats["qty"] += qty
+        stats["revenue"] += revenue
+
+    return dict(product_sales), dict(daily_totals)
+
+
+def _short(text: str, max_length: int = 50) -> str:
+    """Cut a product name or other text for tool output, marking the cut with an ellipsis."""
+    return f"{text[:max_length]}..." if len(text) > max_length else text
+
+
+def _rub(value: float) -> str:
+    """Format a ruble amount with thousands separators (rounded once to int)."""
+    return f"{round(value):,}"
+
+
 async def _get_sales_analytics(params: dict) -> str:
     """Get sales analytics from Ozon API."""
     date_from_str = params.get("date_from")
     date_to_str = params.get("date_to")
 
     try:
-        date_from = datetime.strptime(date_from_str, "%Y-%m-%d").date()
-        date_to = datetime.strptime(date_to_str, "%Y-%m-%d").date()
+        date_from = date.fromisoformat(date_from_str)
+        date_to = date.fromisoformat(date_to_str)
     except (ValueError, TypeError) as e:
         return f"Некорректный формат даты. Используй YYYY-MM-DD. Ошибка: {e}"
 
@@ -530,161 +778,198 @@ async def _get_sales_analytics(params: dict) -> str:
     if date_from > date_to:
         return "Начальная дата должна быть раньше конечной"
 
-    if date_to > date.today():
-        date_to = date.today()
+    today = date.today()
+    if date_to > today:
+        date_to = today
+        date_to_str = date_to.isoformat()
 
-    client = OzonClient()
+    client = get_ozon_client()
     try:
-        try:
-            analytics = await client.get_analytics_data(
-                date_from=date_from,
-                date_to=date_to,
-                metrics=["ordered_units", "revenue"],
-                dimension=["sku", "day"],
-            )
-        except Exception as api_error:
-            error_msg = str(api_error)
-            if "400" in error_msg:
-                return (
-                    f"Нет данных за период {date_from_str} - {date_to_str}. "
-                    f"Ограничение Ozon API: без Premium подписки аналитика доступна только за последние 3 месяца. "
-                    f"Попробуй запросить данные за более поздний период."
-                )
-            raise
-
-        data = analytics.get("data", [])
-        totals = analytics.get("totals", [0, 0])
-
-        if not data:
-            return f"Нет данных о продажах за период {date_from_str} - {date_to_str}"
-
-        # Aggregate by product
-        product_sales = {}
-        daily_totals = {}
-
-        for row in data:
-            dimensions = row.get("dimensions", [])
-            metrics = row.get("metrics", [])
-
-            if len(dimensions) >= 2 and len(metrics) >= 2:
-                product_name = dimensions[0].get("name", "Неизвестный товар")
-                sale_date = dimensions[1].get("id", "")
-                qty = int(metrics[0]) if metrics[0] else 0
-                revenue = float(metrics[1]) if metrics[1] else 0
-
-                # Aggregate by product
-                if product_name not in product_sales:
-                    product_sales[product_name] = {"qty": 0, "revenue": 0}
-                product_sales[product_name]["qty"] += qty
-                product_sales[product_name]["revenue"] += revenue
-
-                # Aggregate by day
-                if sale_date not in daily_totals:
-                    daily_totals[sale_date] = {"qty": 0, "revenue": 0}
-                daily_totals[sale_date]["qty"] += qty
-                daily_totals[sale_date]["revenue"] += revenue
-
-        # Build response
-        total_qty = totals[0] if len(totals) > 0 else 0
-        total_revenue = totals[1] if len(totals) > 1 else 0
-
-        result = f"📊 ПРОДАЖИ ЗА ПЕРИОД {date_from_str} - {date_to_str}:\n\n"
-        result += f"Всего продано: {total_qty} шт\n"
-        result += f"Общая выручка: {total_revenue:,.0f} ₽\n"
-        result += f"Дней в периоде: {(date_to - date_from).days + 1}\n"
-
-        if total_qty > 0:
-            result += f"Средний чек: {total_revenue / total_qty:,.0f} ₽\n"
-
-        # Top products
-        sorted_products = sorted(
-            product_sales.items(),
-            key=lambda x: x[1]["revenue"],
-            reverse=True
+        analytics = await client.get_analytics_data(
+            date_from=date_from,
+            date_to=date_to,
+            metrics=["ordered_units", "revenue"],
+            dimension=["sku", "day"],
         )
+    except Exception as api_error:
+        error_msg = str(api_error)
+        if "400" in error_msg:
+            return (
+                f"Нет данных за период {date_from_str} - {date_to_str}. "
+                f"Ограничение Ozon API: без Premium подписки аналитика доступна только за последние 3 месяца. "
+                f"Попробуй запросить данные за более поздний период."
+            )
+        raise
 
-        if sorted_products:
-            result += f"\n📦 ПРОДАЖИ ПО ТОВАРАМ:\n"
-            for name, stats in sorted_products[:10]:
-                short_name = name[:50] + "..." if len(name) > 50 else name
-                result += f"• {short_name}: {stats['qty']} шт, {stats['revenue']:,.0f} ₽\n"
+    data = analytics.get("data", [])
+    totals = analytics.get("totals", [0, 0])
 
-        # Daily breakdown (last 7 days only to keep response short)
-        sorted_days = sorted(daily_totals.items(), reverse=True)[:7]
-        if sorted_days:
-            result += f"\n📅 ПО ДНЯМ (последние 7):\n"
-            for day, stats in sorted_days:
-                result += f"• {day}: {stats['qty']} шт, {stats['revenue']:,.0f} ₽\n"
+    if not data:
+        return f"Нет данных о продажах за период {date_from_str} - {date_to_str}"
 
-        return result
+    product_sales, daily_totals = _aggregate_sales_rows(data)
+
+    # Build response
+    total_qty = totals[0] if len(totals) > 0 else 0
+    total_revenue = totals[1] if len(totals) > 1 else 0
+
+    parts: list[str] = [
+        f"📊 ПРОДАЖИ ЗА ПЕРИОД {date_from_str} - {date_to_str}:\n\n",
+        f"Всего продано: {total_qty} шт\n",
+        f"Общая выручка: {_rub(total_revenue)} ₽\n",
+        f"Дней в периоде: {(date_to - date_from).days + 1}\n",
+    ]
+
+    if total_qty > 0:
+        parts.append(f"Средний чек: {_rub(total_revenue / total_qty)} ₽\n")
+
+    # Top products
+    sorted_products = heapq.nlargest(10, product_sales.items(), key=lambda x: x[1]["revenue"])
+
+    if sorted_products:
+        parts.append("\n📦 ПРОДАЖИ ПО ТОВАРАМ:\n")
+        parts.extend(
+            f"• {_short(name)}: "
+            f"{stats['qty']} шт, {_rub(stats['revenue'])} ₽\n"
+            for name, stats in sorted_products
+        )
+
+    # Daily breakdown (last 7 days only to keep response short)
+    sorted_days = heapq.nlargest(7, daily_totals.items(), key=lambda x: x[0])
+    if sorted_days:
+        parts.append("\n📅 ПО ДНЯМ (последние 7):\n")
+        parts.extend(
+            f"• {day}: {stats['qty']} шт, {_rub(stats['revenue'])} ₽\n" for day, stats in sorted_days
+        )
 
-    finally:
-        await client.close()
+    return "".join(parts)
 
 
 async def _get_current_stocks() -> str:
     """Get current stock levels from Ozon API."""
-    client = OzonClient()
-    try:
-        stocks = await client.get_stocks()
+    client = get_ozon_client()
+    stocks = await client.get_stocks()
 
-        if not stocks:
-            return "Нет данных об остатках"
+    if not stocks:
+        return "Нет данных об остатках"
 
-        result = "📦 ТЕКУЩИЕ ОСТАТКИ НА СКЛАДАХ:\n\n"
+    parts: list[str] = ["📦 ТЕКУЩИЕ ОСТАТКИ НА СКЛАДАХ:\n\n"]
 
-        total_items = 0
-        for item in stocks:
-            if not item.stocks:
-                continue
+    total_items = 0
+    for item in stocks:
+        if not item.stocks:
+            continue
 
-            for stock in item.stocks:
-                warehouse = stock.warehouse_name or stock.type or "FBO"
-                present = stock.present
-                reserved = stock.reserved
-                available = present - reserved
+        for stock in item.stocks:
+            warehouse = stock.warehouse_name or stock.type or "FBO"
+            present = stock.present
+            reserved = stock.reserved
+            available = present - reserved
 
-                total_items += present
+            total_items += present
 
-                result += f"• Товар {item.offer_id} ({warehouse}):\n"
-                result += f"  На складе: {present} шт, Резерв: {reserved} шт, Доступно: {available} шт\n"
+            parts.extend([
+                f"• Товар {item.offer_id} ({warehouse}):\n",
+                f"  На складе: {present} шт, Резерв: {reserved} шт, Доступно: {available} шт\n",
+            ])
 
-        result += f"\nВсего на складах: {total_items} шт"
+    parts.append(f"\nВсего на складах: {total_items} шт")
+
+    return "".join(parts)
 
-        return result
 
-    finally:
-        await client.close()
+# The model does not use more than this many products from a list answer
+PRODUCT_LIST_MAX_ITEMS = 200
 
 
 async def _get_product_list() -> str:
     """Get product list with prices from Ozon API."""
-    client = OzonClient()
-    try:
-        products = await client.get_product_list()
+    client = get_ozon_client()
+    lines: list[str] = []
+    truncated = False
+
+    async for page in client.iter_product_pages():
+        for p in page:
+            if len(lines) >= PRODUCT_LIST_MAX_ITEMS:
+                truncated = True
+                break
+            old_price = f" (старая: {p.old_price} ₽)" if p.old_price and p.old_price != "0" else ""
+            lines.append(f"• {_short(p.name)}\n  Артикул: {p.offer_id}\n  Цена: {p.price} ₽{old_price}\n\n")
+        if truncated:
+            break
+
+    if not lines:
+        return "Нет товаров"
+
+    header = f"📋 СПИСОК ТОВАРОВ ({len(lines)} шт):\n\n"
+    footer = f"... показаны первые {PRODUCT_LIST_MAX_ITEMS} товаров\n" if truncated else ""
+    return header + "".join(lines) + footer
+
+
+def _result_or_default(name: str, result: Any, default: Any) -> Any:
+    """Unwrap an asyncio.gather(return_exceptions=True) result, logging failures."""
+    if isinstance(result, Exception):
+        logger.warning(f"Failed to fetch {name}: {result}")
+        return default
+    return result
+
+
+# Attribute categories a cosmetics title should mention (keywords are lowercase)
+COSMETIC_KEYWORDS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("объём/вес", ("мл", "ml", "г", "гр")),
+    ("для кого", ("мужской", "женский", "унисекс", "для мужчин", "для женщин")),
+    ("тип кожи", ("для сухой", "для жирной", "для комбинированной", "для всех типов")),
+    ("эффект", ("увлажняющий", "антивозрастной", "питательный", "матирующий", "лифтинг")),
+    ("бренд", ("yskin", "y skin")),
+)
 
-        if not products:
-            return "Нет товаров"
 
-        # Get detailed info
-        product_ids = [p.product_id for p in products]
-        details = await client.get_product_info(product_ids)
+# Trend change (%) bands: below -5 falling, from 5 up rising
+TREND_THRESHOLDS = (-5, 5)
+TREND_EMOJIS = ("📉", "➡️", "📈")
 
-        result = f"📋 СПИСОК ТОВАРОВ ({len(details)} шт):\n\n"
 
-        for p in details:
-            short_name = p.name[:50] + "..." if len(p.name) > 50 else p.name
-            result += f"• {short_name}\n"
-            result += f"  Артикул: {p.offer_id}\n"
-            result += f"  Цена: {p.price} ₽"
-            if p.old_price and p.old_price != "0":
-                result += f" (старая: {p.old_price} ₽)"
-            result += "\n\n"
+def _pct_change(before: float, after: float) -> float:
+    """Percent change from before to after (0 when there is no base)."""
+    return (after - before) / before * 100 if before > 0 else 0
 
-        return result
 
-    finally:
-        await client.close()
+def _threshold_emoji(value: float, thresholds: tuple, emojis: tuple[str, ...]) -> str:
+    """Pick the label of the band a value falls into.
+
+    Thresholds are ascending band starts: a value equal to a threshold belongs
+    to the band above it. emojis has one more item than thresholds.
+    """
+    return emojis[bisect.bisect_right(thresholds, value)]
+
+
+# Content analytics metrics in report order (both the defaults and
+# get_product_content_analytics always provide all of them)
+_content_metrics = itemgetter("views_pdp", "views_search", "add_to_cart", "cart_conversion")
+
+# Content analytics of a product without SKU (read-only, shared by all calls)
+_EMPTY_CONTENT_ANALYTICS: Mapping[str, int] = MappingProxyType(
+    {"views_pdp": 0, "views_search": 0, "add_to_cart": 0, "cart_conversion": 0}
+)
+
+
+async def _fetch_stocks_by_product(product_ids: list[int]) -> dict[int, list[OzonStockItem]]:
+    """Fetch stocks for many products in one call, grouped by product_id."""
+    grouped: dict[int, list[OzonStockItem]] = defaultdict(list)
+    for item in await get_ozon_client().get_stocks(product_ids):
+        grouped[item.product_id].append(item)
+    return grouped
+
+
+async def _fetch_ratings(product_ids: list[int]) -> dict[int, dict]:
+    """Fetch ratings for many products in one call."""
+    return await get_ozon_client().get_product_rating(product_ids)
+
+
+# Parallel per-product lookups (several get_product_analytics calls in one
+# model turn) are coalesced into a single Ozon request per endpoint
+_stocks_loader: AsyncBatcher[int, list[OzonStockItem]] = AsyncBatcher(_fetch_stocks_by_product, list)
+_rating_loader: AsyncBatcher[int, dict] = AsyncBatcher(_fetch_ratings, dict)
 
 
 async def _get_product_analytics(params: dict) -> str:
@@ -696,21 +981,13 @@ async def _get_product_analytics(params: dict) -> str:
         return "Укажи название товара или его часть для поиска"
 
     async with AsyncSessionLocal() as session:
-        from src.database.repositories.products import ProductRepository
         from src.database.repositories.sales import SalesRepository
         from src.database.repositories.inventory import InventoryRepository
 
-        products_repo = ProductRepository(session)
         sales_repo = SalesRepository(session)
 
         # 1. Find product in local DB
-        all_products = await products_repo.get_all_active()
-
-        matched_product = None
-        for p in all_products:
-            if search_query in p.name.lower() or search_query in (p.offer_id or "").lower():
-                matched_product = p
-                break
+        matched_product = await _find_active_product(search_query)
 
         if not matched_product:
             return f"Товар '{search_query}' не найден в базе. Попробуй другое название или дождись синхронизации данных."
@@ -733,126 +1010,142 @@ async def _get_product_analytics(params: dict) -> str:
         prev_start = today - timedelta(days=days)
         prev_end = current_start - timedelta(days=1)
 
-        # Current period sales from DB
-        curr_sales, curr_revenue = await sales_repo.get_total_sales_for_period(
-            product_id, current_start, current_end
+        # Current and previous period sales from DB (one query)
+        period_totals = await sales_repo.get_totals_for_periods(
+            product_id, [(current_start, current_end), (prev_start, prev_end)]
         )
+        (curr_sales, curr_revenue), (prev_sales, prev_revenue) = period_totals
         curr_revenue = float(curr_revenue)
-
-        # Previous period sales from DB
-        prev_sales, prev_revenue = await sales_repo.get_total_sales_for_period(
-            product_id, prev_start, prev_end
-        )
         prev_revenue = float(prev_revenue)
 
         # Calculate trends
         sales_trend = ((curr_sales - prev_sales) / prev_sales * 100) if prev_sales > 0 else (100 if curr_sales > 0 else 0)
-        revenue_trend = ((curr_revenue - prev_revenue) / prev_revenue * 100) if prev_revenue > 0 else 0
+        revenue_trend = _pct_change(prev_revenue, curr_revenue)
 
         # Daily average
         daily_sales = curr_sales / half_days if half_days > 0 else 0
 
         # 4. Get stocks, ratings, reviews from API (fresh data)
-        client = OzonClient()
-        try:
-            # Stocks
-            stocks = await client.get_stocks([product_id])
-            total_stock = 0
-            stock_details = []
-            for item in stocks:
-                for stock in item.stocks or []:
-                    present = stock.present or 0
-                    reserved = stock.reserved or 0
-                    total_stock += present
-                    wh_name = stock.warehouse_name or stock.type or "FBO"
-                    stock_details.append(f"{wh_name}: {present} шт (резерв: {reserved})")
-
-            # Rating and reviews count
-            rating_info = await client.get_product_rating([product_id])
-            product_rating = rating_info.get(product_id, {})
-            rating = product_rating.get("rating", 0)
-            reviews_count = product_rating.get("reviews_count", 0)
-            questions_count = product_rating.get("questions_count", 0)
-
-            # Try to get actual reviews (may require Premium)
-            reviews = await client.get_reviews_list(product_id, limit=5)
-
-            # Get unanswered questions
-            questions = await client.get_questions_list(product_id, limit=5)
-
-            # Get SKU for analytics (different from product_id!)
+        client = get_ozon_client()
+        async def fetch_sku() -> Optional[int]:
+            # SKU for analytics (different from product_id!)
             product_info = await client.get_product_info([product_id])
-            sku = None
-            if product_info:
-                # SKU is in the raw response, need to fetch it
-                url = f"{client.BASE_URL}/v3/product/info/list"
-                payload = {"product_id": [product_id]}
-                resp = await client.client.post(url, json=payload, headers=client._get_headers())
-                if resp.status_code == 200:
-                    items = resp.json().get("items", [])
-                    if items:
-                        sku = items[0].get("sku")
-
-            # Get views and conversion analytics (requires SKU, not product_id)
-            content_analytics = {"views_pdp": 0, "views_search": 0, "add_to_cart": 0, "cart_conversion": 0}
-            prev_content_analytics = {"views_pdp": 0, "views_search": 0, "add_to_cart": 0, "cart_conversion": 0}
-
-            if sku:
-                content_analytics = await client.get_product_content_analytics(
-                    sku, current_start, current_end
-                )
-                prev_content_analytics = await client.get_product_content_analytics(
-                    sku, prev_start, prev_end
+            return product_info[0].sku if product_info else None
+
+        def detail_requests() -> tuple:
+            return (
+                client.get_reviews_list(product_id, limit=5),  # may require Premium
+                client.get_questions_list(product_id, limit=5),
+                fetch_sku(),
+            )
+
+        # Independent requests: run concurrently, a failed one falls back to empty data.
+        # Without sales, stock and rating are checked first: a product with none
+        # of them is dormant and the remaining requests are skipped.
+        has_sales = curr_sales > 0 or prev_sales > 0
+        stocks, product_rating, *details = await asyncio.gather(
+            _stocks_loader.load(product_id),
+            _rating_loader.load(product_id),
+            *(detail_requests() if has_sales else ()),
+            return_exceptions=True,
+        )
+        stocks = _result_or_default("stocks", stocks, [])
+        product_rating = _result_or_default("rating", product_rating, {})
+
+        # Stocks
+        total_stock = 0
+        stock_details = []
+        for item in stocks:
+            for stock in item.stocks or []:
+                present = stock.present or 0
+                reserved = stock.reserved or 0
+                total_stock += present
+                wh_name = stock.warehouse_name or stock.type or "FBO"
+                stock_details.append(f"{wh_name}: {present} шт (резерв: {reserved})")
+
+        if not has_sales:
+            if total_stock == 0 and not product_rating.get("rating"):
+                return (
+                    f"📦 **{product_name[:60]}**\n"
+                    f"Артикул: {offer_id}\n\n"
+                    f"⚠️ Нет данных об активности товара за последние {days} дней: "
+                    f"нет продаж, остатков на складах и рейтинга.\n"
+                    f"Рекомендация: пополнить остатки или снять товар с продажи."
                 )
+            details = await asyncio.gather(*detail_requests(), return_exceptions=True)
+
+        reviews, questions, sku = details
+        reviews = _result_or_default("reviews", reviews, [])
+        questions = _result_or_default("questions", questions, [])
+        sku = _result_or_default("sku", sku, None)
+
+        # Rating and reviews count
+        rating = product_rating.get("rating", 0)
+        reviews_count = product_rating.get("reviews_count", 0)
+        questions_count = product_rating.get("questions_count", 0)
+
+        # Get views and conversion analytics (requires SKU, not product_id)
+        content_analytics: Mapping[str, Any] = _EMPTY_CONTENT_ANALYTICS
+        prev_content_analytics: Mapping[str, Any] = _EMPTY_CONTENT_ANALYTICS
+
+        # Nothing to analyze for a product that neither sells nor is in stock
+        if sku and (daily_sales > 0 or total_stock > 0):
+            content_analytics, prev_content_analytics = await asyncio.gather(
+                client.get_product_content_analytics(sku, current_start, current_end),
+                client.get_product_content_analytics(sku, prev_start, prev_end),
+            )
 
-        finally:
-            await client.close()
 
         # Days of inventory
         days_of_stock = total_stock / daily_sales if daily_sales > 0 else 999
 
         # 5. Build detailed report
-        result = f"📦 ДЕТАЛЬНЫЙ АНАЛИЗ ТОВАРА\n\n"
-        result += f"**{product_name[:60]}**\n"
-        result += f"Артикул: {offer_id}\n\n"
-
-        result += f"💰 ЦЕНА И МАРЖА:\n"
-        result += f"• Текущая цена: {price:,.0f} ₽\n"
+        parts: list[str] = [
+            f"📦 ДЕТАЛЬНЫЙ АНАЛИЗ ТОВАРА\n\n",
+            f"**{product_name[:60]}**\n",
+            f"Артикул: {offer_id}\n\n",
+        ]
+
+        parts.extend([
+            f"💰 ЦЕНА И МАРЖА:\n",
+            f"• Текущая цена: {price:,.0f} ₽\n",
+        ])
         if cost_price > 0:
-            result += f"• Себестоимость: {cost_price:,.0f} ₽\n"
-            result += f"• Маржа: {margin_pct:.1f}% ({price - cost_price:,.0f} ₽ с единицы)\n"
-            result += f"• Прибыль за {half_days} дней: {(price - cost_price) * curr_sales:,.0f} ₽\n"
-        result += "\n"
-
-        result += f"📈 ПРОДАЖИ (последние {half_days} дней vs предыдущие {half_days}):\n"
-        trend_emoji = "📈" if sales_trend > 5 else "📉" if sales_trend < -5 else "➡️"
-        result += f"• Заказов: {curr_sales} шт {trend_emoji} ({sales_trend:+.1f}% vs {prev_sales} шт)\n"
-        result += f"• Выручка: {curr_revenue:,.0f} ₽ ({revenue_trend:+.1f}% vs {prev_revenue:,.0f} ₽)\n"
-        result += f"• Средний темп: {daily_sales:.1f} шт/день\n"
+            parts.extend([
+                f"• Себестоимость: {cost_price:,.0f} ₽\n",
+                f"• Маржа: {margin_pct:.1f}% ({price - cost_price:,.0f} ₽ с единицы)\n",
+                f"• Прибыль за {half_days} дней: {(price - cost_price) * curr_sales:,.0f} ₽\n",
+            ])
+        parts.append("\n")
+
+        parts.append(f"📈 ПРОДАЖИ (последние {half_days} дней vs предыдущие {half_days}):\n")
+        trend_emoji = _threshold_emoji(sales_trend, TREND_THRESHOLDS, TREND_EMOJIS)
+        parts.extend([
+            f"• Заказов: {curr_sales} шт {trend_emoji} ({sales_trend:+.1f}% vs {prev_sales} шт)\n",
+            f"• Выручка: {curr_revenue:,.0f} ₽ ({revenue_trend:+.1f}% vs {prev_revenue:,.0f} ₽)\n",
+            f"• Средний темп: {daily_sales:.1f} шт/день\n",
+        ])
         if curr_sales > 0:
-            result += f"• Средний чек: {curr_revenue / curr_sales:,.0f} ₽\n"
-        result += "\n"
+            parts.append(f"• Средний чек: {curr_revenue / curr_sales:,.0f} ₽\n")
+        parts.append("\n")
 
-        result += f"📦 ОСТАТКИ:\n"
-        result += f"• Всего на складах: {total_stock} шт\n"
+        parts.extend([
+            f"📦 ОСТАТКИ:\n",
+            f"• Всего на складах: {total_stock} шт\n",
+        ])
         if days_of_stock < 999 and daily_sales > 0:
-            urgency = "🔴 КРИТИЧНО" if days_of_stock < 7 else "🟡 ВНИМАНИЕ" if days_of_stock < 14 else "🟢 ОК"
-            result += f"• Хватит на: ~{days_of_stock:.0f} дней {urgency}\n"
+            urgency = _threshold_emoji(days_of_stock, (7, 14), ("🔴 КРИТИЧНО", "🟡 ВНИМАНИЕ", "🟢 ОК"))
+            parts.append(f"• Хватит на: ~{days_of_stock:.0f} дней {urgency}\n")
         for sd in stock_details[:3]:
-            result += f"  └ {sd}\n"
-        result += "\n"
+            parts.append(f"  └ {sd}\n")
+        parts.append("\n")
 
         # Views and conversion section
-        views_pdp = content_analytics.get("views_pdp", 0)
-        views_search = content_analytics.get("views_search", 0)
-        add_to_cart = content_analytics.get("add_to_cart", 0)
-        cart_conv = content_analytics.get("cart_conversion", 0)
+        views_pdp, views_search, add_to_cart, cart_conv = _content_metrics(content_analytics)
+        prev_views_pdp, _, prev_add_to_cart, _ = _content_metrics(prev_content_analytics)
 
-        prev_views_pdp = prev_content_analytics.get("views_pdp", 0)
-        prev_add_to_cart = prev_content_analytics.get("add_to_cart", 0)
-
-        views_trend = ((views_pdp - prev_views_pdp) / prev_views_pdp * 100) if prev_views_pdp > 0 else 0
-        cart_trend = ((add_to_cart - prev_add_to_cart) / prev_add_to_cart * 100) if prev_add_to_cart > 0 else 0
+        views_trend = _pct_change(prev_views_pdp, views_pdp)
+        cart_trend = _pct_change(prev_add_to_cart, add_to_cart)
 
         # Calculate CTR (views to cart)
         ctr = (add_to_cart / views_pdp * 100) if views_pdp > 0 else 0
@@ -862,53 +1155,57 @@ async def _get_product_analytics(params: dict) -> str:
         # Note: OZON deprecated view metrics in their API
         views_unavailable = content_analytics.get("views_unavailable", False)
         if views_unavailable:
-            result += f"👁 ПРОСМОТРЫ:\n"
-            result += f"• ⚠️ OZON убрал метрики просмотров из API (deprecated)\n"
-            result += f"• Данные о просмотрах, CTR и конверсии недоступны\n"
-            result += f"• Используй личный кабинет OZON для просмотра этих метрик\n"
+            parts.extend([
+                f"👁 ПРОСМОТРЫ:\n",
+                f"• ⚠️ OZON убрал метрики просмотров из API (deprecated)\n",
+                f"• Данные о просмотрах, CTR и конверсии недоступны\n",
+                f"• Используй личный кабинет OZON для просмотра этих метрик\n",
+            ])
         elif views_pdp > 0 or views_search > 0:
-            result += f"👁 ПРОСМОТРЫ И КОНВЕРСИЯ (последние {half_days} дней):\n"
-            views_emoji = "📈" if views_trend > 5 else "📉" if views_trend < -5 else "➡️"
-            result += f"• Просмотры карточки: {views_pdp:,} {views_emoji} ({views_trend:+.1f}%)\n"
-            result += f"• Показы в поиске: {views_search:,}\n"
-            result += f"• Добавлено в корзину: {add_to_cart:,} ({cart_trend:+.1f}%)\n"
-            result += f"• CTR (карточка→корзина): {ctr:.2f}%\n"
-            result += f"• Конверсия (корзина→заказ): {order_conv:.1f}%\n"
-        result += "\n"
+            parts.append(f"👁 ПРОСМОТРЫ И КОНВЕРСИЯ (последние {half_days} дней):\n")
+            views_emoji = _threshold_emoji(views_trend, TREND_THRESHOLDS, TREND_EMOJIS)
+            parts.extend([
+                f"• Просмотры карточки: {views_pdp:,} {views_emoji} ({views_trend:+.1f}%)\n",
+                f"• Показы в поиске: {views_search:,}\n",
+                f"• Добавлено в корзину: {add_to_cart:,} ({cart_trend:+.1f}%)\n",
+                f"• CTR (карточка→корзина): {ctr:.2f}%\n",
+                f"• Конверсия (корзина→заказ): {order_conv:.1f}%\n",
+            ])
+        parts.append("\n")
 
         # Rating, reviews, questions section
-        result += f"⭐ РЕЙТИНГ И ОТЗЫВЫ:\n"
+        parts.append(f"⭐ РЕЙТИНГ И ОТЗЫВЫ:\n")
         if rating > 0:
-            rating_emoji = "🌟" if rating >= 4.5 else "⭐" if rating >= 4.0 else "⚠️"
-            result += f"• Рейтинг: {rating:.1f}/5 {rating_emoji}\n"
+            rating_emoji = _threshold_emoji(rating, (4.0, 4.5), ("⚠️", "⭐", "🌟"))
+            parts.append(f"• Рейтинг: {rating:.1f}/5 {rating_emoji}\n")
         else:
-            result += f"• Рейтинг: нет данных\n"
-        result += f"• Отзывов: {reviews_count}\n"
-        result += f"• Вопросов: {questions_count}"
+            parts.append(f"• Рейтинг: нет данных\n")
+        parts.extend([
+            f"• Отзывов: {reviews_count}\n",
+            f"• Вопросов: {questions_count}",
+        ])
         if questions_count > 0:
-            result += " ⚠️ (есть неотвеченные!)"
-        result += "\n"
+            parts.append(" ⚠️ (есть неотвеченные!)")
+        parts.append("\n")
 
         # Show recent reviews summary if available
         if reviews:
-            result += f"\n📝 Последние отзывы:\n"
-            for rev in reviews[:3]:
-                rev_rating = rev.get("rating", 0)
-                rev_text = rev.get("text", "")[:80]
-                stars = "⭐" * rev_rating
-                result += f"  {stars} {rev_text}...\n"
+            parts.append(f"\n📝 Последние отзывы:\n")
+            parts.extend(
+                f"  {'⭐' * rev.get('rating', 0)} {_short(rev.get('text', ''), 80)}\n" for rev in reviews[:3]
+            )
 
         # Show unanswered questions
         if questions:
-            result += f"\n❓ Неотвеченные вопросы:\n"
-            for q in questions[:3]:
-                q_text = q.get("text", "")[:60]
-                result += f"  • {q_text}...\n"
-        result += "\n"
+            parts.append(f"\n❓ Неотвеченные вопросы:\n")
+            parts.extend(f"  • {_short(q.get('text', ''), 60)}\n" for q in questions[:3])
+        parts.append("\n")
 
         # Analyze product name/title
-        result += f"✍️ АНАЛИЗ КОНТЕНТА:\n"
-        result += f"📌 Текущее название:\n«{product_name}»\n\n"
+        parts.extend([
+            f"✍️ АНАЛИЗ КОНТЕНТА:\n",
+            f"📌 Текущее название:\n«{product_name}»\n\n",
+        ])
 
         name_length = len(product_name)
         name_words = len(product_name.split())
@@ -916,63 +1213,64 @@ async def _get_product_analytics(params: dict) -> str:
         # Check name quality
         name_issues = []
         name_suggestions = []
+        name_flags: set[str] = set()  # "short", "long", "few_words"
 
         if name_length < 40:
+            name_flags.add("short")
             name_issues.append("слишком короткое (<40 символов)")
             name_suggestions.append("добавить ключевые характеристики")
         elif name_length > 150:
+            name_flags.add("long")
             name_issues.append("слишком длинное (>150 символов)")
             name_suggestions.append("сократить до 80-120 символов")
 
         if name_words < 5:
+            name_flags.add("few_words")
             name_issues.append("мало слов")
             name_suggestions.append("добавить: тип продукта, для кого, ключевое свойство")
 
         # Check for important keywords for cosmetics
-        cosmetic_keywords = {
-            "объём/вес": ["мл", "ml", "г", "гр"],
-            "для кого": ["мужской", "женский", "унисекс", "для мужчин", "для женщин"],
-            "тип кожи": ["для сухой", "для жирной", "для комбинированной", "для всех типов"],
-            "эффект": ["увлажняющий", "антивозрастной", "питательный", "матирующий", "лифтинг"],
-            "бренд": ["yskin", "y skin"],
-        }
-
-        missing_categories = []
-        for category, keywords in cosmetic_keywords.items():
-            if not any(kw.lower() in product_name.lower() for kw in keywords):
-                missing_categories.append(category)
-
-        result += f"• Длина: {name_length} символов, {name_words} слов\n"
+        name_lc = product_name.lower()
+        missing_categories = [
+            category
+            for category, keywords in COSMETIC_KEYWORDS
+            if not any(kw in name_lc for kw in keywords)
+        ]
+
+        parts.append(f"• Длина: {name_length} символов, {name_words} слов\n")
         if name_issues:
-            result += f"• ⚠️ Проблемы: {', '.join(name_issues)}\n"
+            parts.append(f"• ⚠️ Проблемы: {', '.join(name_issues)}\n")
         else:
-            result += f"• ✅ Длина в норме\n"
+            parts.append(f"• ✅ Длина в норме\n")
 
         if missing_categories:
-            result += f"• ❌ Не указано: {', '.join(missing_categories)}\n"
+            parts.append(f"• ❌ Не указано: {', '.join(missing_categories)}\n")
 
         # Store for AI to generate specific suggestions
-        result += f"\n🔧 ДАННЫЕ ДЛЯ ОПТИМИЗАЦИИ:\n"
-        result += f"• offer_id: {offer_id}\n"
-        result += f"• product_id: {product_id}\n"
-        result += f"• Отсутствуют: {', '.join(missing_categories) if missing_categories else 'всё ок'}\n"
-        result += "\n"
+        parts.extend([
+            f"\n🔧 ДАННЫЕ ДЛЯ ОПТИМИЗАЦИИ:\n",
+            f"• offer_id: {offer_id}\n",
+            f"• product_id: {product_id}\n",
+            f"• Отсутствуют: {', '.join(missing_categories) if missing_categories else 'всё ок'}\n",
+            "\n",
+        ])
 
         # 6. Generate SPECIFIC recommendations based on data
-        result += f"💡 КОНКРЕТНЫЕ РЕКОМЕНДАЦИИ:\n"
+        parts.append(f"💡 КОНКРЕТНЫЕ РЕКОМЕНДАЦИИ:\n")
 
         recommendations = []
 
         # Stock recommendations with specific numbers
-        if days_of_stock < 7 and daily_sales > 0:
-            reorder_qty = int(daily_sales * 30)
-            recommendations.append(f"🔴 СРОЧНО: закажи {reorder_qty} шт (остатки кончатся через {days_of_stock:.0f} дней)")
-        elif days_of_stock < 14 and daily_sales > 0:
-            reorder_qty = int(daily_sales * 21)
-            recommendations.append(f"🟡 Пора заказать: {reorder_qty} шт для запаса на 3 недели")
-        elif days_of_stock > 60 and daily_sales > 0:
-            overstock_days = days_of_stock - 30
-            recommendations.append(f"📦 Избыток запасов (~{overstock_days:.0f} лишних дней). Рассмотри снижение цены для ускорения продаж")
+        if daily_sales > 0:
+            if days_of_stock < 7:
+                reorder_qty = int(daily_sales * 30)
+                recommendations.append(f"🔴 СРОЧНО: закажи {reorder_qty} шт (остатки кончатся через {days_of_stock:.0f} дней)")
+            elif days_of_stock < 14:
+                reorder_qty = int(daily_sales * 21)
+                recommendations.append(f"🟡 Пора заказать: {reorder_qty} шт для запаса на 3 недели")
+            elif days_of_stock > 60:
+                overstock_days = days_of_stock - 30
+                recommendations.append(f"📦 Избыток запасов (~{overstock_days:.0f} лишних дней). Рассмотри снижение цены для ускорения продаж")
 
         # Sales trend recommendations
         if sales_trend < -30 and prev_sales > 3:
@@ -991,7 +1289,7 @@ async def _get_product_analytics(params: dict) -> str:
         elif margin_pct > 50 and sales_trend < 0:
             new_price = int(price * 0.95)
             recommendations.append(f"🧪 Маржа позволяет ({margin_pct:.0f}%). Запусти эксперимент: цена {new_price:,} ₽ на 7 дней")
-        elif margin_pct < 20 and margin_pct > 0:
+        elif 0 < margin_pct < 20:
             new_price = int(price * 1.1)
             recommendations.append(f"💸 Низкая маржа ({margin_pct:.0f}%). Рассмотри повышение до {new_price:,} ₽ или снижение себестоимости")
 
@@ -1002,12 +1300,12 @@ async def _get_product_analytics(params: dict) -> str:
             recommendations.append("📢 Мало продаж при хорошем запасе. Запусти рекламную кампанию")
 
         # Advertising recommendation
-        if curr_sales > 0 and curr_sales < 10 and margin_pct > 30:
+        if 0 < curr_sales < 10 and margin_pct > 30:
             ad_budget = int(price * 0.1 * 7)  # 10% от цены на неделю
             recommendations.append(f"📢 Рекомендую рекламу: бюджет ~{ad_budget:,} ₽/неделю для роста продаж")
 
         # Rating and reviews recommendations
-        if rating > 0 and rating < 4.0:
+        if 0 < rating < 4.0:
             recommendations.append(f"⚠️ Низкий рейтинг ({rating:.1f}). Проработай негативные отзывы, улучши качество")
         elif rating == 0 and reviews_count == 0:
             recommendations.append("📝 Нет отзывов! Попроси первых покупателей оставить отзыв (скидка за отзыв)")
@@ -1019,11 +1317,10 @@ async def _get_product_analytics(params: dict) -> str:
             recommendations.append(f"❓ Есть {questions_count} неотвеченных вопросов! Ответь — это повышает конверсию")
 
         # Content recommendations
-        if name_issues:
-            if "короткое" in str(name_issues):
-                recommendations.append("✍️ Название короткое. Добавь ключевые слова: тип кожи, эффект, объём")
-            if "мало ключевых слов" in str(name_issues):
-                recommendations.append("✍️ Добавь в название: целевую аудиторию, ключевые свойства, объём")
+        if "short" in name_flags:
+            recommendations.append("✍️ Название короткое. Добавь ключевые слова: тип кожи, эффект, объём")
+        if "few_words" in name_flags:
+            recommendations.append("✍️ Добавь в название: целевую аудиторию, ключевые свойства, объём")
 
         if len(missing_categories) >= 3:
             recommendations.append(f"🔍 Не хватает в названии: {', '.join(missing_categories[:3])}")
@@ -1035,16 +1332,16 @@ async def _get_product_analytics(params: dict) -> str:
                 recommendations.append("📊 Недостаточно данных для рекомендаций. Дождись больше продаж")
 
         for i, rec in enumerate(recommendations, 1):
-            result += f"{i}. {rec}\n"
+            parts.append(f"{i}. {rec}\n")
 
-        return result
+        return "".join(parts)
 
 
 # ============== ADVERTISING TOOLS (Performance API) ==============
 
 def _check_performance_api() -> tuple[bool, str]:
     """Check if Performance API is configured."""
-    client = PerformanceClient()
+    client = get_performance_client()
     if not client.is_configured():
         return False, (
             "⚠️ Performance API не настроен. "
@@ -1053,6 +1350,68 @@ def _check_performance_api() -> tuple[bool, str]:
     return True, ""
 
 
+# Performance API amounts may come in nanocurrency (1 ₽ = 10^8 units);
+# values above the threshold are treated as such
+NANO_PER_RUB = 100_000_000
+NANO_THRESHOLD = 1_000_000
+
+
+def _from_nano(value: float) -> float:
+    """Convert a Performance API amount to rubles if it is in nanocurrency."""
+    return value / NANO_PER_RUB if value > NANO_THRESHOLD else value
+
+
+def _sum_campaign_rows(rows: list) -> dict[str, Any]:
+    """Sum views, clicks, spend and orders over statistics rows.
+
+    Spend of each row is converted from nanocurrency before summing: a sum of
+    small ruble amounts could otherwise cross the threshold and be divided too.
+    """
+    views = clicks = orders = 0
+    spend = 0
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        get = row.get
+        views += get("views", get("shows", 0))
+        clicks += get("clicks", 0)
+        spend += _from_nano(get("moneySpent", get("spend", 0)))
+        orders += get("orders", 0)
+
+    return {"views": views, "clicks": clicks, "spend": spend, "orders": orders}
+
+
+# Key of one campaign statistics request: (campaign_id, date_from, date_to)
+CampaignStatsKey = tuple[str, date, date]
+
+
+async def _fetch_campaign_stats(
+    keys: list[CampaignStatsKey],
+) -> dict[CampaignStatsKey, Union[dict, BaseException]]:
+    """Fetch statistics for many campaigns concurrently, one report per campaign.
+
+    The report of a multi-campaign request is not split by campaign, so each
+    campaign gets its own; duplicate keys are already merged by the batcher.
+    A failed report fails only the loads of its own campaign.
+    """
+    client = get_performance_client()
+    reports = await asyncio.gather(
+        *(
+            client.get_campaign_statistics([campaign_id], date_from, date_to)
+            for campaign_id, date_from, date_to in keys
+        ),
+        return_exceptions=True,
+    )
+    return dict(zip(keys, reports))
+
+
+# Statistics requests issued within 25 ms (e.g. checks of several experiments
+# in one model turn) are fetched together, identical ones only once
+_campaign_stats_loader: AsyncBatcher[CampaignStatsKey, dict] = AsyncBatcher(
+    _fetch_campaign_stats, dict, window_ms=25
+)
+
+
 async def _get_ad_campaigns(params: dict) -> str:
     """Get list of advertising campaigns."""
     ok, error = _check_performance_api()
@@ -1061,44 +1420,81 @@ async def _get_ad_campaigns(params: dict) -> str:
 
     state = params.get("state")
 
-    client = PerformanceClient()
-    try:
-        campaigns = await client.get_campaigns(state=state)
+    client = get_performance_client()
+    campaigns = await client.get_campaigns(state=state)
 
-        if not campaigns:
-            return "📢 Рекламных кампаний не найдено"
+    if not campaigns:
+        return "📢 Рекламных кампаний не найдено"
 
-        result = f"📢 РЕКЛАМНЫЕ КАМПАНИИ ({len(campaigns)} шт):\n\n"
+    parts: list[str] = [f"📢 РЕКЛАМНЫЕ КАМПАНИИ ({len(campaigns)} шт):\n\n"]
 
-        for c in campaigns:
-            status_emoji = "🟢" if c.get("state") == "CAMPAIGN_STATE_RUNNING" else "🔴"
-            campaign_type = c.get("advObjectType", "Unknown")
+    for c in campaigns:
+        status_emoji = "🟢" if c.get("state") == "CAMPAIGN_STATE_RUNNING" else "🔴"
+        campaign_type = c.get("advObjectType", "Unknown")
 
-            result += f"{status_emoji} **{c.get('title', 'Без названия')}**\n"
-            result += f"   ID: `{c.get('id')}`\n"
-            result += f"   Тип: {campaign_type}\n"
-            result += f"   Статус: {c.get('state', 'Unknown')}\n"
+        parts.extend([
+            f"{status_emoji} **{c.get('title', 'Без названия')}**\n",
+            f"   ID: `{c.get('id')}`\n",
+            f"   Тип: {campaign_type}\n",
+            f"   Статус: {c.get('state', 'Unknown')}\n",
+        ])
 
-            daily_budget = c.get("dailyBudget")
-            if daily_budget:
-                budget_rub = int(daily_budget) / 100_000_000
-                result += f"   Дневной бюджет: {budget_rub:,.0f} ₽\n"
+        daily_budget = c.get("dailyBudget")
+        if daily_budget:
+            budget_rub = int(daily_budget) / NANO_PER_RUB
+            parts.append(f"   Дневной бюджет: {budget_rub:,.0f} ₽\n")
 
-            date_from = c.get("fromDate", "")
-            date_to = c.get("toDate", "")
-            if date_from or date_to:
-                result += f"   Период: {date_from} - {date_to}\n"
+        date_from = c.get("fromDate", "")
+        date_to = c.get("toDate", "")
+        if date_from or date_to:
+            parts.append(f"   Период: {date_from} - {date_to}\n")
 
-            result += "\n"
+        parts.append("\n")
 
-        return result
+    return "".join(parts)
+
+
+def _format_campaign_stats(campaign_id: str, stats: dict) -> str:
+    """Format totals of one campaign's statistics report."""
+    if not stats:
+        return f"Нет статистики по кампании {campaign_id} за указанный период\n"
+
+    # Parse statistics data
+    rows = stats.get("rows", stats.get("data", []))
+    if isinstance(stats, dict) and "report" in stats:
+        rows = stats.get("report", {}).get("rows", [])
+
+    totals = _sum_campaign_rows(rows)
+    total_views = totals["views"]
+    total_clicks = totals["clicks"]
+    total_spend = totals["spend"]
+    total_orders = totals["orders"]
+
+    parts: list[str] = [
+        f"📊 СТАТИСТИКА КАМПАНИИ {campaign_id}\n",
+        f"👁 Показы: {total_views:,}\n",
+        f"👆 Клики: {total_clicks:,}\n",
+        f"💰 Расход: {total_spend:,.2f} ₽\n",
+        f"🛒 Заказы: {total_orders:,}\n",
+    ]
 
-    finally:
-        await client.close()
+    if total_clicks > 0:
+        ctr = (total_clicks / total_views * 100) if total_views > 0 else 0
+        cpc = total_spend / total_clicks
+        parts.extend([
+            f"📈 CTR: {ctr:.2f}%\n",
+            f"💵 CPC: {cpc:.2f} ₽\n",
+        ])
+
+    if total_orders > 0 and total_spend > 0:
+        cpo = total_spend / total_orders
+        parts.append(f"🎯 CPO: {cpo:.2f} ₽\n")
+
+    return "".join(parts)
 
 
 async def _get_campaign_stats(params: dict) -> str:
-    """Get campaign statistics for a period."""
+    """Get statistics of one or several campaigns for a period."""
     ok, error = _check_performance_api()
     if not ok:
         return error
@@ -1109,63 +1505,38 @@ async def _get_campaign_stats(params: dict) -> str:
 
     if not campaign_id:
         return "Укажи ID кампании (campaign_id)"
+    # One ID or a list of IDs to compare; duplicates are reported once
+    campaign_ids = list(dict.fromkeys(
+        str(cid) for cid in (campaign_id if isinstance(campaign_id, list) else [campaign_id])
+    ))
 
     try:
-        date_from = datetime.strptime(date_from_str, "%Y-%m-%d").date()
-        date_to = datetime.strptime(date_to_str, "%Y-%m-%d").date()
+        date_from = date.fromisoformat(date_from_str)
+        date_to = date.fromisoformat(date_to_str)
     except (ValueError, TypeError):
         return "Некорректный формат даты. Используй YYYY-MM-DD"
 
-    client = PerformanceClient()
-    try:
-        stats = await client.get_campaign_statistics([campaign_id], date_from, date_to)
-
-        if not stats:
-            return f"Нет статистики по кампании {campaign_id} за указанный период"
-
-        result = f"📊 СТАТИСТИКА КАМПАНИИ {campaign_id}\n"
-        result += f"Период: {date_from_str} - {date_to_str}\n\n"
-
-        # Parse statistics data
-        rows = stats.get("rows", stats.get("data", []))
-        if isinstance(stats, dict) and "report" in stats:
-            rows = stats.get("report", {}).get("rows", [])
-
-        total_views = 0
-        total_clicks = 0
-        total_spend = 0
-        total_orders = 0
-
-        for row in rows:
-            if isinstance(row, dict):
-                total_views += row.get("views", row.get("shows", 0))
-                total_clicks += row.get("clicks", 0)
-                total_spend += row.get("moneySpent", row.get("spend", 0))
-                total_orders += row.get("orders", 0)
-
-        # Convert from nanocurrency if needed
-        if total_spend > 1000000:
-            total_spend = total_spend / 100_000_000
-
-        result += f"👁 Показы: {total_views:,}\n"
-        result += f"👆 Клики: {total_clicks:,}\n"
-        result += f"💰 Расход: {total_spend:,.2f} ₽\n"
-        result += f"🛒 Заказы: {total_orders:,}\n"
-
-        if total_clicks > 0:
-            ctr = (total_clicks / total_views * 100) if total_views > 0 else 0
-            cpc = total_spend / total_clicks
-            result += f"\n📈 CTR: {ctr:.2f}%\n"
-            result += f"💵 CPC: {cpc:.2f} ₽\n"
-
-        if total_orders > 0 and total_spend > 0:
-            cpo = total_spend / total_orders
-            result += f"🎯 CPO: {cpo:.2f} ₽\n"
+    # Reports of all campaigns are requested concurrently; one failure does not hide the others
+    reports = await asyncio.gather(
+        *(_campaign_stats_loader.load((cid, date_from, date_to)) for cid in campaign_ids),
+        return_exceptions=True,
+    )
 
-        return result
+    if len(campaign_ids) == 1:
+        if isinstance(reports[0], Exception):
+            raise reports[0]
+        if not reports[0]:
+            return f"Нет статистики по кампании {campaign_ids[0]} за указанный период"
+
+    sections = []
+    for cid, stats in zip(campaign_ids, reports):
+        if isinstance(stats, Exception):
+            logger.warning(f"Failed to get statistics of campaign {cid}: {stats}")
+            sections.append(f"❌ Кампания {cid}: не удалось получить статистику ({stats})\n")
+        else:
+            sections.append(_format_campaign_stats(cid, stats))
 
-    finally:
-        await client.close()
+    return f"Период: {date_from_str} - {date_to_str}\n\n" + "\n".join(sections)
 
 
 async def _activate_ad_campaign(params: dict) -> str:
@@ -1178,14 +1549,12 @@ async def _activate_ad_campaign(params: dict) -> str:
     if not campaign_id:
         return "Укажи ID кампании (campaign_id)"
 
-    client = PerformanceClient()
+    client = get_performance_client()
     try:
         await client.activate_campaign(campaign_id)
         return f"✅ Кампания {campaign_id} успешно ВКЛЮЧЕНА"
     except Exception as e:
         return f"❌ Ошибка при активации кампании: {str(e)}"
-    finally:
-        await client.close()
 
 
 async def _deactivate_ad_campaign(params: dict) -> str:
@@ -1198,14 +1567,12 @@ async def _deactivate_ad_campaign(params: dict) -> str:
     if not campaign_id:
         return "Укажи ID кампании (campaign_id)"
 
-    client = PerformanceClient()
+    client = get_performance_client()
     try:
         await client.deactivate_campaign(campaign_id)
         return f"✅ Кампания {campaign_id} успешно ВЫКЛЮЧЕНА"
     except Exception as e:
         return f"❌ Ошибка при деактивации кампании: {str(e)}"
-    finally:
-        await client.close()
 
 
 async def _set_product_ad_bid(params: dict) -> str:
@@ -1221,14 +1588,41 @@ async def _set_product_ad_bid(params: dict) -> str:
     if not campaign_id or not product_id or bid is None:
         return "Укажи campaign_id, product_id и bid"
 
-    client = PerformanceClient()
+    client = get_performance_client()
     try:
         await client.set_product_bid(campaign_id, int(product_id), Decimal(str(bid)))
         return f"✅ Ставка {bid} ₽ установлена для товара {product_id} в кампании {campaign_id}"
     except Exception as e:
         return f"❌ Ошибка при установке ставки: {str(e)}"
-    finally:
-        await client.close()
+
+
+async def _set_product_ad_bids(params: dict) -> str:
+    """Set bids for several products of a campaign in one API request."""
+    ok, error = _check_performance_api()
+    if not ok:
+        return error
+
+    campaign_id = params.get("campaign_id")
+    items = params.get("bids")
+
+    if not campaign_id or not items:
+        return "Укажи campaign_id и bids"
+
+    # Normalize everything before touching the API, so a bad item changes nothing
+    try:
+        bids = [(int(item["product_id"]), Decimal(str(item["bid"]))) for item in items]
+    except (KeyError, TypeError, ValueError, InvalidOperation):
+        return "Некорректные параметры для set_product_ad_bids: каждая ставка — {product_id, bid}"
+
+    client = get_performance_client()
+    try:
+        await client.set_product_bids(campaign_id, bids)
+    except Exception as e:
+        return f"❌ Ошибка при установке ставок: {str(e)}"
+
+    parts: list[str] = [f"✅ Ставки установлены в кампании {campaign_id} ({len(bids)} шт):\n"]
+    parts.extend(f"• Товар {product_id}: {bid} ₽\n" for product_id, bid in bids)
+    return "".join(parts)
 
 
 async def _get_campaign_products(params: dict) -> str:
@@ -1241,54 +1635,72 @@ async def _get_campaign_products(params: dict) -> str:
     if not campaign_id:
         return "Укажи ID кампании (campaign_id)"
 
-    client = PerformanceClient()
-    try:
-        products = await client.get_products_in_campaign(campaign_id)
-
-        if not products:
-            return f"В кампании {campaign_id} нет товаров"
+    client = get_performance_client()
+    products = await client.get_products_in_campaign(campaign_id)
 
-        # Check for special campaign types (SEARCH_PROMO, BRAND_SHELF, etc.)
-        if len(products) == 1 and "type" in products[0]:
-            campaign_type = products[0].get("type")
-            note = products[0].get("note", "")
-            return f"📢 Кампания {campaign_id} ({campaign_type})\n\n{note}\n\nДля этого типа кампании товары управляются на уровне категории или всего магазина."
+    if not products:
+        return f"В кампании {campaign_id} нет товаров"
 
-        result = f"📦 ТОВАРЫ В КАМПАНИИ {campaign_id} ({len(products)} шт):\n\n"
+    # Check for special campaign types (SEARCH_PROMO, BRAND_SHELF, etc.)
+    if len(products) == 1 and "type" in products[0]:
+        campaign_type = products[0].get("type")
+        note = products[0].get("note", "")
+        return f"📢 Кампания {campaign_id} ({campaign_type})\n\n{note}\n\nДля этого типа кампании товары управляются на уровне категории или всего магазина."
 
-        for p in products:
-            # Handle different response formats
-            product_id = p.get("id", p.get("productId", p.get("sku", "Unknown")))
-            bid = p.get("bid", 0)
+    parts: list[str] = [f"📦 ТОВАРЫ В КАМПАНИИ {campaign_id} ({len(products)} шт):\n\n"]
 
-            # Convert from nanocurrency if needed
-            if isinstance(bid, (int, float)) and bid > 1000000:
-                bid = bid / 100_000_000
+    for p in products:
+        # Handle different response formats
+        product_id = p.get("id", p.get("productId", p.get("sku", "Unknown")))
+        bid = p.get("bid", 0)
 
-            status = p.get("status", p.get("state", ""))
-            if status:
-                status_emoji = "🟢" if "ACTIVE" in status.upper() else "🔴"
-                result += f"{status_emoji} Товар {product_id}\n"
-            else:
-                result += f"• Товар {product_id}\n"
+        # Convert from nanocurrency if needed
+        if isinstance(bid, (int, float)):
+            bid = _from_nano(bid)
 
-            if bid:
-                result += f"   Ставка: {bid:.2f} ₽\n"
+        status = p.get("status", p.get("state", ""))
+        if status:
+            status_emoji = "🟢" if "ACTIVE" in status.upper() else "🔴"
+            parts.append(f"{status_emoji} Товар {product_id}\n")
+        else:
+            parts.append(f"• Товар {product_id}\n")
 
-            if status:
-                result += f"   Статус: {status}\n"
-            result += "\n"
+        if bid:
+            parts.append(f"   Ставка: {bid:.2f} ₽\n")
 
-        return result
+        if status:
+            parts.append(f"   Статус: {status}\n")
+        parts.append("\n")
 
-    finally:
-        await client.close()
+    return "".join(parts)
 
 
 # ============== AD EXPERIMENT TOOLS ==============
 
 from datetime import timedelta
 
+# Experiment verdict -> emoji (shared by ad and content experiments)
+VERDICT_EMOJIS = {"SUCCESS": "✅", "FAILED": "❌", "NEUTRAL": "🤷"}
+
+
+# Campaign list by ID, shared by experiment launches for a short time
+CAMPAIGNS_CACHE_TTL = 60  # seconds
+_campaigns_cache: Optional[tuple[float, dict[str, dict]]] = None
+_campaigns_lock = asyncio.Lock()
+
+
+async def _campaigns_by_id() -> dict[str, dict]:
+    """Get all campaigns keyed by str(id), refetching at most once per TTL."""
+    global _campaigns_cache
+    async with _campaigns_lock:
+        now = time.monotonic()
+        if _campaigns_cache is not None and now - _campaigns_cache[0] < CAMPAIGNS_CACHE_TTL:
+            return _campaigns_cache[1]
+        campaigns = await get_performance_client().get_campaigns()
+        by_id = {str(c.get("id")): c for c in campaigns}
+        _campaigns_cache = (now, by_id)
+        return by_id
+
 
 async def _start_ad_experiment(params: dict) -> str:
     """Start a new advertising experiment."""
@@ -1305,112 +1717,110 @@ async def _start_ad_experiment(params: dict) -> str:
     if not campaign_id or not action:
         return "Укажи campaign_id и action"
 
-    client = PerformanceClient()
-    try:
-        # Get campaign info
-        campaigns = await client.get_campaigns()
-        campaign = None
-        for c in campaigns:
-            if str(c.get("id")) == str(campaign_id):
-                campaign = c
-                break
-
-        if not campaign:
-            return f"Кампания {campaign_id} не найдена"
-
-        campaign_name = campaign.get("title", "Без названия")
-        campaign_type = campaign.get("advObjectType", "Unknown")
-
-        # Get baseline metrics (last 7 days)
-        today = date.today()
-        baseline_start = today - timedelta(days=7)
-        baseline_end = today - timedelta(days=1)
-
-        baseline_stats = {"views": 0, "clicks": 0, "spend": 0, "orders": 0, "revenue": 0}
-        try:
-            stats = await client.get_campaign_statistics([campaign_id], baseline_start, baseline_end)
-            rows = stats.get("rows", stats.get("data", []))
-            for row in rows:
-                if isinstance(row, dict):
-                    baseline_stats["views"] += row.get("views", row.get("shows", 0))
-                    baseline_stats["clicks"] += row.get("clicks", 0)
-                    spend = row.get("moneySpent", row.get("spend", 0))
-                    if spend > 1000000:
-                        spend = spend / 100_000_000
-                    baseline_stats["spend"] += spend
-                    baseline_stats["orders"] += row.get("orders", 0)
-        except Exception as e:
-            logger.warning(f"Could not get baseline stats: {e}")
-
-        # Execute the action
-        old_bid = None
-        if action == "activate":
-            await client.activate_campaign(campaign_id)
-        elif action == "deactivate":
-            await client.deactivate_campaign(campaign_id)
-        elif action == "change_bid" and new_bid and product_id:
-            # Get old bid first
-            try:
-                products = await client.get_products_in_campaign(campaign_id)
-                for p in products:
-                    if p.get("productId") == product_id:
-                        old_bid = p.get("bid", 0)
-                        if old_bid > 1000000:
-                            old_bid = old_bid / 100_000_000
-                        break
-            except:
-                pass
-            await client.set_product_bid(campaign_id, product_id, Decimal(str(new_bid)))
+    client = get_performance_client()
+    # Get campaign info
+    campaign = (await _campaigns_by_id()).get(str(campaign_id))
+
+    if not campaign:
+        return f"Кампания {campaign_id} не найдена"
+
+    campaign_name = campaign.get("title", "Без названия")
+    campaign_type = campaign.get("advObjectType", "Unknown")
+
+    # Get baseline metrics (last 7 days)
+    today = date.today()
+    baseline_start = today - timedelta(days=7)
+    baseline_end = today - timedelta(days=1)
+
+    # Baseline stats are historical, so they are fetched concurrently with the
+    # action (or with reading the current bid before changing it)
+    change_bid = action == "change_bid" and new_bid and product_id
+    if action == "activate":
+        action_request = client.activate_campaign(campaign_id)
+    elif action == "deactivate":
+        action_request = client.deactivate_campaign(campaign_id)
+    elif change_bid:
+        action_request = client.get_products_in_campaign(campaign_id)
+    else:
+        action_request = asyncio.sleep(0)
 
-        # Create experiment record
-        start_date = today
-        review_date = today + timedelta(days=duration_days)
+    stats, action_result = await asyncio.gather(
+        _campaign_stats_loader.load((str(campaign_id), baseline_start, baseline_end)),
+        action_request,
+        return_exceptions=True,
+    )
 
-        async with AsyncSessionLocal() as session:
-            repo = AdExperimentRepository(session)
-            experiment = await repo.create(
-                campaign_id=str(campaign_id),
-                campaign_name=campaign_name,
-                campaign_type=campaign_type,
-                action=action,
-                start_date=start_date,
-                review_date=review_date,
-                duration_days=duration_days,
-                product_id=product_id,
-                old_bid=Decimal(str(old_bid)) if old_bid else None,
-                new_bid=Decimal(str(new_bid)) if new_bid else None,
-                baseline_views=baseline_stats["views"],
-                baseline_clicks=baseline_stats["clicks"],
-                baseline_spend=Decimal(str(baseline_stats["spend"])),
-                baseline_orders=baseline_stats["orders"],
-                baseline_revenue=Decimal(str(baseline_stats.get("revenue", 0))),
-            )
+    if isinstance(stats, Exception):
+        logger.warning(f"Could not get baseline stats: {stats}")
+        stats = {}
+    baseline_stats = _sum_campaign_rows(stats.get("rows", stats.get("data", [])))
+
+    # Finish the action
+    old_bid = None
+    if change_bid:
+        # Old bid is only informational, the bid is changed even if it is unknown
+        if not isinstance(action_result, Exception):
+            for p in action_result:
+                if p.get("productId") == product_id:
+                    old_bid = _from_nano(p.get("bid", 0))
+                    break
+        await client.set_product_bid(campaign_id, product_id, Decimal(str(new_bid)))
+    elif isinstance(action_result, Exception):
+        raise action_result
+
+    # Create experiment record
+    start_date = today
+    review_date = today + timedelta(days=duration_days)
 
-        action_text = {
-            "activate": "ВКЛЮЧЕНА",
-            "deactivate": "ВЫКЛЮЧЕНА",
-            "change_bid": f"изменена ставка на {new_bid}₽"
-        }.get(action, action)
+    async with AsyncSessionLocal() as session:
+        repo = AdExperimentRepository(session)
+        experiment = await repo.create(
+            campaign_id=str(campaign_id),
+            campaign_name=campaign_name,
+            campaign_type=campaign_type,
+            action=action,
+            start_date=start_date,
+            review_date=review_date,
+            duration_days=duration_days,
+            product_id=product_id,
+            old_bid=old_bid or None,
+            new_bid=new_bid or None,
+            baseline_views=baseline_stats["views"],
+            baseline_clicks=baseline_stats["clicks"],
+            baseline_spend=baseline_stats["spend"],
+            baseline_orders=baseline_stats["orders"],
+            baseline_revenue=baseline_stats.get("revenue", 0),
+        )
 
-        result = f"🧪 ЭКСПЕРИМЕНТ ЗАПУЩЕН!\n\n"
-        result += f"📢 Кампания: {campaign_name}\n"
-        result += f"🎯 Действие: {action_text}\n"
-        result += f"📅 Период: {duration_days} дней\n"
-        result += f"🔍 Проверка: {review_date.strftime('%d.%m.%Y')}\n"
-        result += f"🆔 ID эксперимента: {experiment.id}\n\n"
+    if action == "activate":
+        action_text = "ВКЛЮЧЕНА"
+    elif action == "deactivate":
+        action_text = "ВЫКЛЮЧЕНА"
+    elif action == "change_bid":
+        action_text = f"изменена ставка на {new_bid}₽"
+    else:
+        action_text = action
 
-        if baseline_stats["clicks"] > 0:
-            result += f"📊 Базовые показатели (7 дней до):\n"
-            result += f"   Показы: {baseline_stats['views']:,}\n"
-            result += f"   Клики: {baseline_stats['clicks']:,}\n"
-            result += f"   Расход: {baseline_stats['spend']:,.2f}₽\n"
+    parts: list[str] = [
+        f"🧪 ЭКСПЕРИМЕНТ ЗАПУЩЕН!\n\n",
+        f"📢 Кампания: {campaign_name}\n",
+        f"🎯 Действие: {action_text}\n",
+        f"📅 Период: {duration_days} дней\n",
+        f"🔍 Проверка: {review_date.strftime('%d.%m.%Y')}\n",
+        f"🆔 ID эксперимента: {experiment.id}\n\n",
+    ]
 
-        result += f"\nЯ напомню о проверке результатов {review_date.strftime('%d.%m.%Y')}!"
+    if baseline_stats["clicks"] > 0:
+        parts.extend([
+            f"📊 Базовые показатели (7 дней до):\n",
+            f"   Показы: {baseline_stats['views']:,}\n",
+            f"   Клики: {baseline_stats['clicks']:,}\n",
+            f"   Расход: {baseline_stats['spend']:,.2f}₽\n",
+        ])
 
-        return result
+    parts.append(f"\nЯ напомню о проверке результатов {review_date.strftime('%d.%m.%Y')}!")
 
-    finally:
-        await client.close()
+    return "".join(parts)
 
 
 async def _get_active_ad_experiments() -> str:
@@ -1422,26 +1832,45 @@ async def _get_active_ad_experiments() -> str:
         if not experiments:
             return "🧪 Нет активных рекламных экспериментов"
 
-        result = f"🧪 АКТИВНЫЕ ЭКСПЕРИМЕНТЫ ({len(experiments)} шт):\n\n"
+        parts: list[str] = [f"🧪 АКТИВНЫЕ ЭКСПЕРИМЕНТЫ ({len(experiments)} шт):\n\n"]
 
         today = date.today()
         for exp in experiments:
             days_left = (exp.review_date - today).days
             status_emoji = "🟡" if days_left > 0 else "🔴"
 
-            result += f"{status_emoji} **{exp.campaign_name}**\n"
-            result += f"   ID: {exp.id} | Кампания: {exp.campaign_id}\n"
-            result += f"   Действие: {exp.action}\n"
-            result += f"   Начало: {exp.start_date.strftime('%d.%m')}\n"
+            parts.extend([
+                f"{status_emoji} **{exp.campaign_name}**\n",
+                f"   ID: {exp.id} | Кампания: {exp.campaign_id}\n",
+                f"   Действие: {exp.action}\n",
+                f"   Начало: {exp.start_date.strftime('%d.%m')}\n",
+            ])
 
             if days_left > 0:
-                result += f"   Проверка через: {days_left} дн. ({exp.review_date.strftime('%d.%m')})\n"
+                parts.append(f"   Проверка через: {days_left} дн. ({exp.review_date.strftime('%d.%m')})\n")
             else:
-                result += f"   ⚠️ ПОРА ПРОВЕРИТЬ! (просрочен на {-days_left} дн.)\n"
+                parts.append(f"   ⚠️ ПОРА ПРОВЕРИТЬ! (просрочен на {-days_left} дн.)\n")
 
-            result += "\n"
+            parts.append("\n")
+
+        return "".join(parts)
 
-        return result
+
+def _ad_verdict(
+    before_orders: int, after_orders: int, before_cpc: float, after_cpc: float
+) -> tuple[str, str]:
+    """Suggest a verdict for an ad experiment.
+
+    Returns:
+        (verdict, recommendation line for the report)
+    """
+    if after_orders > before_orders and after_cpc <= before_cpc * 1.2:
+        return "SUCCESS", "✅ **УСПЕХ** — заказы выросли. Рекомендую оставить.\n"
+    if after_orders < before_orders * 0.8:
+        return "FAILED", "❌ **НЕУДАЧА** — заказы упали. Рекомендую откатить.\n"
+    if after_cpc > before_cpc * 1.5 and after_orders <= before_orders:
+        return "FAILED", "⚠️ **НЕЭФФЕКТИВНО** — CPC вырос без роста заказов.\n"
+    return "NEUTRAL", "🤷 **НЕЙТРАЛЬНО** — значимых изменений нет.\n"
 
 
 async def _check_ad_experiment(params: dict) -> str:
@@ -1462,73 +1891,58 @@ async def _check_ad_experiment(params: dict) -> str:
             return f"Эксперимент {experiment_id} не найден"
 
         # Get current stats from Performance API
-        client = PerformanceClient()
-        try:
-            stats = await client.get_campaign_statistics(
-                [experiment.campaign_id],
-                experiment.start_date,
-                date.today() - timedelta(days=1)
-            )
-
-            result_stats = {"views": 0, "clicks": 0, "spend": 0, "orders": 0}
-            rows = stats.get("rows", stats.get("data", []))
-            for row in rows:
-                if isinstance(row, dict):
-                    result_stats["views"] += row.get("views", row.get("shows", 0))
-                    result_stats["clicks"] += row.get("clicks", 0)
-                    spend = row.get("moneySpent", row.get("spend", 0))
-                    if spend > 1000000:
-                        spend = spend / 100_000_000
-                    result_stats["spend"] += spend
-                    result_stats["orders"] += row.get("orders", 0)
-
-            # Update experiment with results
-            await repo.update_results(
-                experiment_id=experiment_id,
-                result_views=result_stats["views"],
-                result_clicks=result_stats["clicks"],
-                result_spend=Decimal(str(result_stats["spend"])),
-                result_orders=result_stats["orders"],
-                result_revenue=Decimal("0"),
-            )
+        today = date.today()
+        stats = await _campaign_stats_loader.load(
+            (str(experiment.campaign_id), experiment.start_date, today - timedelta(days=1))
+        )
 
-            # Refresh experiment data
-            experiment = await repo.get_by_id(experiment_id)
+        result_stats = _sum_campaign_rows(stats.get("rows", stats.get("data", [])))
 
-        finally:
-            await client.close()
+        # Update experiment with results
+        experiment = await repo.update_results(
+            experiment_id=experiment_id,
+            result_views=result_stats["views"],
+            result_clicks=result_stats["clicks"],
+            result_spend=result_stats["spend"],
+            result_orders=result_stats["orders"],
+            result_revenue=Decimal("0"),
+        )
 
         # Build report
-        result = f"📊 РЕЗУЛЬТАТЫ ЭКСПЕРИМЕНТА #{experiment_id}\n\n"
-        result += f"📢 Кампания: {experiment.campaign_name}\n"
-        result += f"🎯 Действие: {experiment.action}\n"
-        result += f"📅 Период: {experiment.start_date.strftime('%d.%m')} - {date.today().strftime('%d.%m')}\n\n"
+        parts: list[str] = [
+            f"📊 РЕЗУЛЬТАТЫ ЭКСПЕРИМЕНТА #{experiment_id}\n\n",
+            f"📢 Кампания: {experiment.campaign_name}\n",
+            f"🎯 Действие: {experiment.action}\n",
+            f"📅 Период: {experiment.start_date.strftime('%d.%m')} - {today.strftime('%d.%m')}\n\n",
+        ]
 
         # Views
         before_views = experiment.baseline_views or 0
         after_views = experiment.result_views or 0
-        views_change = ((after_views - before_views) / before_views * 100) if before_views > 0 else 0
+        views_change = _pct_change(before_views, after_views)
 
         # Clicks
         before_clicks = experiment.baseline_clicks or 0
         after_clicks = experiment.result_clicks or 0
-        clicks_change = ((after_clicks - before_clicks) / before_clicks * 100) if before_clicks > 0 else 0
+        clicks_change = _pct_change(before_clicks, after_clicks)
 
         # Spend
         before_spend = float(experiment.baseline_spend or 0)
         after_spend = float(experiment.result_spend or 0)
-        spend_change = ((after_spend - before_spend) / before_spend * 100) if before_spend > 0 else 0
+        spend_change = _pct_change(before_spend, after_spend)
 
         # Orders
         before_orders = experiment.baseline_orders or 0
         after_orders = experiment.result_orders or 0
-        orders_change = ((after_orders - before_orders) / before_orders * 100) if before_orders > 0 else 0
+        orders_change = _pct_change(before_orders, after_orders)
 
-        result += f"📈 СРАВНЕНИЕ (до → после):\n"
-        result += f"   Показы: {before_views:,} → {after_views:,} ({views_change:+.1f}%)\n"
-        result += f"   Клики: {before_clicks:,} → {after_clicks:,} ({clicks_change:+.1f}%)\n"
-        result += f"   Расход: {before_spend:,.0f}₽ → {after_spend:,.0f}₽ ({spend_change:+.1f}%)\n"
-        result += f"   Заказы: {before_orders} → {after_orders} ({orders_change:+.1f}%)\n"
+        parts.extend([
+            f"📈 СРАВНЕНИЕ (до → после):\n",
+            f"   Показы: {before_views:,} → {after_views:,} ({views_change:+.1f}%)\n",
+            f"   Клики: {before_clicks:,} → {after_clicks:,} ({clicks_change:+.1f}%)\n",
+            f"   Расход: {before_spend:,.0f}₽ → {after_spend:,.0f}₽ ({spend_change:+.1f}%)\n",
+            f"   Заказы: {before_orders} → {after_orders} ({orders_change:+.1f}%)\n",
+        ])
 
         # CTR & CPC
         before_ctr = (before_clicks / before_views * 100) if before_views > 0 else 0
@@ -1536,28 +1950,20 @@ async def _check_ad_experiment(params: dict) -> str:
         before_cpc = before_spend / before_clicks if before_clicks > 0 else 0
         after_cpc = after_spend / after_clicks if after_clicks > 0 else 0
 
-        result += f"   CTR: {before_ctr:.2f}% → {after_ctr:.2f}%\n"
-        result += f"   CPC: {before_cpc:.2f}₽ → {after_cpc:.2f}₽\n"
+        parts.extend([
+            f"   CTR: {before_ctr:.2f}% → {after_ctr:.2f}%\n",
+            f"   CPC: {before_cpc:.2f}₽ → {after_cpc:.2f}₽\n",
+        ])
 
-        result += f"\n💡 РЕКОМЕНДАЦИЯ:\n"
+        parts.append(f"\n💡 РЕКОМЕНДАЦИЯ:\n")
 
         # Generate recommendation
-        if after_orders > before_orders and after_cpc <= before_cpc * 1.2:
-            result += "✅ **УСПЕХ** — заказы выросли. Рекомендую оставить.\n"
-            suggested_verdict = "SUCCESS"
-        elif after_orders < before_orders * 0.8:
-            result += "❌ **НЕУДАЧА** — заказы упали. Рекомендую откатить.\n"
-            suggested_verdict = "FAILED"
-        elif after_cpc > before_cpc * 1.5 and after_orders <= before_orders:
-            result += "⚠️ **НЕЭФФЕКТИВНО** — CPC вырос без роста заказов.\n"
-            suggested_verdict = "FAILED"
-        else:
-            result += "🤷 **НЕЙТРАЛЬНО** — значимых изменений нет.\n"
-            suggested_verdict = "NEUTRAL"
+        suggested_verdict, verdict_text = _ad_verdict(before_orders, after_orders, before_cpc, after_cpc)
+        parts.append(verdict_text)
 
-        result += f"\nЗавершить? Скажи: завершить эксперимент {experiment_id} как {suggested_verdict}"
+        parts.append(f"\nЗавершить? Скажи: завершить эксперимент {experiment_id} как {suggested_verdict}")
 
-        return result
+        return "".join(parts)
 
 
 async def _complete_ad_experiment(params: dict) -> str:
@@ -1569,7 +1975,7 @@ async def _complete_ad_experiment(params: dict) -> str:
     if not experiment_id or not verdict:
         return "Укажи experiment_id и verdict"
 
-    if verdict not in ["SUCCESS", "FAILED", "NEUTRAL"]:
+    if verdict not in VERDICT_EMOJIS:
         return "verdict должен быть SUCCESS, FAILED или NEUTRAL"
 
     async with AsyncSessionLocal() as session:
@@ -1583,21 +1989,23 @@ async def _complete_ad_experiment(params: dict) -> str:
         if not experiment:
             return f"Эксперимент {experiment_id} не найден"
 
-        verdict_emoji = {"SUCCESS": "✅", "FAILED": "❌", "NEUTRAL": "🤷"}.get(verdict, "")
+        verdict_emoji = VERDICT_EMOJIS[verdict]
 
-        result = f"{verdict_emoji} Эксперимент #{experiment_id} завершён!\n\n"
-        result += f"📢 Кампания: {experiment.campaign_name}\n"
-        result += f"🎯 Вердикт: **{verdict}**\n"
+        parts: list[str] = [
+            f"{verdict_emoji} Эксперимент #{experiment_id} завершён!\n\n",
+            f"📢 Кампания: {experiment.campaign_name}\n",
+            f"🎯 Вердикт: **{verdict}**\n",
+        ]
 
         if recommendation:
-            result += f"📝 Заметка: {recommendation}\n"
+            parts.append(f"📝 Заметка: {recommendation}\n")
 
         if verdict == "FAILED" and experiment.action == "activate":
-            result += f"\n⚠️ Рекомендую выключить кампанию {experiment.campaign_id}"
+            parts.append(f"\n⚠️ Рекомендую выключить кампанию {experiment.campaign_id}")
         elif verdict == "FAILED" and experiment.action == "change_bid" and experiment.old_bid:
-            result += f"\n⚠️ Рекомендую вернуть ставку на {experiment.old_bid}₽"
+            parts.append(f"\n⚠️ Рекомендую вернуть ставку на {experiment.old_bid}₽")
 
-        return result
+        return "".join(parts)
 
 
 # ============== QUICK CONTENT UPDATE TOOLS ==============
@@ -1610,7 +2018,7 @@ async def _update_product_name(params: dict) -> str:
     if not offer_id or not new_name:
         return "Укажи offer_id и new_name"
 
-    client = OzonClient()
+    client = get_ozon_client()
     try:
         success = await client.update_product_content(offer_id, name=new_name)
 
@@ -1626,17 +2034,23 @@ async def _update_product_name(params: dict) -> str:
 
     except Exception as e:
         return f"❌ Ошибка при изменении названия: {str(e)}"
-    finally:
-        await client.close()
 
 
 # ============== CONTENT EXPERIMENT TOOLS ==============
 
 from src.database.repositories.content_experiments import ContentExperimentRepository
 
+CONTENT_FIELD_NAMES = {"name": "Название", "description": "Описание"}
+ACTIVE_CONTENT_EXPERIMENTS_MAX_ITEMS = 50
+
+
+async def _start_content_experiment(params: dict, product: Optional[OzonProductFull] = None) -> str:
+    """Start a content A/B experiment (name or description change).
 
-async def _start_content_experiment(params: dict) -> str:
-    """Start a content A/B experiment (name or description change)."""
+    Args:
+        params: Tool parameters
+        product: Product info if the caller already fetched it from OZON
+    """
     product_id = params.get("product_id")
     offer_id = params.get("offer_id")
     field_type = params.get("field_type")
@@ -1649,20 +2063,31 @@ async def _start_content_experiment(params: dict) -> str:
     if field_type not in ["name", "description"]:
         return "field_type должен быть 'name' или 'description'"
 
-    client = OzonClient()
-    try:
+    client = get_ozon_client()
+    async with AsyncSessionLocal() as session:
+        repo = ContentExperimentRepository(session)
+
         # Check if there's already an active experiment for this product/field
-        async with AsyncSessionLocal() as session:
-            repo = ContentExperimentRepository(session)
-            if await repo.has_active_experiment(product_id, field_type):
-                return f"❌ У товара {product_id} уже есть активный эксперимент с {field_type}"
+        if await repo.has_active_experiment(product_id, field_type):
+            return f"❌ У товара {product_id} уже есть активный эксперимент с {field_type}"
+
+        # Get current product info and baseline metrics (last 7 days) concurrently
+        today = date.today()
+        baseline_start = today - timedelta(days=7)
+        baseline_end = today - timedelta(days=1)
+        baseline_request = client.get_product_content_analytics(product_id, baseline_start, baseline_end)
 
-        # Get current product info
-        products = await client.get_product_info([product_id])
-        if not products:
-            return f"Товар {product_id} не найден"
+        if product is None:
+            products, baseline = await asyncio.gather(
+                client.get_product_info([product_id]),
+                baseline_request,
+            )
+            if not products:
+                return f"Товар {product_id} не найден"
+            product = products[0]
+        else:
+            baseline = await baseline_request
 
-        product = products[0]
         product_name = product.name
 
         # Get current value based on field type
@@ -1673,13 +2098,6 @@ async def _start_content_experiment(params: dict) -> str:
             # For now, we'll store a placeholder
             old_value = "(текущее описание)"
 
-        # Get baseline metrics (last 7 days)
-        today = date.today()
-        baseline_start = today - timedelta(days=7)
-        baseline_end = today - timedelta(days=1)
-
-        baseline = await client.get_product_content_analytics(product_id, baseline_start, baseline_end)
-
         # Apply the change
         if field_type == "name":
             success = await client.update_product_content(offer_id, name=new_value)
@@ -1693,78 +2111,105 @@ async def _start_content_experiment(params: dict) -> str:
         start_date = today
         review_date = today + timedelta(days=duration_days)
 
-        async with AsyncSessionLocal() as session:
-            repo = ContentExperimentRepository(session)
-            experiment = await repo.create(
-                product_id=product_id,
-                offer_id=offer_id,
-                product_name=product_name,
-                field_type=field_type,
-                old_value=old_value,
-                new_value=new_value,
-                start_date=start_date,
-                review_date=review_date,
-                duration_days=duration_days,
-                baseline_views=baseline.get("views_pdp", 0),
-                baseline_add_to_cart=baseline.get("add_to_cart", 0),
-                baseline_orders=baseline.get("orders", 0),
-                baseline_revenue=Decimal(str(baseline.get("revenue", 0))),
-                baseline_conversion=Decimal(str(baseline.get("cart_conversion", 0))),
-            )
-
-        field_name = "Название" if field_type == "name" else "Описание"
-        result = f"🧪 ЭКСПЕРИМЕНТ ЗАПУЩЕН!\n\n"
-        result += f"📦 Товар: {product_name[:50]}...\n" if len(product_name) > 50 else f"📦 Товар: {product_name}\n"
-        result += f"✏️ Изменение: {field_name}\n"
-        result += f"📅 Период: {duration_days} дней\n"
-        result += f"🔍 Проверка: {review_date.strftime('%d.%m.%Y')}\n"
-        result += f"🆔 ID эксперимента: {experiment.id}\n\n"
-
-        if baseline.get("orders", 0) > 0:
-            result += f"📊 Базовые показатели (7 дней до):\n"
-            result += f"   Просмотры: {baseline.get('views_pdp', 0):,}\n"
-            result += f"   В корзину: {baseline.get('add_to_cart', 0):,}\n"
-            result += f"   Заказы: {baseline.get('orders', 0)}\n"
-            result += f"   Выручка: {baseline.get('revenue', 0):,.0f}₽\n"
-
-        result += f"\nЯ напомню о проверке результатов {review_date.strftime('%d.%m.%Y')}!"
-        return result
+        experiment = await repo.create(
+            product_id=product_id,
+            offer_id=offer_id,
+            product_name=product_name,
+            field_type=field_type,
+            old_value=old_value,
+            new_value=new_value,
+            start_date=start_date,
+            review_date=review_date,
+            duration_days=duration_days,
+            baseline_views=baseline.get("views_pdp", 0),
+            baseline_add_to_cart=baseline.get("add_to_cart", 0),
+            baseline_orders=baseline.get("orders", 0),
+            baseline_revenue=baseline.get("revenue", 0),
+            baseline_conversion=baseline.get("cart_conversion", 0),
+        )
 
-    finally:
-        await client.close()
+    field_name = CONTENT_FIELD_NAMES[field_type]
+    parts: list[str] = [
+        f"🧪 ЭКСПЕРИМЕНТ ЗАПУЩЕН!\n\n",
+        f"📦 Товар: {_short(product_name)}\n",
+        f"✏️ Изменение: {field_name}\n",
+        f"📅 Период: {duration_days} дней\n",
+        f"🔍 Проверка: {review_date.strftime('%d.%m.%Y')}\n",
+        f"🆔 ID эксперимента: {experiment.id}\n\n",
+    ]
+
+    if baseline.get("orders", 0) > 0:
+        parts.extend([
+            f"📊 Базовые показатели (7 дней до):\n",
+            f"   Просмотры: {baseline.get('views_pdp', 0):,}\n",
+            f"   В корзину: {baseline.get('add_to_cart', 0):,}\n",
+            f"   Заказы: {baseline.get('orders', 0)}\n",
+            f"   Выручка: {baseline.get('revenue', 0):,.0f}₽\n",
+        ])
+
+    parts.append(f"\nЯ напомню о проверке результатов {review_date.strftime('%d.%m.%Y')}!")
+    return "".join(parts)
 
 
 async def _get_active_content_experiments() -> str:
     """Get list of active content experiments."""
     async with AsyncSessionLocal() as session:
         repo = ContentExperimentRepository(session)
-        experiments = await repo.get_active_experiments()
+        # One extra row tells whether the list is truncated
+        experiments = await repo.get_active_experiments_paginated(
+            limit=ACTIVE_CONTENT_EXPERIMENTS_MAX_ITEMS + 1
+        )
 
-        if not experiments:
-            return "🧪 Нет активных экспериментов с контентом"
+    if not experiments:
+        return "🧪 Нет активных экспериментов с контентом"
 
-        result = f"🧪 АКТИВНЫЕ ЭКСПЕРИМЕНТЫ С КОНТЕНТОМ ({len(experiments)} шт):\n\n"
+    truncated = len(experiments) > ACTIVE_CONTENT_EXPERIMENTS_MAX_ITEMS
+    if truncated:
+        experiments = experiments[:ACTIVE_CONTENT_EXPERIMENTS_MAX_ITEMS]
 
-        today = date.today()
-        for exp in experiments:
-            days_left = (exp.review_date - today).days
-            status_emoji = "🟡" if days_left > 0 else "🔴"
-            field_name = "Название" if exp.field_type == "name" else "Описание"
+    parts: list[str] = [f"🧪 АКТИВНЫЕ ЭКСПЕРИМЕНТЫ С КОНТЕНТОМ ({len(experiments)} шт):\n\n"]
 
-            short_name = exp.product_name[:35] + "..." if len(exp.product_name) > 35 else exp.product_name
-            result += f"{status_emoji} **{short_name}**\n"
-            result += f"   ID: {exp.id} | Артикул: {exp.offer_id}\n"
-            result += f"   Изменение: {field_name}\n"
-            result += f"   Начало: {exp.start_date.strftime('%d.%m')}\n"
+    today_ordinal = date.today().toordinal()
+    for exp in experiments:
+        days_left = exp.review_date.toordinal() - today_ordinal
+        status_emoji = "🟡" if days_left > 0 else "🔴"
+        field_name = CONTENT_FIELD_NAMES[exp.field_type]
 
-            if days_left > 0:
-                result += f"   Проверка через: {days_left} дн. ({exp.review_date.strftime('%d.%m')})\n"
-            else:
-                result += f"   ⚠️ ПОРА ПРОВЕРИТЬ! (просрочен на {-days_left} дн.)\n"
+        parts.extend([
+            f"{status_emoji} **{_short(exp.product_name, 35)}**\n",
+            f"   ID: {exp.id} | Артикул: {exp.offer_id}\n",
+            f"   Изменение: {field_name}\n",
+            f"   Начало: {exp.start_date.strftime('%d.%m')}\n",
+        ])
 
-            result += "\n"
+        if days_left > 0:
+            parts.append(f"   Проверка через: {days_left} дн. ({exp.review_date.strftime('%d.%m')})\n")
+        else:
+            parts.append(f"   ⚠️ ПОРА ПРОВЕРИТЬ! (просрочен на {-days_left} дн.)\n")
 
-        return result
+        parts.append("\n")
+
+    if truncated:
+        parts.append(f"... показаны первые {ACTIVE_CONTENT_EXPERIMENTS_MAX_ITEMS} экспериментов\n")
+
+    return "".join(parts)
+
+
+def _content_verdict(
+    before_orders: int, after_orders: int, before_conv: float, after_conv: float
+) -> tuple[str, str]:
+    """Suggest a verdict for a content experiment.
+
+    Returns:
+        (verdict, recommendation line for the report)
+    """
+    if after_orders > before_orders and after_conv >= before_conv:
+        return "SUCCESS", "✅ **УСПЕХ** — заказы и конверсия выросли. Рекомендую оставить новый контент.\n"
+    if after_orders < before_orders * 0.8:
+        return "FAILED", "❌ **НЕУДАЧА** — заказы упали. Рекомендую откатить к старому контенту.\n"
+    if after_conv < before_conv * 0.9 and after_orders <= before_orders:
+        return "FAILED", "⚠️ **НЕЭФФЕКТИВНО** — конверсия упала без роста заказов.\n"
+    return "NEUTRAL", "🤷 **НЕЙТРАЛЬНО** — значимых изменений нет. Можно оставить.\n"
 
 
 async def _check_content_experiment(params: dict) -> str:
@@ -1781,91 +2226,78 @@ async def _check_content_experiment(params: dict) -> str:
             return f"Эксперимент {experiment_id} не найден"
 
         # Get current stats from OZON
-        client = OzonClient()
-        try:
-            result_stats = await client.get_product_content_analytics(
-                experiment.product_id,
-                experiment.start_date,
-                date.today() - timedelta(days=1)
-            )
-
-            # Update experiment with results
-            await repo.update_results(
-                experiment_id=experiment_id,
-                result_views=result_stats.get("views_pdp", 0),
-                result_add_to_cart=result_stats.get("add_to_cart", 0),
-                result_orders=result_stats.get("orders", 0),
-                result_revenue=Decimal(str(result_stats.get("revenue", 0))),
-                result_conversion=Decimal(str(result_stats.get("cart_conversion", 0))),
-            )
-
-            # Refresh experiment data
-            experiment = await repo.get_by_id(experiment_id)
+        client = get_ozon_client()
+        today = date.today()
+        result_stats = await client.get_product_content_analytics(
+            experiment.product_id,
+            experiment.start_date,
+            today - timedelta(days=1)
+        )
 
-        finally:
-            await client.close()
+        # Update experiment with results
+        experiment = await repo.update_results(
+            experiment_id=experiment_id,
+            result_views=result_stats.get("views_pdp", 0),
+            result_add_to_cart=result_stats.get("add_to_cart", 0),
+            result_orders=result_stats.get("orders", 0),
+            result_revenue=result_stats.get("revenue", 0),
+            result_conversion=result_stats.get("cart_conversion", 0),
+        )
 
         # Build report
-        field_name = "Название" if experiment.field_type == "name" else "Описание"
-        short_name = experiment.product_name[:40] + "..." if len(experiment.product_name) > 40 else experiment.product_name
+        field_name = CONTENT_FIELD_NAMES[experiment.field_type]
 
-        result = f"📊 РЕЗУЛЬТАТЫ ЭКСПЕРИМЕНТА #{experiment_id}\n\n"
-        result += f"📦 Товар: {short_name}\n"
-        result += f"✏️ Изменение: {field_name}\n"
-        result += f"📅 Период: {experiment.start_date.strftime('%d.%m')} - {date.today().strftime('%d.%m')}\n\n"
+        parts: list[str] = [
+            f"📊 РЕЗУЛЬТАТЫ ЭКСПЕРИМЕНТА #{experiment_id}\n\n",
+            f"📦 Товар: {_short(experiment.product_name, 40)}\n",
+            f"✏️ Изменение: {field_name}\n",
+            f"📅 Период: {experiment.start_date.strftime('%d.%m')} - {today.strftime('%d.%m')}\n\n",
+        ]
 
         # Views
         before_views = experiment.baseline_views or 0
         after_views = experiment.result_views or 0
-        views_change = ((after_views - before_views) / before_views * 100) if before_views > 0 else 0
+        views_change = _pct_change(before_views, after_views)
 
         # Add to cart
         before_cart = experiment.baseline_add_to_cart or 0
         after_cart = experiment.result_add_to_cart or 0
-        cart_change = ((after_cart - before_cart) / before_cart * 100) if before_cart > 0 else 0
+        cart_change = _pct_change(before_cart, after_cart)
 
         # Orders
         before_orders = experiment.baseline_orders or 0
         after_orders = experiment.result_orders or 0
-        orders_change = ((after_orders - before_orders) / before_orders * 100) if before_orders > 0 else 0
+        orders_change = _pct_change(before_orders, after_orders)
 
         # Revenue
         before_revenue = float(experiment.baseline_revenue or 0)
         after_revenue = float(experiment.result_revenue or 0)
-        revenue_change = ((after_revenue - before_revenue) / before_revenue * 100) if before_revenue > 0 else 0
+        revenue_change = _pct_change(before_revenue, after_revenue)
 
-        result += f"📈 СРАВНЕНИЕ (до → после):\n"
-        result += f"   Просмотры: {before_views:,} → {after_views:,} ({views_change:+.1f}%)\n"
-        result += f"   В корзину: {before_cart:,} → {after_cart:,} ({cart_change:+.1f}%)\n"
-        result += f"   Заказы: {before_orders} → {after_orders} ({orders_change:+.1f}%)\n"
-        result += f"   Выручка: {before_revenue:,.0f}₽ → {after_revenue:,.0f}₽ ({revenue_change:+.1f}%)\n"
+        parts.extend([
+            f"📈 СРАВНЕНИЕ (до → после):\n",
+            f"   Просмотры: {before_views:,} → {after_views:,} ({views_change:+.1f}%)\n",
+            f"   В корзину: {before_cart:,} → {after_cart:,} ({cart_change:+.1f}%)\n",
+            f"   Заказы: {before_orders} → {after_orders} ({orders_change:+.1f}%)\n",
+            f"   Выручка: {before_revenue:,.0f}₽ → {after_revenue:,.0f}₽ ({revenue_change:+.1f}%)\n",
+        ])
 
         # Conversion rate
         before_conv = (before_cart / before_views * 100) if before_views > 0 else 0
         after_conv = (after_cart / after_views * 100) if after_views > 0 else 0
-        result += f"   Конверсия в корзину: {before_conv:.2f}% → {after_conv:.2f}%\n"
+        parts.append(f"   Конверсия в корзину: {before_conv:.2f}% → {after_conv:.2f}%\n")
 
-        result += f"\n💡 РЕКОМЕНДАЦИЯ:\n"
+        parts.append(f"\n💡 РЕКОМЕНДАЦИЯ:\n")
 
         # Generate recommendation
-        if after_orders > before_orders and after_conv >= before_conv:
-            result += "✅ **УСПЕХ** — заказы и конверсия выросли. Рекомендую оставить новый контент.\n"
-            suggested_verdict = "SUCCESS"
-        elif after_orders < before_orders * 0.8:
-            result += "❌ **НЕУДАЧА** — заказы упали. Рекомендую откатить к старому контенту.\n"
-            suggested_verdict = "FAILED"
-        elif after_conv < before_conv * 0.9 and after_orders <= before_orders:
-            result += "⚠️ **НЕЭФФЕКТИВНО** — конверсия упала без роста заказов.\n"
-            suggested_verdict = "FAILED"
-        else:
-            result += "🤷 **НЕЙТРАЛЬНО** — значимых изменений нет. Можно оставить.\n"
-            suggested_verdict = "NEUTRAL"
+        suggested_verdict, verdict_text = _content_verdict(before_orders, after_orders, before_conv, after_conv)
+        parts.append(verdict_text)
 
-        result += f"\nЗавершить? Скажи: завершить контент-эксперимент {experiment_id} как {suggested_verdict}"
+        parts.append(f"\nЗавершить? Скажи: завершить контент-эксперимент {experiment_id} как {suggested_verdict}")
         if suggested_verdict == "FAILED":
-            result += " с откатом"
+            parts.append(" с откатом")
 
-        return result
+        return "".join(parts)
 
 
 async def _complete_content_experiment(params: dict) -> str:
@@ -1877,44 +2309,42 @@ async def _complete_content_experiment(params: dict) -> str:
     if not experiment_id or not verdict:
         return "Укажи experiment_id и verdict"
 
-    if verdict not in ["SUCCESS", "FAILED", "NEUTRAL"]:
+    if verdict not in VERDICT_EMOJIS:
         return "verdict должен быть SUCCESS, FAILED или NEUTRAL"
 
     async with AsyncSessionLocal() as session:
         repo = ContentExperimentRepository(session)
-        experiment = await repo.get_by_id(experiment_id)
-
-        if not experiment:
-            return f"Эксперимент {experiment_id} не найден"
 
         # If rollback requested and verdict is FAILED, revert the change
         if rollback and verdict == "FAILED":
-            client = OzonClient()
-            try:
-                if experiment.field_type == "name":
-                    success = await client.update_product_content(
-                        experiment.offer_id, name=experiment.old_value
-                    )
-                else:
-                    success = await client.update_product_content(
-                        experiment.offer_id, description=experiment.old_value
-                    )
-
-                if success:
-                    await repo.rollback_experiment(experiment_id)
-                    field_name = "Название" if experiment.field_type == "name" else "Описание"
-                    return (
-                        f"🔄 Эксперимент #{experiment_id} откачен!\n\n"
-                        f"📦 Товар: {experiment.product_name[:40]}...\n"
-                        f"✏️ {field_name} возвращено к исходному значению\n"
-                        f"🎯 Вердикт: FAILED (откачено)"
-                    )
-                else:
-                    return "❌ Не удалось откатить изменения в OZON"
-            finally:
-                await client.close()
-
-        # Complete without rollback
+            # The old value is needed, so load the experiment first
+            experiment = await repo.get_by_id(experiment_id)
+            if not experiment:
+                return f"Эксперимент {experiment_id} не найден"
+
+            client = get_ozon_client()
+            if experiment.field_type == "name":
+                success = await client.update_product_content(
+                    experiment.offer_id, name=experiment.old_value
+                )
+            else:
+                success = await client.update_product_content(
+                    experiment.offer_id, description=experiment.old_value
+                )
+
+            if success:
+                await repo.rollback_experiment(experiment_id)
+                field_name = CONTENT_FIELD_NAMES[experiment.field_type]
+                return (
+                    f"🔄 Эксперимент #{experiment_id} откачен!\n\n"
+                    f"📦 Товар: {_short(experiment.product_name, 40)}\n"
+                    f"✏️ {field_name} возвращено к исходному значению\n"
+                    f"🎯 Вердикт: FAILED (откачено)"
+                )
+            else:
+                return "❌ Не удалось откатить изменения в OZON"
+
+        # Complete without rollback (the update returns the row, no prior SELECT)
         experiment = await repo.complete_experiment(
             experiment_id=experiment_id,
             verdict=verdict,
@@ -1923,33 +2353,136 @@ async def _complete_content_experiment(params: dict) -> str:
         if not experiment:
             return f"Эксперимент {experiment_id} не найден"
 
-        verdict_emoji = {"SUCCESS": "✅", "FAILED": "❌", "NEUTRAL": "🤷"}.get(verdict, "")
-        field_name = "Название" if experiment.field_type == "name" else "Описание"
+        verdict_emoji = VERDICT_EMOJIS[verdict]
+        field_name = CONTENT_FIELD_NAMES[experiment.field_type]
 
-        result = f"{verdict_emoji} Эксперимент #{experiment_id} завершён!\n\n"
-        result += f"📦 Товар: {experiment.product_name[:40]}...\n"
-        result += f"✏️ Изменение: {field_name}\n"
-        result += f"🎯 Вердикт: **{verdict}**\n"
+        parts: list[str] = [
+            f"{verdict_emoji} Эксперимент #{experiment_id} завершён!\n\n",
+            f"📦 Товар: {_short(experiment.product_name, 40)}\n",
+            f"✏️ Изменение: {field_name}\n",
+            f"🎯 Вердикт: **{verdict}**\n",
+        ]
 
         if verdict == "SUCCESS":
-            result += "\n✨ Новый контент оставлен"
+            parts.append("\n✨ Новый контент оставлен")
         elif verdict == "FAILED" and not rollback:
-            result += f"\n⚠️ Рекомендую откатить: завершить контент-эксперимент {experiment_id} как FAILED с откатом"
+            parts.append(f"\n⚠️ Рекомендую откатить: завершить контент-эксперимент {experiment_id} как FAILED с откатом")
 
-        return result
+        return "".join(parts)
 
 
 # ============== CARD AUDIT TOOLS ==============
 
 from src.ai.card_evaluator import (
-    BlockEvaluation,
     CardEvaluation,
-    BLOCK_INFO,
-    evaluate_card_block,
+    evaluate_all_blocks_single_call,
     format_evaluation_report,
     extract_priority_actions,
 )
 
+AUDIT_BLOCKS = ("main_photo", "secondary_photos", "price_value", "title",
+                "characteristics", "description", "reviews")
+AUDIT_BLOCKS_SET = frozenset(AUDIT_BLOCKS)
+AUDIT_MAX_CHARACTERISTICS = 20
+DESCRIPTION_ATTRIBUTE_ID = 4191
+
+# "1 299,50 ₽" -> "1299.50" in a single pass
+_PRICE_TRANS = str.maketrans({",": ".", " ": None, "₽": None})
+
+
+async def build_card_audit_data(product: Product) -> Optional[dict]:
+    """Collect the card data evaluated by the audit prompts (None if OZON has no info)."""
+    product_id = product.product_id
+    offer_id = product.offer_id
+    product_name = product.name
+    price = float(product.price) if product.price else 0
+
+    # Fetch additional data from OZON API (independent requests, run concurrently)
+    client = get_ozon_client()
+    products_info, attributes, rating_data, reviews, questions = await asyncio.gather(
+        client.get_product_info([product_id]),
+        client.get_product_attributes(product_id),  # for description
+        _rating_loader.load(product_id),
+        client.get_reviews_list(product_id, limit=10),
+        client.get_questions_list(product_id, limit=5),
+        return_exceptions=True,
+    )
+    products_info = _result_or_default("product info", products_info, [])
+    if not products_info:
+        return None
+
+    product_info = products_info[0]
+    attributes = _result_or_default("attributes", attributes, {})
+    rating_data = _result_or_default("rating", rating_data, {})
+    reviews = _result_or_default("reviews", reviews, [])
+    questions = _result_or_default("questions", questions, [])
+
+    # Extract description and characteristics from attributes
+    description = ""
+    found_description = False
+    characteristics = []
+    for attr in attributes.get("attributes", ()):
+        values = attr.get("values")
+        if not values:
+            continue
+        attr_value = values[0].get("value", "")
+        if attr.get("attribute_id") == DESCRIPTION_ATTRIBUTE_ID:
+            description = attr_value
+            found_description = True
+        else:
+            attr_name = attr.get("name", "")
+            if attr_name and attr_value and len(characteristics) < AUDIT_MAX_CHARACTERISTICS:
+                characteristics.append(f"{attr_name}: {attr_value}")
+        if found_description and len(characteristics) >= AUDIT_MAX_CHARACTERISTICS:
+            break  # nothing else from attributes is used
+
+    # Get images
+    images = product_info.images if hasattr(product_info, 'images') else []
+    main_photo_url = images[0] if images else "нет фото"
+    secondary_photos = images[1:] if len(images) > 1 else []
+
+    # Rating and reviews
+    rating = rating_data.get("rating", 0)
+    reviews_count = rating_data.get("reviews_count", 0)
+    questions_count = rating_data.get("questions_count", 0)
+
+    # Format reviews for prompt
+    if reviews:
+        reviews_text = "".join(
+            f"⭐{rev.get('rating', 0)}/5: {rev.get('text', '')[:200]}\n" for rev in reviews[:5]
+        )
+    else:
+        reviews_text = "Отзывов пока нет"
+
+    # Format questions for prompt
+    if questions:
+        questions_text = "".join(f"• {q.get('text', '')[:100]}\n" for q in questions[:3])
+    else:
+        questions_text = "Вопросов нет"
+
+    # Old price
+    old_price = product_info.old_price if hasattr(product_info, 'old_price') else "0"
+
+    # Product data for evaluation prompts
+    product_data = {
+        "product_id": product_id,
+        "offer_id": offer_id,
+        "product_name": product_name,
+        "title": product_name,
+        "price": price,
+        "old_price": old_price,
+        "main_photo_url": main_photo_url,
+        "photo_urls": ", ".join(secondary_photos[:5]) if secondary_photos else "нет дополнительных фото",
+        "description": description[:2000] if description else "Описание не заполнено",
+        "description_preview": description[:500] if description else "Описание не заполнено",
+        "characteristics": "\n".join(characteristics) if characteristics else "Характеристики не заполнены",
+        "reviews": reviews_text,
+        "questions": questions_text,
+        "rating": rating,
+        "reviews_count": reviews_count,
+    }
+    return product_data
+
 
 async def _audit_product_card(params: dict) -> str:
     """Perform a full audit of a product card across all 7 blocks."""
@@ -1959,146 +2492,36 @@ async def _audit_product_card(params: dict) -> str:
     if not search_query:
         return "Укажи название товара или его часть для поиска"
 
-    # Default: evaluate all blocks
-    all_blocks = ["main_photo", "secondary_photos", "price_value", "title",
-                  "characteristics", "description", "reviews"]
-
     if blocks_to_evaluate:
         # Validate requested blocks
-        invalid = [b for b in blocks_to_evaluate if b not in all_blocks]
+        invalid = [b for b in blocks_to_evaluate if b not in AUDIT_BLOCKS_SET]
         if invalid:
-            return f"Неизвестные блоки: {invalid}. Доступные: {all_blocks}"
-        blocks_to_evaluate = blocks_to_evaluate
+            return f"Неизвестные блоки: {invalid}. Доступные: {list(AUDIT_BLOCKS)}"
     else:
-        blocks_to_evaluate = all_blocks
+        # Default: evaluate all blocks
+        blocks_to_evaluate = list(AUDIT_BLOCKS)
 
     # 1. Find product in local DB
-    async with AsyncSessionLocal() as session:
-        from src.database.repositories.products import ProductRepository
-        from src.database.repositories.sales import SalesRepository
-
-        products_repo = ProductRepository(session)
-        all_products = await products_repo.get_all_active()
+    matched_product = await _find_active_product(search_query)
 
-        matched_product = None
-        for p in all_products:
-            if search_query in p.name.lower() or search_query in (p.offer_id or "").lower():
-                matched_product = p
-                break
-
-        if not matched_product:
-            return f"Товар '{search_query}' не найден в базе. Попробуй другое название."
+    if not matched_product:
+        return f"Товар '{search_query}' не найден в базе. Попробуй другое название."
 
     product_id = matched_product.product_id
     offer_id = matched_product.offer_id
     product_name = matched_product.name
-    price = float(matched_product.price) if matched_product.price else 0
 
-    # 2. Fetch additional data from OZON API
-    client = OzonClient()
-    try:
-        # Get detailed product info
-        products_info = await client.get_product_info([product_id])
-        if not products_info:
-            return f"Не удалось получить информацию о товаре {product_id}"
-
-        product_info = products_info[0]
-
-        # Get product attributes (for description)
-        attributes = await client.get_product_attributes(product_id)
-
-        # Extract description from attributes
-        description = ""
-        characteristics = []
-        for attr in attributes.get("attributes", []):
-            attr_id = attr.get("attribute_id")
-            values = attr.get("values", [])
-            if attr_id == 4191:  # Description attribute
-                description = values[0].get("value", "") if values else ""
-            else:
-                # Collect other characteristics
-                attr_name = attr.get("name", "")
-                attr_value = values[0].get("value", "") if values else ""
-                if attr_name and attr_value:
-                    characteristics.append(f"{attr_name}: {attr_value}")
-
-        # Get images
-        images = product_info.images if hasattr(product_info, 'images') else []
-        main_photo_url = images[0] if images else "нет фото"
-        secondary_photos = images[1:] if len(images) > 1 else []
-
-        # Get rating and reviews
-        rating_info = await client.get_product_rating([product_id])
-        rating_data = rating_info.get(product_id, {})
-        rating = rating_data.get("rating", 0)
-        reviews_count = rating_data.get("reviews_count", 0)
-        questions_count = rating_data.get("questions_count", 0)
-
-        # Try to get actual reviews
-        reviews = await client.get_reviews_list(product_id, limit=10)
-        questions = await client.get_questions_list(product_id, limit=5)
-
-        # Format reviews for prompt
-        reviews_text = ""
-        if reviews:
-            for rev in reviews[:5]:
-                stars = rev.get("rating", 0)
-                text = rev.get("text", "")[:200]
-                reviews_text += f"⭐{stars}/5: {text}\n"
-        else:
-            reviews_text = "Отзывов пока нет"
-
-        # Format questions for prompt
-        questions_text = ""
-        if questions:
-            for q in questions[:3]:
-                questions_text += f"• {q.get('text', '')[:100]}\n"
-        else:
-            questions_text = "Вопросов нет"
-
-        # Old price
-        old_price = product_info.old_price if hasattr(product_info, 'old_price') else "0"
-
-    finally:
-        await client.close()
-
-    # 3. Prepare product data for evaluation
-    product_data = {
-        "product_id": product_id,
-        "offer_id": offer_id,
-        "product_name": product_name,
-        "title": product_name,
-        "price": price,
-        "old_price": old_price,
-        "main_photo_url": main_photo_url,
-        "photo_urls": ", ".join(secondary_photos[:5]) if secondary_photos else "нет дополнительных фото",
-        "description": description[:2000] if description else "Описание не заполнено",
-        "description_preview": description[:500] if description else "Описание не заполнено",
-        "characteristics": "\n".join(characteristics[:20]) if characteristics else "Характеристики не заполнены",
-        "reviews": reviews_text,
-        "questions": questions_text,
-        "rating": rating,
-        "reviews_count": reviews_count,
-    }
+    # 2-3. Fetch card data from OZON and prepare it for evaluation
+    product_data = await build_card_audit_data(matched_product)
+    if product_data is None:
+        return f"Не удалось получить информацию о товаре {product_id}"
 
     # 4. Evaluate each block using GPT-4o
-    openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
+    openai_client = get_async_openai()
 
-    block_evaluations = []
-    for block_id in blocks_to_evaluate:
-        try:
-            evaluation = await evaluate_card_block(block_id, product_data, openai_client)
-            block_evaluations.append(evaluation)
-        except Exception as e:
-            logger.error(f"Failed to evaluate block {block_id}: {e}")
-            block_evaluations.append(BlockEvaluation(
-                block_name=BLOCK_INFO[block_id]["name"],
-                block_id=block_id,
-                score=5,
-                diagnosis=f"Ошибка оценки: {str(e)}",
-                recommendations=[],
-                metrics_affected=BLOCK_INFO[block_id]["metrics"],
-            ))
+    block_evaluations = await evaluate_all_blocks_single_call(
+        product_data, openai_client, blocks_to_evaluate
+    )
 
     # 5. Calculate overall score
     overall_score = sum(b.score for b in block_evaluations) / len(block_evaluations) if block_evaluations else 0
@@ -2120,9 +2543,12 @@ async def _audit_product_card(params: dict) -> str:
 
     # Add context for AI to suggest experiments
     if priority_actions:
-        report += "\n📝 **ДАННЫЕ ДЛЯ ЭКСПЕРИМЕНТОВ:**\n"
-        report += f"product_id: {product_id}\n"
-        report += f"offer_id: {offer_id}\n"
+        report = "".join([
+            report,
+            "\n📝 **ДАННЫЕ ДЛЯ ЭКСПЕРИМЕНТОВ:**\n",
+            f"product_id: {product_id}\n",
+            f"offer_id: {offer_id}\n",
+        ])
 
     return report
 
@@ -2141,17 +2567,14 @@ async def _apply_card_recommendation(params: dict) -> str:
         return "recommendation_type должен быть 'title', 'description' или 'price'"
 
     # Get product info to get offer_id
-    client = OzonClient()
-    try:
-        products = await client.get_product_info([product_id])
-        if not products:
-            return f"Товар {product_id} не найден"
+    client = get_ozon_client()
+    products = await client.get_product_info([product_id])
+    if not products:
+        return f"Товар {product_id} не найден"
 
-        product = products[0]
-        offer_id = product.offer_id
-        product_name = product.name
-    finally:
-        await client.close()
+    product = products[0]
+    offer_id = product.offer_id
+    product_name = product.name
 
     # Route to appropriate experiment type
     if recommendation_type in ["title", "description"]:
@@ -2164,20 +2587,19 @@ async def _apply_card_recommendation(params: dict) -> str:
             "field_type": field_type,
             "new_value": new_value,
             "duration_days": duration_days,
-        })
+        }, product=product)
 
     elif recommendation_type == "price":
         # Price experiment
         from src.database.repositories.experiments import ExperimentRepository
 
         try:
-            new_price = Decimal(str(new_value).replace(",", ".").replace(" ", "").replace("₽", ""))
-        except:
+            new_price = Decimal(str(new_value).translate(_PRICE_TRANS))
+        except (InvalidOperation, ValueError):
             return f"Некорректная цена: {new_value}"
 
         # Get current price
         async with AsyncSessionLocal() as session:
-            from src.database.repositories.products import ProductRepository
             products_repo = ProductRepository(session)
             product_db = await products_repo.get_by_product_id(product_id)
 
@@ -2196,23 +2618,59 @@ async def _apply_card_recommendation(params: dict) -> str:
             )
 
         # Apply new price via OZON API
-        client = OzonClient()
-        try:
-            success = await client.update_price(product_id, new_price)
+        success = await client.update_price(product_id, new_price)
 
-            if not success:
-                return "❌ Не удалось изменить цену в OZON"
+        if not success:
+            return "❌ Не удалось изменить цену в OZON"
 
-            result = f"🧪 ЦЕНОВОЙ ЭКСПЕРИМЕНТ ЗАПУЩЕН!\n\n"
-            result += f"📦 Товар: {product_name[:50]}...\n"
-            result += f"💰 Цена: {old_price}₽ → {new_price}₽\n"
-            result += f"📅 Период: {duration_days} дней\n"
-            result += f"🆔 ID эксперимента: {experiment.id}\n\n"
-            result += f"Я напомню о проверке результатов через {duration_days} дней!"
+        parts: list[str] = [
+            f"🧪 ЦЕНОВОЙ ЭКСПЕРИМЕНТ ЗАПУЩЕН!\n\n",
+            f"📦 Товар: {_short(product_name)}\n",
+            f"💰 Цена: {old_price}₽ → {new_price}₽\n",
+            f"📅 Период: {duration_days} дней\n",
+            f"🆔 ID эксперимента: {experiment.id}\n\n",
+            f"Я напомню о проверке результатов через {duration_days} дней!",
+        ]
 
-            return result
+        return "".join(parts)
 
-        finally:
-            await client.close()
 
     return "Неизвестный тип рекомендации"
+
+
+# ============== DISPATCH ==============
+
+# Tool name -> handler (defined here so all handlers already exist)
+_DISPATCH_WITH_PARAMS: dict[str, Callable[[dict], Awaitable[str]]] = {
+    # Seller API tools
+    "get_sales_analytics": _get_sales_analytics,
+    "get_product_analytics": _get_product_analytics,
+    # Performance API tools (advertising)
+    "get_ad_campaigns": _get_ad_campaigns,
+    "get_campaign_stats": _get_campaign_stats,
+    "activate_ad_campaign": _activate_ad_campaign,
+    "deactivate_ad_campaign": _deactivate_ad_campaign,
+    "set_product_ad_bid": _set_product_ad_bid,
+    "set_product_ad_bids": _set_product_ad_bids,
+    "get_campaign_products": _get_campaign_products,
+    # Ad experiment tools
+    "start_ad_experiment": _start_ad_experiment,
+    "check_ad_experiment": _check_ad_experiment,
+    "complete_ad_experiment": _complete_ad_experiment,
+    # Quick content update tools
+    "update_product_name": _update_product_name,
+    # Content experiment tools
+    "start_content_experiment": _start_content_experiment,
+    "check_content_experiment": _check_content_experiment,
+    "complete_content_experiment": _complete_content_experiment,
+    # Card audit tools
+    "audit_product_card": _audit_product_card,
+    "apply_card_recommendation": _apply_card_recommendation,
+}
+
+_DISPATCH_NOARG: dict[str, Callable[[], Awaitable[str]]] = {
+    "get_current_stocks": _get_current_stocks,
+    "get_product_list": _get_product_list,
+    "get_active_ad_experiments": _get_active_ad_experiments,
+    "get_active_content_experiments": _get_active_content_experiments,
+}
@@ -7,12 +7,12 @@ from decimal import Decimal
 from telegram import Update
 from telegram.ext import ContextTypes
 
+from src.ai.clients import get_ozon_client
 from src.analytics.pricing import PricingEngine
 from src.database.engine import AsyncSessionLocal
 from src.database.repositories.experiments import ExperimentRepository
 from src.database.repositories.price_recommendations import PriceRecommendationRepository
 from src.database.repositories.products import ProductRepository
-from src.ozon.client import OzonClient
 from src.utils.formatting import format_currency, format_date
 
 logger = logging.getLogger(__name__)
@@ -50,13 +50,11 @@ async def handle_approve_price(
                 return
 
             # Update price via OZON
-            ozon = OzonClient()
-            success = await ozon.update_price(
+            success = await get_ozon_client().update_price(
                 product_id=product.product_id,
                 price=recommendation.recommended_price,
                 old_price=product.price,
             )
-            await ozon.close()
 
             if not success:
                 await query.edit_message_text(
@@ -148,12 +146,10 @@ async def handle_rollback_price(
                 return
 
             # Rollback price via OZON
-            ozon = OzonClient()
-            success = await ozon.update_price(
+            success = await get_ozon_client().update_price(
                 product_id=experiment.product_id,
                 price=experiment.old_price,
             )
-            await ozon.close()
 
             if not success:
                 await query.edit_message_text("❌ Ошибка при откате цены в OZON")
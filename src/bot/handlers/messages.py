@@ -1,13 +1,15 @@
 """Telegram bot message handlers (AI-powered)."""
 
 import logging
+import time
 from datetime import date, timedelta
 from decimal import Decimal
 
-from telegram import Update
+from telegram import Message, Update
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes
 
-from src.ai.assistant import OpenAIAssistant
+from src.ai.assistant import get_assistant
 from src.ai.prompts import (
     BusinessContext,
     build_experiments_summary,
@@ -23,6 +25,10 @@ from src.utils.formatting import format_currency, format_number
 
 logger = logging.getLogger(__name__)
 
+# Telegram rate-limits message edits; update the streamed answer at most this often
+STREAM_EDIT_INTERVAL = 1.5
+TELEGRAM_MESSAGE_LIMIT = 4096
+
 
 async def build_business_context_data(session) -> BusinessContext:
     """Build business context from current data."""
@@ -79,6 +85,49 @@ async def build_business_context_data(session) -> BusinessContext:
     )
 
 
+def _split_message(text: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> list[str]:
+    """Split text into Telegram-sized parts, preferring line breaks."""
+    parts = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit)
+        if cut <= 0:
+            cut = limit
+        parts.append(text[:cut])
+        text = text[cut:].lstrip("\n")
+    parts.append(text)
+    return parts
+
+
+def _is_not_modified(error: BadRequest) -> bool:
+    """Whether Telegram rejected an edit because the text is already the same."""
+    return "message is not modified" in str(error).lower()
+
+
+async def _edit_final(message: Message, text: str) -> None:
+    """Edit message to its final text (Markdown, with fallback to plain text)."""
+    try:
+        await message.edit_text(text, parse_mode="Markdown")
+    except BadRequest as parse_error:
+        if _is_not_modified(parse_error):
+            return
+        logger.warning(f"Markdown parse error, sending as plain text: {parse_error}")
+        try:
+            await message.edit_text(text)
+        except BadRequest as edit_error:
+            # The streamed text already is the plain answer
+            if not _is_not_modified(edit_error):
+                raise
+
+
+async def _reply_final(message: Message, text: str) -> None:
+    """Send a continuation of the answer (Markdown, with fallback to plain text)."""
+    try:
+        await message.reply_text(text, parse_mode="Markdown")
+    except BadRequest as parse_error:
+        logger.warning(f"Markdown parse error, sending as plain text: {parse_error}")
+        await message.reply_text(text)
+
+
 async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle free-form messages using AI assistant."""
     user_message = update.message.text
@@ -92,17 +141,39 @@ async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             # Build business context
             business_context = await build_business_context_data(session)
 
-            # Ask AI
-            assistant = OpenAIAssistant()
-            response = await assistant.ask(user_message, business_context)
+            # Ask AI, showing the answer as it is generated
+            reply = await update.message.reply_text("🤔 Думаю...")
+            assistant = get_assistant()
+
+            async def show_status(status: str) -> None:
+                # Temporary note while tools run; replaced by the answer text
+                try:
+                    await reply.edit_text(status)
+                except Exception as edit_error:
+                    logger.debug(f"Skipped status edit: {edit_error}")
+
+            response = ""
+            last_edit = time.monotonic()
+            async for chunk in assistant.ask_stream(
+                user_message, business_context, on_status=show_status
+            ):
+                response += chunk
+                now = time.monotonic()
+                if now - last_edit >= STREAM_EDIT_INTERVAL and response.strip():
+                    last_edit = now
+                    try:
+                        await reply.edit_text(response[:TELEGRAM_MESSAGE_LIMIT])
+                    except Exception as edit_error:
+                        logger.debug(f"Skipped streaming edit: {edit_error}")
             await assistant.close()
 
-            # Send response (with fallback to plain text if markdown fails)
-            try:
-                await update.message.reply_text(response, parse_mode="Markdown")
-            except Exception as parse_error:
-                logger.warning(f"Markdown parse error, sending as plain text: {parse_error}")
-                await update.message.reply_text(response)
+            response = response.strip() or "Извините, не удалось получить ответ."
+
+            # Final version; answers over the Telegram limit continue in new messages
+            first_part, *other_parts = _split_message(response)
+            await _edit_final(reply, first_part)
+            for part in other_parts:
+                await _reply_final(update.message, part)
 
         except Exception as e:
             logger.error(f"Error in AI message handler: {e}")
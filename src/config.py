@@ -23,6 +23,8 @@ class Settings(BaseSettings):
 
     # OpenAI API
     openai_api_key: str
+    openai_max_concurrent_evaluations: int = 4  # card audit requests in flight, across all audits
+    catalog_card_audit_enabled: bool = False  # nightly re-scoring of all cards via the Batch API
 
     # Application settings
     timezone: str = "Europe/Moscow"
@@ -17,6 +17,7 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -47,6 +48,16 @@ class Product(Base):
         DateTime, server_default=func.now(), onupdate=func.now()
     )
 
+    __table_args__ = (
+        # Substring search by name/offer_id (pg_trgm, see ProductRepository.search_by_name)
+        Index("idx_products_name_trgm", text("lower(name) gin_trgm_ops"), postgresql_using="gin"),
+        Index(
+            "idx_products_offer_id_trgm",
+            text("lower(offer_id) gin_trgm_ops"),
+            postgresql_using="gin",
+        ),
+    )
+
 
 class Sale(Base):
     """Daily sales aggregates per product."""
@@ -265,6 +276,7 @@ class ContentExperiment(Base):
 
     __table_args__ = (
         Index("idx_content_exp_product_status", "product_id", "status"),
+        Index("idx_content_exp_status_review", "status", "review_date"),
     )
 
 
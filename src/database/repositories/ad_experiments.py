@@ -8,6 +8,7 @@ from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import AdExperiment
+from src.utils.money import to_money
 
 
 class AdExperimentRepository:
@@ -26,14 +27,14 @@ class AdExperimentRepository:
         review_date: date,
         duration_days: int = 7,
         product_id: Optional[int] = None,
-        old_bid: Optional[Decimal] = None,
-        new_bid: Optional[Decimal] = None,
-        daily_budget: Optional[Decimal] = None,
+        old_bid: Optional[Decimal | float] = None,
+        new_bid: Optional[Decimal | float] = None,
+        daily_budget: Optional[Decimal | float] = None,
         baseline_views: Optional[int] = None,
         baseline_clicks: Optional[int] = None,
-        baseline_spend: Optional[Decimal] = None,
+        baseline_spend: Optional[Decimal | float] = None,
         baseline_orders: Optional[int] = None,
-        baseline_revenue: Optional[Decimal] = None,
+        baseline_revenue: Optional[Decimal | float] = None,
     ) -> AdExperiment:
         """Create a new ad experiment."""
         experiment = AdExperiment(
@@ -45,14 +46,14 @@ class AdExperimentRepository:
             review_date=review_date,
             duration_days=duration_days,
             product_id=product_id,
-            old_bid=old_bid,
-            new_bid=new_bid,
-            daily_budget=daily_budget,
+            old_bid=to_money(old_bid),
+            new_bid=to_money(new_bid),
+            daily_budget=to_money(daily_budget),
             baseline_views=baseline_views,
             baseline_clicks=baseline_clicks,
-            baseline_spend=baseline_spend,
+            baseline_spend=to_money(baseline_spend),
             baseline_orders=baseline_orders,
-            baseline_revenue=baseline_revenue,
+            baseline_revenue=to_money(baseline_revenue),
             status="active",
         )
         self.session.add(experiment)
@@ -103,20 +104,25 @@ class AdExperimentRepository:
         experiment_id: int,
         result_views: int,
         result_clicks: int,
-        result_spend: Decimal,
+        result_spend: Decimal | float,
         result_orders: int,
-        result_revenue: Decimal,
+        result_revenue: Decimal | float,
     ) -> Optional[AdExperiment]:
-        """Update experiment with results."""
-        experiment = await self.get_by_id(experiment_id)
+        """Update experiment with results and return it.
+
+        The experiment is taken from the session identity map when the caller
+        already loaded it, and all changed values are set here, so no extra
+        SELECT is needed before or after the commit.
+        """
+        experiment = await self.session.get(AdExperiment, experiment_id)
         if not experiment:
             return None
 
         experiment.result_views = result_views
         experiment.result_clicks = result_clicks
-        experiment.result_spend = result_spend
+        experiment.result_spend = to_money(result_spend)
         experiment.result_orders = result_orders
-        experiment.result_revenue = result_revenue
+        experiment.result_revenue = to_money(result_revenue)
 
         # Calculate changes
         if experiment.baseline_clicks and experiment.baseline_views:
@@ -133,12 +139,11 @@ class AdExperimentRepository:
         # Calculate ROAS
         if experiment.baseline_spend and experiment.baseline_revenue:
             experiment.roas_before = experiment.baseline_revenue / experiment.baseline_spend
-        if result_spend and result_revenue:
-            experiment.roas_after = result_revenue / result_spend
+        if experiment.result_spend and experiment.result_revenue:
+            experiment.roas_after = experiment.result_revenue / experiment.result_spend
 
         experiment.status = "reviewing"
         await self.session.commit()
-        await self.session.refresh(experiment)
         return experiment
 
     async def complete_experiment(
@@ -148,7 +153,7 @@ class AdExperimentRepository:
         recommendation: Optional[str] = None,
     ) -> Optional[AdExperiment]:
         """Complete an experiment with a verdict."""
-        experiment = await self.get_by_id(experiment_id)
+        experiment = await self.session.get(AdExperiment, experiment_id)
         if not experiment:
             return None
 
@@ -158,7 +163,6 @@ class AdExperimentRepository:
         experiment.completed_at = datetime.now()
 
         await self.session.commit()
-        await self.session.refresh(experiment)
         return experiment
 
     async def get_recent_experiments(self, limit: int = 10) -> list[AdExperiment]:
@@ -4,10 +4,11 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import Row, exists, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import ContentExperiment
+from src.utils.money import to_money
 
 
 class ContentExperimentRepository:
@@ -30,8 +31,8 @@ class ContentExperimentRepository:
         baseline_views: Optional[int] = None,
         baseline_add_to_cart: Optional[int] = None,
         baseline_orders: Optional[int] = None,
-        baseline_revenue: Optional[Decimal] = None,
-        baseline_conversion: Optional[Decimal] = None,
+        baseline_revenue: Optional[Decimal | float] = None,
+        baseline_conversion: Optional[Decimal | float] = None,
     ) -> ContentExperiment:
         """Create a new content experiment."""
         experiment = ContentExperiment(
@@ -47,8 +48,8 @@ class ContentExperimentRepository:
             baseline_views=baseline_views,
             baseline_add_to_cart=baseline_add_to_cart,
             baseline_orders=baseline_orders,
-            baseline_revenue=baseline_revenue,
-            baseline_conversion=baseline_conversion,
+            baseline_revenue=to_money(baseline_revenue),
+            baseline_conversion=to_money(baseline_conversion),
             status="active",
         )
         self.session.add(experiment)
@@ -72,6 +73,35 @@ class ContentExperimentRepository:
         )
         return list(result.scalars().all())
 
+    async def get_active_experiments_paginated(self, limit: int, offset: int = 0) -> list[Row]:
+        """Get one page of active experiments, soonest review first.
+
+        Only the columns shown in experiment lists are selected (no old/new
+        content values).
+
+        Args:
+            limit: Maximum number of experiments to return
+            offset: Number of experiments to skip
+
+        Returns:
+            Rows with id, product_name, offer_id, field_type, start_date, review_date
+        """
+        result = await self.session.execute(
+            select(
+                ContentExperiment.id,
+                ContentExperiment.product_name,
+                ContentExperiment.offer_id,
+                ContentExperiment.field_type,
+                ContentExperiment.start_date,
+                ContentExperiment.review_date,
+            )
+            .where(ContentExperiment.status == "active")
+            .order_by(ContentExperiment.review_date, ContentExperiment.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        return list(result.all())
+
     async def get_experiments_for_review(self, as_of_date: date) -> list[ContentExperiment]:
         """Get experiments that are ready for review."""
         result = await self.session.execute(
@@ -97,12 +127,14 @@ class ContentExperimentRepository:
     async def has_active_experiment(self, product_id: int, field_type: str) -> bool:
         """Check if product already has an active experiment for this field."""
         result = await self.session.execute(
-            select(ContentExperiment)
-            .where(ContentExperiment.product_id == product_id)
-            .where(ContentExperiment.field_type == field_type)
-            .where(ContentExperiment.status == "active")
+            select(
+                exists()
+                .where(ContentExperiment.product_id == product_id)
+                .where(ContentExperiment.field_type == field_type)
+                .where(ContentExperiment.status == "active")
+            )
         )
-        return result.scalar_one_or_none() is not None
+        return bool(result.scalar())
 
     async def update_results(
         self,
@@ -110,23 +142,27 @@ class ContentExperimentRepository:
         result_views: int,
         result_add_to_cart: int,
         result_orders: int,
-        result_revenue: Decimal,
-        result_conversion: Optional[Decimal] = None,
+        result_revenue: Decimal | float,
+        result_conversion: Optional[Decimal | float] = None,
     ) -> Optional[ContentExperiment]:
-        """Update experiment with results."""
-        experiment = await self.get_by_id(experiment_id)
+        """Update experiment with results and return it.
+
+        The experiment is taken from the session identity map when the caller
+        already loaded it, and all changed values are set here, so no extra
+        SELECT is needed before or after the commit.
+        """
+        experiment = await self.session.get(ContentExperiment, experiment_id)
         if not experiment:
             return None
 
         experiment.result_views = result_views
         experiment.result_add_to_cart = result_add_to_cart
         experiment.result_orders = result_orders
-        experiment.result_revenue = result_revenue
-        experiment.result_conversion = result_conversion
+        experiment.result_revenue = to_money(result_revenue)
+        experiment.result_conversion = to_money(result_conversion)
 
         experiment.status = "reviewing"
         await self.session.commit()
-        await self.session.refresh(experiment)
         return experiment
 
     async def complete_experiment(
@@ -135,18 +171,25 @@ class ContentExperimentRepository:
         verdict: str,
         recommendation: Optional[str] = None,
     ) -> Optional[ContentExperiment]:
-        """Complete an experiment with a verdict."""
-        experiment = await self.get_by_id(experiment_id)
-        if not experiment:
-            return None
+        """Complete an experiment with a verdict.
 
-        experiment.status = "completed"
-        experiment.verdict = verdict
-        experiment.recommendation = recommendation
-        experiment.completed_at = datetime.now()
+        Uses a single UPDATE ... RETURNING, so the caller does not need to load
+        the experiment first.
+        """
+        result = await self.session.execute(
+            update(ContentExperiment)
+            .where(ContentExperiment.id == experiment_id)
+            .values(
+                status="completed",
+                verdict=verdict,
+                recommendation=recommendation,
+                completed_at=datetime.now(),
+            )
+            .returning(ContentExperiment)
+        )
+        experiment = result.scalar_one_or_none()
 
         await self.session.commit()
-        await self.session.refresh(experiment)
         return experiment
 
     async def rollback_experiment(
@@ -154,7 +197,7 @@ class ContentExperimentRepository:
         experiment_id: int,
     ) -> Optional[ContentExperiment]:
         """Mark experiment as rolled back (content reverted to old value)."""
-        experiment = await self.get_by_id(experiment_id)
+        experiment = await self.session.get(ContentExperiment, experiment_id)
         if not experiment:
             return None
 
@@ -163,7 +206,6 @@ class ContentExperimentRepository:
         experiment.completed_at = datetime.now()
 
         await self.session.commit()
-        await self.session.refresh(experiment)
         return experiment
 
     async def get_recent_experiments(self, limit: int = 10) -> list[ContentExperiment]:
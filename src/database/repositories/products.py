@@ -4,7 +4,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import select, update
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import Product
@@ -33,6 +33,26 @@ class ProductRepository:
         result = await self.session.execute(select(Product).where(Product.is_active == True))
         return list(result.scalars().all())
 
+    async def search_by_name(self, query: str, limit: int = 5) -> list[Product]:
+        """Find active products whose name or offer ID contains the query (case-insensitive).
+
+        Served by the pg_trgm GIN indexes; best matches (by trigram similarity) first.
+        """
+        query = query.lower()
+        result = await self.session.execute(
+            select(Product)
+            .where(
+                Product.is_active == True,
+                or_(
+                    func.lower(Product.name).contains(query, autoescape=True),
+                    func.lower(Product.offer_id).contains(query, autoescape=True),
+                ),
+            )
+            .order_by(func.similarity(func.lower(Product.name), query).desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
     async def get_all(self) -> list[Product]:
         """Get all products."""
         result = await self.session.execute(select(Product))
@@ -4,7 +4,7 @@ from datetime import date, timedelta
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import func, select
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import Sale
@@ -79,6 +79,35 @@ class SalesRepository:
         revenue = row[1] or Decimal("0")
         return quantity, revenue
 
+    async def get_totals_for_periods(
+        self, product_id: int, ranges: list[tuple[date, date]]
+    ) -> list[tuple[int, Decimal]]:
+        """Get total quantity and revenue for a product in several periods with one query.
+
+        Returns list of (quantity, revenue) in the same order as ranges.
+        """
+        if not ranges:
+            return []
+
+        columns = []
+        for start_date, end_date in ranges:
+            in_period = and_(Sale.date >= start_date, Sale.date <= end_date)
+            columns.append(func.sum(Sale.quantity).filter(in_period))
+            columns.append(func.sum(Sale.revenue).filter(in_period))
+
+        result = await self.session.execute(
+            select(*columns).where(
+                Sale.product_id == product_id,
+                Sale.date >= min(start for start, _ in ranges),
+                Sale.date <= max(end for _, end in ranges),
+            )
+        )
+        row = result.one()
+        return [
+            (row[i] or 0, row[i + 1] or Decimal("0"))
+            for i in range(0, len(columns), 2)
+        ]
+
     async def get_daily_average(self, product_id: int, days: int) -> float:
         """Get average daily sales for a product over the last N days."""
         end_date = date.today()
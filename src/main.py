@@ -6,6 +6,7 @@ import sys
 
 from telegram.ext import Application
 
+from src.ai.clients import close_clients
 from src.bot.app import create_bot_application
 from src.config import settings
 from src.scheduler.jobs import setup_scheduler
@@ -84,6 +85,9 @@ async def main() -> None:
         await app.shutdown()
         logger.info("Telegram bot stopped")
 
+        # Close shared API clients
+        await close_clients()
+
         logger.info("OZON BI System stopped")
 
 
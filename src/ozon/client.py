@@ -1,11 +1,13 @@
 """OZON Seller API client."""
 
+import asyncio
 import logging
 from datetime import date
 from decimal import Decimal
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 import httpx
+import orjson
 
 from src.config import settings
 from src.ozon.models import (
@@ -32,7 +34,12 @@ class OzonClient:
         """Initialize OZON API client."""
         self.client_id = client_id or settings.ozon_client_id
         self.api_key = api_key or settings.ozon_api_key
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # Long-lived pool: one instance is shared by all tools (see src.ai.clients)
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
 
     def _get_headers(self) -> dict[str, str]:
         """Get authentication headers for API requests."""
@@ -57,7 +64,7 @@ class OzonClient:
         try:
             response = await self.client.post(url, json=payload, headers=self._get_headers())
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             result = OzonProductListResponse(**data["result"])
             logger.info(f"Fetched {len(result.items)} products from OZON")
             return result.items
@@ -65,6 +72,60 @@ class OzonClient:
             logger.error(f"Failed to fetch product list: {e}")
             raise
 
+    async def iter_product_pages(self, page_size: int = 100) -> AsyncIterator[list[OzonProductFull]]:
+        """Iterate over all products page by page with detailed info.
+
+        Only one page of the list and its details is held in memory at a time,
+        and the caller may stop early without fetching the rest of the catalog.
+        The details of each page are fetched while the next list page loads.
+
+        Args:
+            page_size: Products per page (one list + one info request per page)
+
+        Yields:
+            Detailed product information for each page
+        """
+        last_id = ""
+        pending_info: Optional[asyncio.Task] = None
+
+        try:
+            while True:
+                result = await self._get_product_list_page(last_id, page_size)
+
+                if pending_info is not None:
+                    page, pending_info = pending_info, None
+                    yield await page
+
+                items = OzonProductListResponse(**result).items
+                if items:
+                    pending_info = asyncio.create_task(
+                        self.get_product_info([item.product_id for item in items])
+                    )
+
+                last_id = result.get("last_id") or ""
+                if len(items) < page_size or not last_id:
+                    break
+
+            if pending_info is not None:
+                page, pending_info = pending_info, None
+                yield await page
+        finally:
+            # The caller stopped early: drop the prefetched details
+            if pending_info is not None:
+                pending_info.cancel()
+
+    async def _get_product_list_page(self, last_id: str, page_size: int) -> dict[str, Any]:
+        """Fetch one raw page of /v3/product/list."""
+        url = f"{self.BASE_URL}/v3/product/list"
+        payload = {"filter": {"visibility": "ALL"}, "limit": page_size, "last_id": last_id}
+        try:
+            response = await self.client.post(url, json=payload, headers=self._get_headers())
+            response.raise_for_status()
+            return orjson.loads(response.content)["result"]
+        except Exception as e:
+            logger.error(f"Failed to fetch product list page: {e}")
+            raise
+
     async def get_product_info(self, product_ids: list[int]) -> list[OzonProductFull]:
         """Get detailed information for specific products.
 
@@ -80,7 +141,7 @@ class OzonClient:
         try:
             response = await self.client.post(url, json=payload, headers=self._get_headers())
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             # v3 API returns items at root level, not under result
             items_data = data.get("items", data.get("result", {}).get("items", []))
             items = [OzonProductFull(**item) for item in items_data]
@@ -107,7 +168,7 @@ class OzonClient:
         try:
             response = await self.client.post(url, json=payload, headers=self._get_headers())
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             # v4 returns items at root level
             items_data = data.get("items", [])
             items = [OzonStockItem(**item) for item in items_data]
@@ -145,7 +206,7 @@ class OzonClient:
         try:
             response = await self.client.post(url, json=payload, headers=self._get_headers())
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             logger.info(f"Fetched analytics from {date_from} to {date_to}")
             return data.get("result", {})
         except Exception as e:
@@ -169,7 +230,7 @@ class OzonClient:
         try:
             response = await self.client.post(url, json=payload, headers=self._get_headers())
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             result = OzonPriceUpdateResponse(**data)
             logger.info(f"Updated prices for {len(price_updates)} products")
             return result
@@ -230,7 +291,7 @@ class OzonClient:
         try:
             response = await self.client.post(url, json=payload, headers=self._get_headers())
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             items = data.get("result", [])
             if items:
                 return items[0]
@@ -281,7 +342,7 @@ class OzonClient:
         try:
             response = await self.client.post(url, json=payload, headers=self._get_headers())
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             result = data.get("result", {})
 
             # Check for task_id - means update was accepted
@@ -317,7 +378,7 @@ class OzonClient:
         try:
             response = await self.client.post(url, json=payload, headers=self._get_headers())
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             result = {}
             for item in data.get("products", []):
@@ -358,7 +419,7 @@ class OzonClient:
         try:
             response = await self.client.post(url, json=payload, headers=self._get_headers())
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             return data.get("reviews", [])
 
         except Exception as e:
@@ -386,7 +447,7 @@ class OzonClient:
         try:
             response = await self.client.post(url, json=payload, headers=self._get_headers())
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             return data.get("questions", [])
 
         except Exception as e:
@@ -41,6 +41,7 @@ class OzonProductFull(BaseModel):
     price: str
     old_price: str = "0"
     currency_code: str = "RUB"
+    sku: Optional[int] = None  # OZON SKU used by analytics (differs from product_id)
     stocks: Optional[Any] = None  # v3 API returns nested structure
 
     class Config:
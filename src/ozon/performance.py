@@ -7,6 +7,7 @@ from typing import Any, Optional
 import time
 
 import httpx
+import orjson
 
 from src.config import settings
 
@@ -30,7 +31,12 @@ class PerformanceClient:
         """Initialize Performance API client."""
         self.client_id = client_id or settings.ozon_performance_client_id
         self.client_secret = client_secret or settings.ozon_performance_api_key
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # Long-lived pool: one instance is shared by all tools (see src.ai.clients)
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
 
         if not self.client_id or not self.client_secret:
             logger.warning("Performance API credentials not configured")
@@ -52,7 +58,7 @@ class PerformanceClient:
         try:
             response = await self.client.post(url, json=payload)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             PerformanceClient._access_token = data["access_token"]
             PerformanceClient._token_expires_at = time.time() + data.get("expires_in", 1800)
@@ -105,7 +111,7 @@ class PerformanceClient:
         try:
             response = await self.client.get(url, params=params, headers=await self._get_headers())
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             campaigns = data.get("list", [])
             logger.info(f"Fetched {len(campaigns)} campaigns")
             return campaigns
@@ -201,7 +207,7 @@ class PerformanceClient:
         try:
             response = await self.client.post(url, json=payload, headers=await self._get_headers())
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             # The API returns a UUID for async report generation
             report_uuid = data.get("UUID")
@@ -233,7 +239,7 @@ class PerformanceClient:
             try:
                 response = await self.client.get(url, headers=await self._get_headers())
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
 
                 state = data.get("state")
                 if state == "OK":
@@ -284,7 +290,7 @@ class PerformanceClient:
         try:
             response = await self.client.get(url, headers=await self._get_headers())
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             products = data.get("list", [])
             logger.info(f"Fetched {len(products)} products from {campaign_type} campaign {campaign_id}")
             return products
@@ -305,6 +311,22 @@ class PerformanceClient:
             product_id: Product ID (SKU)
             bid: Bid amount in rubles
 
+        Returns:
+            True if successful
+        """
+        return await self.set_product_bids(campaign_id, [(product_id, bid)])
+
+    async def set_product_bids(
+        self,
+        campaign_id: str,
+        bids: list[tuple[int, Decimal]],
+    ) -> bool:
+        """Set bids for several products of a campaign in one request.
+
+        Args:
+            campaign_id: Campaign ID
+            bids: (product ID (SKU), bid amount in rubles) pairs
+
         Returns:
             True if successful
         """
@@ -312,44 +334,30 @@ class PerformanceClient:
         campaign = await self.get_campaign(campaign_id)
         campaign_type = campaign.get("advObjectType", "SKU") if campaign else "SKU"
 
-        if campaign_type == "SKU":
-            url = f"{self.BASE_URL}/api/client/campaign/{campaign_id}/objects/bids"
-            payload = {
-                "bids": [
-                    {
-                        "id": product_id,
-                        "bid": int(bid * 100_000_000),  # Convert to nanocurrency
-                    }
-                ]
-            }
-        elif campaign_type == "SEARCH_PROMO":
+        if campaign_type == "SEARCH_PROMO":
             url = f"{self.BASE_URL}/api/client/campaign/{campaign_id}/search_promo/bids"
-            payload = {
-                "bids": [
-                    {
-                        "sku": product_id,
-                        "bid": int(bid * 100_000_000),
-                    }
-                ]
-            }
+            id_field = "sku"
         else:
             url = f"{self.BASE_URL}/api/client/campaign/{campaign_id}/objects/bids"
-            payload = {
-                "bids": [
-                    {
-                        "id": product_id,
-                        "bid": int(bid * 100_000_000),
-                    }
-                ]
-            }
+            id_field = "id"
+
+        payload = {
+            "bids": [
+                {
+                    id_field: product_id,
+                    "bid": int(bid * 100_000_000),  # Convert to nanocurrency
+                }
+                for product_id, bid in bids
+            ]
+        }
 
         try:
             response = await self.client.post(url, json=payload, headers=await self._get_headers())
             response.raise_for_status()
-            logger.info(f"Set bid {bid} for product {product_id} in {campaign_type} campaign {campaign_id}")
+            logger.info(f"Set {len(bids)} bid(s) in {campaign_type} campaign {campaign_id}")
             return True
         except Exception as e:
-            logger.error(f"Failed to set bid: {e}")
+            logger.error(f"Failed to set bids: {e}")
             raise
 
     async def add_products_to_campaign(
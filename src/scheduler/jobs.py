@@ -1,5 +1,6 @@
 """Scheduled jobs for automated tasks."""
 
+import asyncio
 import logging
 from datetime import date, timedelta
 from decimal import Decimal
@@ -7,6 +8,9 @@ from decimal import Decimal
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from telegram.ext import Application
 
+from src.ai.card_evaluator import evaluate_cards_batch
+from src.ai.clients import get_async_openai, get_ozon_client
+from src.ai.tools import build_card_audit_data, invalidate_products_cache, invalidate_tool_cache
 from src.analytics.inventory import InventoryAnalytics
 from src.analytics.pricing import PricingEngine
 from src.analytics.sales import SalesAnalytics
@@ -19,7 +23,6 @@ from src.database.repositories.experiments import ExperimentRepository
 from src.database.repositories.price_recommendations import PriceRecommendationRepository
 from src.database.repositories.products import ProductRepository
 from src.database.repositories.sales import SalesRepository
-from src.ozon.client import OzonClient
 from src.ozon.sync import OzonDataSync
 from src.utils.formatting import (
     format_currency,
@@ -32,6 +35,10 @@ from src.utils.formatting import (
 
 logger = logging.getLogger(__name__)
 
+# Catalog card audit: products whose OZON data is fetched at once, cards listed in the report
+CARD_AUDIT_FETCH_CHUNK = 10
+CARD_AUDIT_REPORT_WORST = 10
+
 
 async def send_telegram_message(app: Application, text: str, parse_mode: str = "Markdown") -> None:
     """Send message to admin chat."""
@@ -51,12 +58,12 @@ async def sync_ozon_data(app: Application) -> None:
 
     async with AsyncSessionLocal() as session:
         try:
-            ozon_client = OzonClient()
-            sync = OzonDataSync(ozon_client, session)
+            sync = OzonDataSync(get_ozon_client(), session)
 
             results = await sync.sync_all(sales_days_back=7)
 
-            await ozon_client.close()
+            invalidate_products_cache()
+            invalidate_tool_cache()
 
             message = f"""✅ *Синхронизация OZON завершена*
 
@@ -427,6 +434,57 @@ async def send_stock_alerts(app: Application) -> None:
             logger.error(f"Failed to send stock alerts: {e}")
 
 
+async def run_catalog_card_audit(app: Application) -> None:
+    """Re-score all active product cards through the OpenAI Batch API.
+
+    Opt-in (settings.catalog_card_audit_enabled): the batch is half the price of
+    interactive audits but may take hours to finish.
+    """
+    logger.info("Starting catalog card audit")
+
+    try:
+        async with AsyncSessionLocal() as session:
+            products = await ProductRepository(session).get_all_active()
+
+        product_datas = []
+        for start in range(0, len(products), CARD_AUDIT_FETCH_CHUNK):
+            chunk = products[start:start + CARD_AUDIT_FETCH_CHUNK]
+            chunk_datas = await asyncio.gather(
+                *(build_card_audit_data(product) for product in chunk),
+                return_exceptions=True,
+            )
+            for product, data in zip(chunk, chunk_datas):
+                if isinstance(data, Exception) or data is None:
+                    logger.warning(f"Skipping card audit of product {product.product_id}: {data}")
+                    continue
+                product_datas.append(data)
+
+        if not product_datas:
+            logger.info("No product cards to audit")
+            return
+
+        evaluations = await evaluate_cards_batch(product_datas, get_async_openai())
+
+        worst = sorted(evaluations, key=lambda e: e.overall_score)[:CARD_AUDIT_REPORT_WORST]
+        lines = [
+            f"• {truncate_text(e.product_name, 40)} — {e.overall_score:.1f}/10"
+            for e in worst
+        ]
+        message = (
+            f"🔍 *Аудит карточек завершён*\n\n"
+            f"Оценено карточек: {format_number(len(evaluations))}\n\n"
+            f"*Самые слабые карточки:*\n" + "\n".join(lines) + "\n\n"
+            f"Напиши \"аудит карточки <название>\" чтобы увидеть рекомендации."
+        )
+        await send_telegram_message(app, message)
+
+        logger.info(f"Catalog card audit completed: {len(evaluations)} cards")
+
+    except Exception as e:
+        logger.error(f"Catalog card audit failed: {e}")
+        await send_telegram_message(app, f"❌ Ошибка аудита карточек:\n{str(e)}")
+
+
 def setup_scheduler(app: Application) -> AsyncIOScheduler:
     """Set up and configure the job scheduler.
 
@@ -438,6 +496,7 @@ def setup_scheduler(app: Application) -> AsyncIOScheduler:
     - 10:30: Review ad experiments
     - 11:00: Review content experiments
     - 18:00: Send stock alerts
+    - 01:00: Catalog card audit (only if catalog_card_audit_enabled)
     """
     scheduler = AsyncIOScheduler(timezone=settings.timezone)
 
@@ -505,6 +564,16 @@ def setup_scheduler(app: Application) -> AsyncIOScheduler:
         id="send_stock_alerts",
     )
 
-    logger.info("Scheduler configured with 7 jobs")
+    if settings.catalog_card_audit_enabled:
+        scheduler.add_job(
+            run_catalog_card_audit,
+            "cron",
+            hour=1,
+            minute=0,
+            kwargs={"app": app},
+            id="run_catalog_card_audit",
+        )
+
+    logger.info(f"Scheduler configured with {len(scheduler.get_jobs())} jobs")
 
     return scheduler
@@ -0,0 +1,88 @@
+"""Request coalescing for batch-capable APIs."""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Generic, Hashable, Optional, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class AsyncBatcher(Generic[K, V]):
+    """Collects single-key loads arriving within a short window into one batch fetch.
+
+    Concurrent callers asking for different keys (e.g. parallel tool calls about
+    different products) are served by a single API request.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[list[K]], Awaitable[dict[K, Union[V, BaseException]]]],
+        default: Callable[[], V],
+        window_ms: float = 20,
+        max_batch: int = 100,
+    ):
+        """Initialize batcher.
+
+        Args:
+            fetch: Loads many keys at once, returns key -> value (a key mapped to
+                an exception fails only the loads of that key)
+            default: Factory for keys missing from the fetch result
+            window_ms: How long to wait for more keys before fetching
+            max_batch: Fetch immediately once this many keys are pending
+        """
+        self.fetch = fetch
+        self.default = default
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._pending: dict[K, list[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.Task] = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> V:
+        """Load value for one key (batched with other concurrent loads)."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(key, []).append(future)
+
+        if len(self._pending) >= self.max_batch:
+            batch, self._pending = self._pending, {}
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_window())
+
+        return await future
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.window)
+        self._timer = None
+        batch, self._pending = self._pending, {}
+        await self._flush(batch)
+
+    async def _flush(self, batch: dict[K, list[asyncio.Future]]) -> None:
+        if not batch:
+            return
+
+        keys = list(batch)
+        try:
+            results = await self.fetch(keys)
+        except Exception as e:
+            logger.warning(f"Batch fetch of {len(keys)} keys failed: {e}")
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for key, futures in batch.items():
+            value = results[key] if key in results else self.default()
+            for future in futures:
+                if future.done():
+                    continue
+                if isinstance(value, BaseException):
+                    future.set_exception(value)
+                else:
+                    future.set_result(value)
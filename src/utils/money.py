@@ -0,0 +1,17 @@
+"""Money utilities."""
+
+from decimal import Decimal
+from typing import Optional
+
+CENT = Decimal("0.01")
+
+
+def to_money(value: Optional[Decimal | float]) -> Optional[Decimal]:
+    """Convert an amount to Decimal with 2 places without a str() round-trip.
+
+    Decimals pass through unchanged; ints and floats (API sums and analytics)
+    are converted exactly and rounded to cents.
+    """
+    if value is None or isinstance(value, Decimal):
+        return value
+    return Decimal.from_float(value).quantize(CENT)
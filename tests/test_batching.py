@@ -0,0 +1,104 @@
+"""Tests for request coalescing."""
+
+import asyncio
+
+import pytest
+
+from src.utils.batching import AsyncBatcher
+
+
+class FakeFetch:
+    """Records the key lists it was called with."""
+
+    def __init__(self, results=None, error=None):
+        self.calls = []
+        self.results = results
+        self.error = error
+
+    async def __call__(self, keys):
+        self.calls.append(list(keys))
+        if self.error is not None:
+            raise self.error
+        if self.results is not None:
+            return {key: self.results[key] for key in keys if key in self.results}
+        return {key: key * 10 for key in keys}
+
+
+def test_concurrent_loads_share_one_fetch():
+    fetch = FakeFetch()
+
+    async def run():
+        batcher = AsyncBatcher(fetch, int, window_ms=5)
+        return await asyncio.gather(batcher.load(1), batcher.load(2), batcher.load(1))
+
+    assert asyncio.run(run()) == [10, 20, 10]
+    assert fetch.calls == [[1, 2]]
+
+
+def test_missing_key_gets_default():
+    fetch = FakeFetch(results={1: "one"})
+
+    async def run():
+        batcher = AsyncBatcher(fetch, lambda: "default", window_ms=5)
+        return await asyncio.gather(batcher.load(1), batcher.load(2))
+
+    assert asyncio.run(run()) == ["one", "default"]
+
+
+def test_exception_for_one_key_fails_only_that_key():
+    fetch = FakeFetch(results={1: "one", 2: ValueError("bad key")})
+
+    async def run():
+        batcher = AsyncBatcher(fetch, str, window_ms=5)
+        return await asyncio.gather(batcher.load(1), batcher.load(2), return_exceptions=True)
+
+    ok, failed = asyncio.run(run())
+    assert ok == "one"
+    assert isinstance(failed, ValueError)
+
+
+def test_failed_fetch_fails_all_loads():
+    fetch = FakeFetch(error=RuntimeError("api down"))
+
+    async def run():
+        batcher = AsyncBatcher(fetch, int, window_ms=5)
+        return await asyncio.gather(batcher.load(1), batcher.load(2), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_full_batch_is_fetched_without_waiting_for_window():
+    fetch = FakeFetch()
+
+    async def run():
+        # A window this long would time out the test if the batch waited for it
+        batcher = AsyncBatcher(fetch, int, window_ms=60_000, max_batch=2)
+        return await asyncio.wait_for(
+            asyncio.gather(batcher.load(1), batcher.load(2)), timeout=1
+        )
+
+    assert asyncio.run(run()) == [10, 20]
+    assert fetch.calls == [[1, 2]]
+
+
+def test_sequential_loads_use_separate_fetches():
+    fetch = FakeFetch()
+
+    async def run():
+        batcher = AsyncBatcher(fetch, int, window_ms=1)
+        return [await batcher.load(1), await batcher.load(2)]
+
+    assert asyncio.run(run()) == [10, 20]
+    assert fetch.calls == [[1], [2]]
+
+
+@pytest.mark.parametrize("window_ms", [0, 5])
+def test_single_load(window_ms):
+    fetch = FakeFetch()
+
+    async def run():
+        batcher = AsyncBatcher(fetch, int, window_ms=window_ms)
+        return await batcher.load(3)
+
+    assert asyncio.run(run()) == 30
@@ -0,0 +1,33 @@
+"""Tests for Telegram message handler helpers."""
+
+from src.bot.handlers.messages import TELEGRAM_MESSAGE_LIMIT, _split_message
+
+
+def test_short_message_is_not_split():
+    assert _split_message("Короткий ответ") == ["Короткий ответ"]
+
+
+def test_message_at_limit_is_not_split():
+    text = "a" * TELEGRAM_MESSAGE_LIMIT
+    assert _split_message(text) == [text]
+
+
+def test_split_prefers_line_breaks():
+    text = "aaaa\nbbbbbbb\ncc"
+    assert _split_message(text, limit=10) == ["aaaa", "bbbbbbb\ncc"]
+
+
+def test_long_line_is_cut_at_limit():
+    text = "x" * 25
+    assert _split_message(text, limit=10) == ["x" * 10, "x" * 10, "x" * 5]
+
+
+def test_parts_fit_limit_and_keep_text():
+    lines = [f"Строка {i}: " + "данные " * (i % 7) for i in range(2000)]
+    text = "\n".join(lines)
+
+    parts = _split_message(text)
+
+    assert len(parts) > 1
+    assert all(len(part) <= TELEGRAM_MESSAGE_LIMIT for part in parts)
+    assert "\n".join(parts) == text
@@ -0,0 +1,33 @@
+"""Tests for money utilities."""
+
+from decimal import Decimal
+
+import pytest
+
+from src.utils.money import to_money
+
+
+def test_to_money_none():
+    assert to_money(None) is None
+
+
+def test_to_money_decimal_passes_through():
+    value = Decimal("12.345")
+    assert to_money(value) is value
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (0, Decimal("0.00")),
+        (5, Decimal("5.00")),
+        (0.1, Decimal("0.10")),
+        (1234.567, Decimal("1234.57")),
+        # 1.005 is stored as 1.00499999..., so it rounds down
+        (1.005, Decimal("1.00")),
+    ],
+)
+def test_to_money_rounds_to_cents(value, expected):
+    result = to_money(value)
+    assert result == expected
+    assert result.as_tuple().exponent == -2
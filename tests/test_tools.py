@@ -0,0 +1,116 @@
+"""Tests for pure helpers of AI tools."""
+
+import pytest
+
+from src.ai.tools import _ad_verdict, _compile_validator, _content_verdict, _sum_campaign_rows
+
+
+@pytest.mark.parametrize(
+    ("before_orders", "after_orders", "before_cpc", "after_cpc", "expected"),
+    [
+        # More orders, CPC up to +20% is still a success
+        (10, 11, 10.0, 10.0, "SUCCESS"),
+        (10, 11, 10.0, 12.0, "SUCCESS"),
+        (10, 11, 10.0, 12.1, "NEUTRAL"),
+        # Orders drop below 80% of baseline
+        (10, 8, 10.0, 10.0, "NEUTRAL"),
+        (10, 7, 10.0, 10.0, "FAILED"),
+        # CPC up more than 50% without more orders
+        (10, 10, 10.0, 15.0, "NEUTRAL"),
+        (10, 10, 10.0, 15.1, "FAILED"),
+        (10, 11, 10.0, 15.1, "NEUTRAL"),
+        # Nothing changed
+        (10, 10, 10.0, 10.0, "NEUTRAL"),
+        (0, 0, 0.0, 0.0, "NEUTRAL"),
+    ],
+)
+def test_ad_verdict(before_orders, after_orders, before_cpc, after_cpc, expected):
+    verdict, text = _ad_verdict(before_orders, after_orders, before_cpc, after_cpc)
+    assert verdict == expected
+    assert text.endswith("\n")
+
+
+@pytest.mark.parametrize(
+    ("before_orders", "after_orders", "before_conv", "after_conv", "expected"),
+    [
+        # More orders with conversion not lower
+        (10, 11, 10.0, 10.0, "SUCCESS"),
+        (10, 11, 10.0, 9.9, "NEUTRAL"),
+        # Orders drop below 80% of baseline
+        (10, 8, 10.0, 10.0, "NEUTRAL"),
+        (10, 7, 10.0, 12.0, "FAILED"),
+        # Conversion below 90% of baseline without more orders
+        (10, 10, 10.0, 9.0, "NEUTRAL"),
+        (10, 10, 10.0, 8.9, "FAILED"),
+        (10, 11, 10.0, 8.9, "NEUTRAL"),
+        # Nothing changed
+        (10, 10, 10.0, 10.0, "NEUTRAL"),
+        (0, 0, 0.0, 0.0, "NEUTRAL"),
+    ],
+)
+def test_content_verdict(before_orders, after_orders, before_conv, after_conv, expected):
+    verdict, text = _content_verdict(before_orders, after_orders, before_conv, after_conv)
+    assert verdict == expected
+    assert text.endswith("\n")
+
+
+VALIDATOR_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "campaign_id": {"type": ["string", "array"], "items": {"type": "string"}},
+        "days": {"type": "integer"},
+        "price": {"type": "number"},
+        "state": {"type": "string", "enum": ["RUNNING", "STOPPED"]},
+    },
+    "required": ["campaign_id"],
+}
+
+
+@pytest.mark.parametrize(
+    ("tool_input", "error_part"),
+    [
+        ({"campaign_id": "1"}, None),
+        ({"campaign_id": ["1", "2"], "days": 7, "price": 9.5, "state": "RUNNING"}, None),
+        ({"campaign_id": "1", "price": 10}, None),
+        ({}, "не указан параметр campaign_id"),
+        ({"campaign_id": 1}, "неверный тип параметра campaign_id"),
+        ({"campaign_id": "1", "days": "7"}, "неверный тип параметра days"),
+        ({"campaign_id": "1", "days": True}, "неверный тип параметра days"),
+        ({"campaign_id": "1", "state": "PAUSED"}, "недопустимое значение state"),
+        (["campaign_id"], "ожидается объект"),
+    ],
+)
+def test_compile_validator(tool_input, error_part):
+    error = _compile_validator(VALIDATOR_SCHEMA)(tool_input)
+    if error_part is None:
+        assert error is None
+    else:
+        assert error_part in error
+
+
+def test_sum_campaign_rows_totals():
+    rows = [
+        {"views": 100, "clicks": 5, "moneySpent": 50, "orders": 1},
+        {"shows": 200, "clicks": 10, "spend": 70, "orders": 2},
+        "not a row",
+    ]
+
+    assert _sum_campaign_rows(rows) == {"views": 300, "clicks": 15, "spend": 120, "orders": 3}
+
+
+def test_sum_campaign_rows_converts_each_row_from_nano():
+    # 2 ₽ in nanocurrency plus a row already in rubles
+    rows = [{"moneySpent": 200_000_000}, {"moneySpent": 500}]
+
+    assert _sum_campaign_rows(rows)["spend"] == pytest.approx(502)
+
+
+def test_sum_campaign_rows_ruble_total_above_threshold_is_kept():
+    # Each row is below the nanocurrency threshold, only the sum is above it
+    rows = [{"moneySpent": 600_000}, {"moneySpent": 600_000}]
+
+    assert _sum_campaign_rows(rows)["spend"] == 1_200_000
+
+
+def test_sum_campaign_rows_empty():
+    assert _sum_campaign_rows([]) == {"views": 0, "clicks": 0, "spend": 0, "orders": 0}